@@ -1,15 +1,40 @@
+import importlib
+import os
+import threading
+from contextlib import asynccontextmanager
 from importlib.metadata import version
 
+import anyio
 from fastapi import FastAPI
 
 from relife_service_template.config.logging import configure_logging
-from relife_service_template.routes import auth, examples, health
+from relife_service_template.config.settings import get_settings
+from relife_service_template.middleware.admission import AdmissionMiddleware
+from relife_service_template.middleware.compression import CompressionMiddleware
+from relife_service_template.middleware.metrics import PrometheusMiddleware
+from relife_service_template.middleware.profiling import ProfilingMiddleware
+from relife_service_template.middleware.tracing import TracingMiddleware
+from relife_service_template.observability.probes import start_probes, stop_probes
+from relife_service_template.observability.tracing import (
+    configure_tracing,
+    shutdown_tracing,
+)
+from relife_service_template.routes import auth, examples, health, metrics
+from relife_service_template.services.jobs import get_job_manager, shutdown_job_manager
+from relife_service_template.services.results import start_result_writer, stop_result_writer
 
 from relife_service_template.routes.npv import router as npv_router
 from relife_service_template.routes.ii import router as ii_router
 from relife_service_template.routes.opex import router as opex_router
 from relife_service_template.routes.roi import router as roi_router
 from relife_service_template.routes.irr import router as irr_router
+from relife_service_template.routes.portfolio import router as portfolio_router
+from relife_service_template.routes.payback import router as payback_router
+from relife_service_template.routes.lcse import router as lcse_router
+from relife_service_template.routes.scenarios import router as scenarios_router
+from relife_service_template.routes.jobs import router as jobs_router
+from relife_service_template.routes.stream import router as stream_router
+from relife_service_template.routes.meter import router as meter_router
 
 # Dynamically determine the package name
 package_name = __name__.split(".")[0]
@@ -24,14 +49,65 @@ except ImportError:
 
 configure_logging()
 
+# Dependencies imported on first use rather than at application import
+PRELOAD_MODULES = ("supabase", "gotrue", "jwt", "numpy")
+
+
+def preload_modules() -> None:
+    """Import the dependencies that the application only loads on first use."""
+
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up and tear down process-wide resources around the application lifetime."""
+
+    settings = get_settings()
+    configure_tracing(settings)
+    await start_probes(settings)
+    await start_result_writer(settings)
+
+    if settings.preload_dependencies:
+        # Warm the lazy imports off the event loop so startup is not delayed
+        # and the first authenticated request does not pay for them
+        threading.Thread(
+            target=preload_modules, name="preload-dependencies", daemon=True
+        ).start()
+
+    if os.path.exists(settings.jobs_database_path):
+        # Resume the jobs left queued or interrupted by the previous process
+        await anyio.to_thread.run_sync(get_job_manager, settings)
+
+    yield
+
+    await anyio.to_thread.run_sync(shutdown_job_manager)
+    # Write the results still buffered before the process exits
+    await stop_result_writer(settings)
+    await stop_probes()
+    shutdown_tracing()
+
+
 app = FastAPI(
     title="Financial Service APIs",
     description="FastAPI application for all financial indicators",
     version=__version__,
+    lifespan=lifespan,
 )
 
 #app = FastAPI()
 
+# Innermost, so that profiles only cover the handling of the request itself
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(PrometheusMiddleware)
+
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to the Financial API. Try /docs for Swagger UI."}
@@ -39,6 +115,7 @@ async def read_root():
 
 
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(auth.router)
 app.include_router(examples.router)
 
@@ -48,3 +125,10 @@ app.include_router(ii_router)
 app.include_router(opex_router)
 app.include_router(roi_router)
 app.include_router(irr_router)
+app.include_router(portfolio_router)
+app.include_router(payback_router)
+app.include_router(lcse_router)
+app.include_router(scenarios_router)
+app.include_router(jobs_router)
+app.include_router(stream_router)
+app.include_router(meter_router)
@@ -1,9 +1,7 @@
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from supabase import AsyncClient, create_async_client
-from supabase.client import ClientOptions
 
 from relife_service_template.auth.keycloak import (
     fetch_user_roles,
@@ -16,6 +14,18 @@ from relife_service_template.models.auth import (
     AuthenticationMethod,
     UniversalUser,
 )
+from relife_service_template.observability.metrics import (
+    observe_auth,
+    observe_outbound,
+)
+from relife_service_template.services.ratelimit import (
+    get_rate_limit_backend,
+    limit_for_roles,
+    role_limits,
+)
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
 
 security = HTTPBearer()
 logger = get_logger(__name__)
@@ -26,9 +36,13 @@ async def _authenticate_with_supabase(
 ) -> AuthenticatedUser:
     """Authenticate user via Supabase."""
 
-    client = await get_service_client(settings)
-    user_response = await client.auth.get_user(token)
-    universal_user = UniversalUser.from_supabase_user(user_response)
+    with observe_auth("supabase"):
+        client = await get_service_client(settings)
+
+        with observe_outbound("supabase_auth"):
+            user_response = await client.auth.get_user(token)
+
+        universal_user = UniversalUser.from_supabase_user(user_response)
 
     return AuthenticatedUser(
         token=token,
@@ -42,9 +56,10 @@ async def _authenticate_with_keycloak(
 ) -> AuthenticatedUser:
     """Authenticate user via Keycloak JWT validation."""
 
-    return await validate_keycloak_jwt(
-        token, settings.keycloak_client_id, settings.keycloak_realm_url
-    )
+    with observe_auth("keycloak"):
+        return await validate_keycloak_jwt(
+            token, settings.keycloak_client_id, settings.keycloak_realm_url
+        )
 
 
 async def _fetch_keycloak_roles(user: AuthenticatedUser, settings: SettingsDep) -> None:
@@ -63,19 +78,25 @@ async def _fetch_keycloak_roles(user: AuthenticatedUser, settings: SettingsDep)
         user.keycloak_roles = []
         return
 
-    user.keycloak_roles = await fetch_user_roles(
-        keycloak_url,
-        settings.keycloak_client_id,
-        settings.keycloak_client_secret,
-        provider_id,
-    )
+    with observe_auth("keycloak_roles"):
+        user.keycloak_roles = await fetch_user_roles(
+            keycloak_url,
+            settings.keycloak_client_id,
+            settings.keycloak_client_secret,
+            provider_id,
+        )
 
 
-async def get_service_client(settings: SettingsDep) -> AsyncClient:
+async def get_service_client(settings: SettingsDep) -> "AsyncClient":
     """Create a Supabase client with service role (admin) privileges.
     This client bypasses Row Level Security and has full database access.
     Should only be used for admin/service operations."""
 
+    # Imported on first use: the Supabase SDK is slow to import and not
+    # needed by endpoints that do not authenticate
+    from supabase import create_async_client
+    from supabase.client import ClientOptions
+
     client = await create_async_client(
         settings.supabase_url,
         settings.supabase_key,
@@ -163,6 +184,27 @@ async def get_authenticated_user_with_roles(
     )
 
 
+async def authenticate_admin(token: str, settings: SettingsDep) -> AuthenticatedUser:
+    """Authenticates a bearer token outside of a route and requires the admin role.
+
+    Raises:
+        HTTPException: 401 if authentication fails, 403 without the admin role
+    """
+
+    user = await _get_authenticated_user(
+        settings=settings,
+        credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+        fetch_roles=True,
+    )
+
+    if not user.has_admin_role:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required"
+        )
+
+    return user
+
+
 AuthenticatedUserDep = Annotated[
     AuthenticatedUser, Depends(get_authenticated_user_without_roles)
 ]
@@ -180,7 +222,7 @@ Use this dependency when both user authentication and role-based access control
 
 async def get_user_client(
     current_user: AuthenticatedUserDep, settings: SettingsDep
-) -> AsyncClient:
+) -> "AsyncClient":
     """Create a Supabase client with user context.
     This client respects Row Level Security policies based on the user's token.
 
@@ -209,6 +251,9 @@ async def get_user_client(
             ),
         )
 
+    from supabase import create_async_client
+    from supabase.client import ClientOptions
+
     client = await create_async_client(
         settings.supabase_url,
         settings.supabase_key,
@@ -220,7 +265,7 @@ async def get_user_client(
     return client
 
 
-ServiceClientDep = Annotated[AsyncClient, Depends(get_service_client)]
+ServiceClientDep = Annotated["AsyncClient", Depends(get_service_client)]
 """FastAPI dependency providing unrestricted Supabase database access.
 
 **Security Warning**: This client bypasses all Row Level Security policies
@@ -233,7 +278,7 @@ Security best practices:
 - Never expose this client to untrusted code paths
 """
 
-UserClientDep = Annotated[AsyncClient, Depends(get_user_client)]
+UserClientDep = Annotated["AsyncClient", Depends(get_user_client)]
 """FastAPI dependency providing user-scoped Supabase database access.
 
 This client includes user authentication context and respects Row Level Security
@@ -252,3 +297,71 @@ through Supabase's OIDC integration.
 permission validation instead of relying on RLS, as direct Keycloak tokens 
 cannot be validated by Supabase's Row Level Security system.
 """
+
+
+async def _apply_rate_limit(
+    user: AuthenticatedUser, response: Response, settings: SettingsDep
+) -> None:
+    """Take a token from the user's bucket, raising 429 when it is empty."""
+
+    limit = None
+
+    # Roles are only needed, and fetched, when some role has its own limit
+    if settings.rate_limit_role_limits and user.keycloak_roles is None:
+        limit = role_limits.get(user.user_id, settings.rate_limit_role_cache_ttl)
+
+        if limit is None:
+            await _fetch_keycloak_roles(user, settings)
+            limit = limit_for_roles([role.name for role in user.keycloak_roles or []], settings)
+            role_limits.put(user.user_id, limit)
+
+    if limit is None:
+        limit = limit_for_roles([role.name for role in user.keycloak_roles or []], settings)
+
+    decision = await get_rate_limit_backend(settings).consume(
+        user.user_id, limit, settings.rate_limit_window
+    )
+
+    if not decision.allowed:
+        logger.info("Rate limit exceeded", user_id=user.user_id, limit=decision.limit)
+
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=decision.headers(),
+        )
+
+    response.headers.update(decision.headers())
+
+
+async def rate_limit(request: Request, response: Response, settings: SettingsDep) -> None:
+    """Router dependency rate limiting requests per authenticated user.
+
+    Does nothing unless `rate_limit_enabled` is set. When it is, the routes
+    require a bearer token, since requests are limited by user identity.
+    """
+
+    if not settings.rate_limit_enabled:
+        return
+
+    credentials = await security(request)
+    user = await get_authenticated_user_without_roles(settings=settings, credentials=credentials)
+    await _apply_rate_limit(user, response, settings)
+
+
+async def get_rate_limited_user(
+    current_user: AuthenticatedUserDep, response: Response, settings: SettingsDep
+) -> AuthenticatedUser:
+    """Authenticates the user and applies the per-user rate limit when enabled."""
+
+    if settings.rate_limit_enabled:
+        await _apply_rate_limit(current_user, response, settings)
+
+    return current_user
+
+
+RateLimitedUserDep = Annotated[AuthenticatedUser, Depends(get_rate_limited_user)]
+"""Dependency that provides an authenticated user subject to the per-user rate limit.
+Use it instead of `AuthenticatedUserDep` on routes that authenticate anyway, rather
+than adding the `rate_limit` router dependency, so the user is authenticated once.
+"""
@@ -1,7 +1,5 @@
-from typing import List
+from typing import TYPE_CHECKING, Dict, List
 
-import httpx
-import jwt
 from fastapi import HTTPException, status
 
 from relife_service_template.config.logging import get_logger
@@ -11,9 +9,34 @@ from relife_service_template.models.auth import (
     KeycloakRole,
     UniversalUser,
 )
+from relife_service_template.observability.metrics import (
+    observe_outbound,
+    record_cache_lookup,
+)
+
+if TYPE_CHECKING:
+    import jwt
 
 logger = get_logger(__name__)
 
+# PyJWKClient instances keyed by JWKS URI. Each client keeps its own cache of
+# signing keys, so reusing it avoids fetching the JWKS document on every request.
+_jwks_clients: Dict[str, "jwt.PyJWKClient"] = {}
+
+
+def _get_jwks_client(jwks_uri: str) -> "jwt.PyJWKClient":
+    """Return the shared JWKS client for a JWKS URI, creating it on first use."""
+
+    import jwt
+
+    client = _jwks_clients.get(jwks_uri)
+    record_cache_lookup("jwks_client", client is not None)
+
+    if client is None:
+        client = _jwks_clients[jwks_uri] = jwt.PyJWKClient(jwks_uri)
+
+    return client
+
 
 async def get_keycloak_token(
     keycloak_url: str, client_id: str, client_secret: str
@@ -21,6 +44,8 @@ async def get_keycloak_token(
     """Obtain an admin access token from Keycloak using client credentials flow.
     Raises HTTPException if token request fails."""
 
+    import httpx
+
     token_url = f"{keycloak_url}/protocol/openid-connect/token"
 
     data = {
@@ -30,7 +55,8 @@ async def get_keycloak_token(
     }
 
     async with httpx.AsyncClient() as client:
-        response = await client.post(token_url, data=data)
+        with observe_outbound("keycloak_token"):
+            response = await client.post(token_url, data=data)
 
         try:
             response.raise_for_status()
@@ -46,6 +72,8 @@ async def get_keycloak_user_roles(
     """Fetch a user's realm roles from Keycloak's admin API.
     Requires an admin token with appropriate permissions."""
 
+    import httpx
+
     role_mapper_base_url = keycloak_url.replace("/realms", "/admin/realms").rstrip("/")
     role_mapper_url = f"{role_mapper_base_url}/users/{user_id}/role-mappings/realm"
 
@@ -55,9 +83,10 @@ async def get_keycloak_user_roles(
             role_mapper_url=role_mapper_url
         )
 
-        response = await client.get(
-            role_mapper_url, headers={"Authorization": f"Bearer {admin_token}"}
-        )
+        with observe_outbound("keycloak_roles"):
+            response = await client.get(
+                role_mapper_url, headers={"Authorization": f"Bearer {admin_token}"}
+            )
 
         response.raise_for_status()
         return [KeycloakRole(**role) for role in response.json()]
@@ -88,6 +117,8 @@ async def validate_keycloak_jwt(
         HTTPException: If token validation fails or issuer is not trusted
     """
 
+    import jwt
+
     try:
         # Construct URLs from realm URL
         trusted_issuer = keycloak_realm_url.rstrip("/")
@@ -112,7 +143,8 @@ async def validate_keycloak_jwt(
             raise ValueError(f"Untrusted issuer: {token_issuer}")
 
         # Get public key from manually constructed JWKS endpoint
-        public_key = jwt.PyJWKClient(jwks_uri).get_signing_key_from_jwt(token).key
+        with observe_outbound("keycloak_jwks"):
+            public_key = _get_jwks_client(jwks_uri).get_signing_key_from_jwt(token).key
 
         # First decode without audience validation to check the claims
         verified_payload = jwt.decode(
@@ -1,13 +1,29 @@
+import atexit
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
-from typing import Any
+import queue
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from rich.console import Console
-from rich.logging import RichHandler
+if TYPE_CHECKING:
+    from rich.logging import RichHandler
 
 DEFAULT_LOG_LEVEL = "INFO"
 
+# Supported values of the LOG_FORMAT environment variable
+LOG_FORMAT_RICH = "rich"
+LOG_FORMAT_JSON = "json"
+
+LEVEL_NUMBERS = {
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "debug": logging.DEBUG,
+}
+
 COLOR_MAPPINGS = {
     "info": "dim cyan",
     "warning": "dim yellow",
@@ -18,23 +34,33 @@ COLOR_MAPPINGS = {
 SUPPRESSED_LOGGERS = ["uvicorn.access", "httpx", "httpcore"]
 
 
+# Background listener draining the log queue in JSON mode
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
 class RichStructuredLogger:
     """A wrapper around Python's logger that provides Rich-compatible structured logging.
 
     This class formats kwargs as Rich markup strings for visual enhancement in
-    development while falling back to plain text in CI environments.
+    development while falling back to plain text in CI environments. In JSON
+    mode kwargs are passed through untouched and serialized by the handler.
+    Nothing is formatted for messages below the logger's effective level.
     """
 
-    def __init__(self, logger: logging.Logger, use_rich: bool = True) -> None:
+    def __init__(
+        self, logger: logging.Logger, use_rich: bool = True, use_json: bool = False
+    ) -> None:
         """Initialize the Rich structured logger.
 
         Args:
             logger: The underlying Python logger instance
             use_rich: Whether to use Rich markup formatting
+            use_json: Whether kwargs are emitted as structured JSON fields
         """
 
         self._logger = logger
         self._use_rich = use_rich
+        self._use_json = use_json
 
     def _format_message(self, msg: str, level: str, **kwargs: Any) -> str:
         """Format a log message with optional structured data.
@@ -59,29 +85,85 @@ class RichStructuredLogger:
         else:
             return f"{msg} [{extra_str}]"
 
+    def _log(self, level: str, msg: str, kwargs: Dict[str, Any]) -> None:
+        """Emit a message if the level is enabled, formatting it only then.
+
+        Args:
+            level: The log level name (info, warning, error, debug)
+            msg: The main log message
+            kwargs: Additional structured data to include
+        """
+
+        level_number = LEVEL_NUMBERS[level]
+
+        if not self._logger.isEnabledFor(level_number):
+            return
+
+        if self._use_json:
+            self._logger.log(level_number, msg, extra={"fields": kwargs})
+        else:
+            self._logger.log(level_number, self._format_message(msg, level, **kwargs))
+
     def info(self, msg: str, **kwargs: Any) -> None:
         """Log an info message with optional structured data."""
 
-        formatted_msg = self._format_message(msg, "info", **kwargs)
-        self._logger.info(formatted_msg)
+        self._log("info", msg, kwargs)
 
     def warning(self, msg: str, **kwargs: Any) -> None:
         """Log a warning message with optional structured data."""
 
-        formatted_msg = self._format_message(msg, "warning", **kwargs)
-        self._logger.warning(formatted_msg)
+        self._log("warning", msg, kwargs)
 
     def error(self, msg: str, **kwargs: Any) -> None:
         """Log an error message with optional structured data."""
 
-        formatted_msg = self._format_message(msg, "error", **kwargs)
-        self._logger.error(formatted_msg)
+        self._log("error", msg, kwargs)
 
     def debug(self, msg: str, **kwargs: Any) -> None:
         """Log a debug message with optional structured data."""
 
-        formatted_msg = self._format_message(msg, "debug", **kwargs)
-        self._logger.debug(formatted_msg)
+        self._log("debug", msg, kwargs)
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON objects.
+
+    Structured data passed as kwargs to `RichStructuredLogger` is merged into
+    the top-level object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        fields = getattr(record, "fields", None)
+
+        if fields:
+            for key, value in fields.items():
+                entry.setdefault(key, value)
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that enqueues records without formatting them.
+
+    The standard `QueueHandler.prepare` renders the message in the calling
+    thread. Records here stay in-process, so formatting is left entirely to
+    the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def get_logger(name: str) -> RichStructuredLogger:
@@ -94,9 +176,10 @@ def get_logger(name: str) -> RichStructuredLogger:
         A RichStructuredLogger instance that provides structured logging with Rich formatting
     """
 
-    use_rich_formatting = not _is_ci_environment()
+    use_json = _get_log_format() == LOG_FORMAT_JSON
+    use_rich_formatting = not _is_ci_environment() and not use_json
     base_logger = logging.getLogger(name)
-    return RichStructuredLogger(base_logger, use_rich_formatting)
+    return RichStructuredLogger(base_logger, use_rich_formatting, use_json)
 
 
 def _is_ci_environment() -> bool:
@@ -109,6 +192,16 @@ def _is_ci_environment() -> bool:
     return bool(os.getenv("CI"))
 
 
+def _get_log_format() -> str:
+    """Get the log output format from the LOG_FORMAT environment variable.
+
+    Returns:
+        The lower-cased format name, `rich` by default
+    """
+
+    return os.getenv("LOG_FORMAT", LOG_FORMAT_RICH).lower()
+
+
 def get_log_level() -> int:
     """Get log level from environment variable.
 
@@ -120,7 +213,7 @@ def get_log_level() -> int:
     return getattr(logging, level_name, logging.INFO)
 
 
-def _create_rich_handler(log_level: int) -> RichHandler:
+def _create_rich_handler(log_level: int) -> "RichHandler":
     """Create and configure a Rich handler for development logging.
 
     Args:
@@ -130,6 +223,10 @@ def _create_rich_handler(log_level: int) -> RichHandler:
         Configured RichHandler instance
     """
 
+    # Rich is only needed for development output, so it is not imported in JSON mode
+    from rich.console import Console
+    from rich.logging import RichHandler
+
     console = Console(stderr=True)
 
     rich_handler = RichHandler(
@@ -169,6 +266,62 @@ def _create_standard_handler() -> logging.StreamHandler:
     return stream_handler
 
 
+def _create_queue_handler() -> logging.handlers.QueueHandler:
+    """Create a queue handler whose records are written as JSON lines by a background thread.
+
+    Returns:
+        QueueHandler feeding a started QueueListener
+    """
+
+    global _queue_listener
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+    return _DeferredQueueHandler(log_queue)
+
+
+def shutdown_logging() -> None:
+    """Stop the background log listener, flushing queued records."""
+
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def _restart_listener_in_child() -> None:
+    """Restart the listener thread in a forked child, where it does not survive the fork."""
+
+    global _queue_listener
+
+    if _queue_listener is not None:
+        # Records queued before the fork are still written by the parent's listener
+        while not _queue_listener.queue.empty():
+            _queue_listener.queue.get_nowait()
+
+        # A new listener on the same queue, as the inherited one's thread is gone
+        _queue_listener = logging.handlers.QueueListener(
+            _queue_listener.queue,
+            *_queue_listener.handlers,
+            respect_handler_level=_queue_listener.respect_handler_level,
+        )
+        _queue_listener.start()
+
+
+atexit.register(shutdown_logging)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
 def _suppress_verbose_loggers() -> None:
     """Suppress verbose logs from common third-party libraries."""
 
@@ -179,6 +332,10 @@ def _suppress_verbose_loggers() -> None:
 def configure_logging(enable_rich: bool = True) -> None:
     """Configure Rich logging with FastAPI best practices.
 
+    Setting LOG_FORMAT=json selects the production mode: records are emitted
+    as JSON lines by a background thread fed through a queue, so logging never
+    blocks the event loop on stderr I/O.
+
     Args:
         enable_rich: Whether to use Rich formatting. Set to False for production
                     environments where structured logging is preferred.
@@ -186,7 +343,11 @@ def configure_logging(enable_rich: bool = True) -> None:
 
     log_level = get_log_level()
 
-    if enable_rich and not _is_ci_environment():
+    shutdown_logging()
+
+    if _get_log_format() == LOG_FORMAT_JSON:
+        handlers = [_create_queue_handler()]
+    elif enable_rich and not _is_ci_environment():
         handlers = [_create_rich_handler(log_level)]
     else:
         handlers = [_create_standard_handler()]
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Annotated
+from typing import Annotated, Dict, List, Optional
 
 from fastapi import Depends
 from pydantic_settings import BaseSettings
@@ -25,6 +25,122 @@ class Settings(BaseSettings):
     # Base URL of the Keycloak realm for authentication
     # Used to construct token, JWKS, and other authentication endpoints
     keycloak_realm_url: str = "https://relife-identity.test.ctic.es/realms/relife"
+    # Whether responses are compressed when the client accepts it
+    compression_enabled: bool = True
+    # Responses smaller than this many bytes are sent uncompressed
+    compression_minimum_size: int = 1024
+    # Responses of at least this many bytes are compressed in a worker thread
+    # instead of on the event loop
+    compression_offload_size: int = 256 * 1024
+    # Content encodings in order of server preference; encodings whose library
+    # is not installed are skipped
+    compression_encodings: List[str] = ["zstd", "br", "gzip"]
+    # Whether OpenTelemetry tracing is enabled (requires the `tracing` extra)
+    tracing_enabled: bool = False
+    # Span exporter: "otlp" (OTLP over HTTP) or "file" (JSON lines)
+    tracing_exporter: str = "otlp"
+    # OTLP traces endpoint; when unset the standard OTEL_EXPORTER_OTLP_* variables apply
+    tracing_otlp_endpoint: Optional[str] = None
+    # Destination of the "file" exporter
+    tracing_file_path: str = "traces.jsonl"
+    # Fraction of new traces that are sampled (parent decisions are respected)
+    tracing_sample_ratio: float = 1.0
+    # Service name reported in the trace resource
+    tracing_service_name: str = "relife-financial-service"
+    # Seconds between background readiness probes of Supabase, Keycloak and the worker pool
+    readiness_probe_interval: float = 10.0
+    # Seconds before a single readiness probe is considered failed
+    readiness_probe_timeout: float = 2.0
+    # Probe results older than this many seconds make the service not ready
+    readiness_max_staleness: float = 30.0
+    # Import lazily loaded dependencies (Supabase, JWT, numpy) in a background thread at startup
+    preload_dependencies: bool = True
+    # Share one computation between concurrent identical NPV/ROI/IRR requests
+    coalescing_enabled: bool = True
+    # Merge concurrent NPV/ROI requests into vectorized batches (adds up to the wait below)
+    microbatching_enabled: bool = False
+    # Largest number of requests evaluated in one batch
+    microbatch_max_size: int = 256
+    # Longest time (milliseconds) a request waits for others to join its batch
+    microbatch_max_wait_ms: float = 2.0
+    # Largest number of what-if scenarios kept per worker; the least recently used is evicted
+    scenario_max_sessions: int = 1000
+    # Seconds after which an unused what-if scenario is dropped
+    scenario_idle_timeout: float = 1800.0
+    # Largest serialized size (bytes) of one what-if scenario; larger ones are rejected with 413
+    scenario_max_bytes: int = 1024 * 1024
+    # Largest total size (bytes) of the what-if scenarios per worker; the least recently used are evicted
+    scenario_max_total_bytes: int = 256 * 1024 * 1024
+    # SQLite database holding background jobs and their results
+    jobs_database_path: str = "jobs.sqlite3"
+    # Number of jobs run at the same time by each worker process
+    jobs_workers: int = 2
+    # Largest number of queued and running jobs per user
+    jobs_max_active_per_user: int = 10
+    # Largest number of queued jobs over all users
+    jobs_max_queued: int = 1000
+    # Scenarios evaluated between progress updates (and cancellation checks) of batch jobs
+    jobs_chunk_size: int = 1000
+    # Seconds finished jobs and their results are kept
+    jobs_retention: float = 86400.0
+    # Seconds idle job workers wait before checking the database for jobs of other processes
+    jobs_poll_interval: float = 1.0
+    # Scenarios evaluated per chunk of a streamed batch
+    stream_chunk_size: int = 500
+    # Limit concurrent requests per route and queue or reject the excess
+    admission_enabled: bool = True
+    # Only routes under this prefix are admission controlled (health and metrics stay responsive)
+    admission_path_prefix: str = "/financial/"
+    # Capacity of each route, in request cost units
+    admission_default_limit: int = 32
+    # Capacity of specific routes by route template, overriding the default
+    admission_route_limits: Dict[str, int] = {"/financial/portfolio": 4, "/financial/batch/stream": 4}
+    # Largest number of requests waiting for admission per route; more are rejected with 503
+    admission_max_queue: int = 64
+    # Seconds a request may wait for admission before it is rejected with 503
+    admission_queue_timeout: float = 5.0
+    # Request body bytes per extra cost unit; a request costs at most half the route capacity
+    admission_cost_unit_bytes: int = 65536
+    # Retry-After seconds sent with 503 responses
+    admission_retry_after: int = 1
+    # Limit requests per authenticated user (requires a bearer token on /financial routes)
+    rate_limit_enabled: bool = False
+    # Requests allowed per window for users without a role-specific limit
+    rate_limit_requests: int = 120
+    # Seconds in which an exhausted allowance is refilled
+    rate_limit_window: float = 60.0
+    # Requests per window by Keycloak role; users get the highest limit of their roles
+    rate_limit_role_limits: Dict[str, int] = {}
+    # Seconds a user's limit resolved from Keycloak roles is reused before roles are fetched again
+    rate_limit_role_cache_ttl: float = 60.0
+    # Where buckets are kept: "memory" (per worker) or "supabase" (shared through RPC)
+    rate_limit_backend: str = "memory"
+    # Store every computed result in Supabase through a background writer
+    results_enabled: bool = False
+    # Supabase table receiving the results
+    results_table: str = "financial_results"
+    # Largest number of results written in one insert; a full batch is flushed at once
+    results_batch_size: int = 500
+    # Seconds between flushes of a partial batch
+    results_flush_interval: float = 2.0
+    # Largest number of results waiting to be written; further results are dropped
+    results_max_buffer: int = 10000
+    # Retries of a failed insert before its results are dropped
+    results_max_retries: int = 5
+    # Seconds before the first retry, doubled on every further retry
+    results_retry_backoff: float = 0.5
+    # Seconds allowed for writing the remaining results on shutdown
+    results_shutdown_timeout: float = 10.0
+    # Let admins profile single requests by sending the profiling header (requires pyinstrument)
+    profiling_enabled: bool = False
+    # Request header triggering profiling; its value selects the format ("speedscope" or "html")
+    profiling_header: str = "X-Profile"
+    # Seconds between samples of the profiler
+    profiling_interval: float = 0.001
+    # Meter readings parsed at a time when aggregating meter data files
+    meter_chunk_rows: int = 100_000
+    # Largest meter data file accepted, uploaded or read from storage
+    meter_max_bytes: int = 512 * 1024 * 1024
 
 
 @lru_cache
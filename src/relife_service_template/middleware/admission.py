@@ -0,0 +1,218 @@
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from relife_service_template.config.settings import Settings, get_settings
+from relife_service_template.observability.metrics import ADMISSION_QUEUED, ADMISSION_REJECTED
+
+# Paths whose route template is remembered; the cache is cleared when full
+MAX_CACHED_PATHS = 4096
+
+
+class AdmissionLimiter:
+    """Weighted concurrency limit with a bounded first-in, first-out wait queue.
+
+    Admitted requests hold `cost` units of `capacity` until they finish. A request
+    that does not fit waits behind the requests queued before it, so a costly
+    request cannot be overtaken indefinitely by cheap ones.
+    """
+
+    def __init__(self, name: str, capacity: int, max_queue: int, timeout: float):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_use = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _admit_waiters(self) -> None:
+        while self._waiters:
+            cost, future = self._waiters[0]
+
+            if future.done():
+                self._waiters.popleft()
+                continue
+
+            if self.in_use + cost > self.capacity:
+                break
+
+            self._waiters.popleft()
+            self.in_use += cost
+            future.set_result(None)
+
+    async def acquire(self, cost: int) -> Optional[str]:
+        """Wait until `cost` units are available.
+
+        Returns:
+            None once admitted, or the rejection reason (`queue_full` or `timeout`)
+        """
+
+        cost = min(cost, self.capacity)
+
+        if not self._waiters and self.in_use + cost <= self.capacity:
+            self.in_use += cost
+            return None
+
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (cost, future)
+        self._waiters.append(waiter)
+
+        ADMISSION_QUEUED.labels(self.name).inc()
+
+        try:
+            await asyncio.wait({future}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(self.name).dec()
+
+        if future.done():
+            return None
+
+        self._abandon(waiter)
+        return "timeout"
+
+    def _abandon(self, waiter: Tuple[int, asyncio.Future]) -> None:
+        cost, future = waiter
+
+        if future.done():
+            # Admitted while giving up: hand the units back
+            self.release(cost)
+            return
+
+        future.cancel()
+        self._waiters.remove(waiter)
+        # The head of the queue may have been blocking smaller requests behind it
+        self._admit_waiters()
+
+    def release(self, cost: int) -> None:
+        self.in_use -= min(cost, self.capacity)
+        self._admit_waiters()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware limiting concurrent requests per route.
+
+    Each route template under `admission_path_prefix` gets its own limiter.
+    Requests cost one unit plus one per `admission_cost_unit_bytes` of declared
+    body, capped at half the route capacity so that a single large request
+    leaves room for small ones. Requests that do not fit wait in a bounded
+    queue; when the queue is full or the wait exceeds `admission_queue_timeout`
+    they are rejected at once with 503 and a Retry-After header instead of
+    piling up on the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings_provider: Callable[[], Settings] = get_settings,
+    ) -> None:
+        self.app = app
+        self._settings_provider = settings_provider
+        self._settings: Optional[Settings] = None
+        self._limiters: Dict[str, AdmissionLimiter] = {}
+        self._templates: Dict[str, Optional[str]] = {}
+
+    def _route_template(self, scope: Scope) -> Optional[str]:
+        path = scope["path"]
+
+        if path in self._templates:
+            return self._templates[path]
+
+        template = None
+        router = getattr(scope.get("app"), "router", None)
+
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+
+            if match != Match.NONE:
+                template = getattr(route, "path", None)
+                break
+
+        if len(self._templates) >= MAX_CACHED_PATHS:
+            self._templates.clear()
+
+        self._templates[path] = template
+        return template
+
+    def _limiter(self, template: str) -> AdmissionLimiter:
+        limiter = self._limiters.get(template)
+
+        if limiter is None:
+            settings = self._settings
+            limiter = AdmissionLimiter(
+                template,
+                settings.admission_route_limits.get(template, settings.admission_default_limit),
+                settings.admission_max_queue,
+                settings.admission_queue_timeout,
+            )
+            self._limiters[template] = limiter
+
+        return limiter
+
+    def _cost(self, scope: Scope, limiter: AdmissionLimiter) -> int:
+        # Chunked bodies without a declared length count as one unit
+        content_length = 0
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = int(value) if value.isdigit() else 0
+                break
+
+        extra = content_length // max(1, self._settings.admission_cost_unit_bytes)
+
+        return min(1 + extra, max(1, limiter.capacity // 2))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._settings is None:
+            self._settings = self._settings_provider()
+
+        settings = self._settings
+
+        if not settings.admission_enabled or not scope["path"].startswith(
+            settings.admission_path_prefix
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        template = self._route_template(scope)
+
+        if template is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._limiter(template)
+        cost = self._cost(scope, limiter)
+
+        rejection = await limiter.acquire(cost)
+
+        if rejection is not None:
+            ADMISSION_REJECTED.labels(template, rejection).inc()
+            response = JSONResponse(
+                {"detail": "Service is busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(settings.admission_retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(cost)
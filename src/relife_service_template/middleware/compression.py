@@ -0,0 +1,232 @@
+import gzip
+from typing import Callable, Dict, List, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from relife_service_template.config.settings import Settings, get_settings
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Content types that must reach the client unbuffered or are already compressed
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+)
+
+
+def _gzip_compress(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Return the content encoders supported by the installed libraries.
+
+    The optional Brotli and Zstandard libraries are imported here, on first
+    use, rather than at application import.
+
+    Returns:
+        Mapping of content-coding token to compression function
+    """
+
+    encoders: Dict[str, Callable[[bytes], bytes]] = {"gzip": _gzip_compress}
+
+    try:
+        import brotli
+
+        encoders["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+
+        # Compressor objects are not thread-safe, so one is created per body
+        encoders["zstd"] = lambda body: zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL
+        ).compress(body)
+    except ImportError:
+        pass
+
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """Select the content encoding to use for a response.
+
+    Args:
+        accept_encoding: Raw value of the client's Accept-Encoding header
+        preference: Server-side encodings in order of preference
+
+    Returns:
+        The chosen encoding, or None if the response should be sent as-is
+    """
+
+    accepted: Dict[str, float] = {}
+
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+
+        if not token:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+
+        accepted[token] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best_encoding = None
+    best_quality = 0.0
+
+    for encoding in preference:
+        quality = accepted.get(encoding, wildcard)
+
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+
+    return best_encoding
+
+
+class CompressionMiddleware:
+    """ASGI middleware applying negotiated gzip, Brotli or Zstandard compression.
+
+    Responses are only compressed when they are sent as a single body of at least
+    `compression_minimum_size` bytes. Bodies larger than `compression_offload_size`
+    are compressed in a worker thread so the event loop keeps serving other requests.
+    Streaming responses (e.g. server-sent events) are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings_provider: Callable[[], Settings] = get_settings,
+    ) -> None:
+        self.app = app
+        self._settings_provider = settings_provider
+        self._encoders: Optional[Dict[str, Callable[[bytes], bytes]]] = None
+
+    def _configure(self) -> None:
+        """Resolve settings and encoders on first use, once the environment is loaded."""
+
+        settings = self._settings_provider()
+        supported = available_encoders()
+
+        self.enabled = settings.compression_enabled
+        self.minimum_size = settings.compression_minimum_size
+        self.offload_size = settings.compression_offload_size
+        self.preference = [
+            encoding
+            for encoding in settings.compression_encodings
+            if encoding in supported
+        ]
+        self._encoders = supported
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._encoders is None:
+            self._configure()
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = (
+            negotiate_encoding(accept_encoding, self.preference)
+            if self.enabled and accept_encoding
+            else None
+        )
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            self.app,
+            encoding=encoding,
+            compress=self._encoders[encoding],
+            minimum_size=self.minimum_size,
+            offload_size=self.offload_size,
+        )
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper that buffers the response start and compresses the body."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoding: str,
+        compress: Callable[[bytes], bytes],
+        minimum_size: int,
+        offload_size: int,
+    ) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.compress = compress
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until we know whether the body is compressed
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or headers.get(
+                "content-type", ""
+            ).startswith(EXCLUDED_CONTENT_TYPES)
+            return
+
+        if message_type != "http.response.body" or self.started:
+            await self.send(message)
+            return
+
+        self.started = True
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough or more_body or len(body) < self.minimum_size:
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if len(body) >= self.offload_size:
+            compressed = await anyio.to_thread.run_sync(self.compress, body)
+        else:
+            compressed = self.compress(body)
+
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if len(compressed) < len(body):
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(compressed))
+            message["body"] = compressed
+
+        await self.send(self.initial_message)
+        await self.send(message)
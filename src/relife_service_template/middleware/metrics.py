@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from relife_service_template.observability.metrics import (
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    method_label,
+    route_label,
+)
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording request latency and in-flight counts.
+
+    Latency is labelled with the matched route template rather than the raw path
+    so that path parameters cannot inflate label cardinality.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_LATENCY.labels(
+                method_label(scope["method"]), route_label(scope), str(status_code)
+            ).observe(time.perf_counter() - start)
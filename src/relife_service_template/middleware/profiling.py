@@ -0,0 +1,149 @@
+import time
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from relife_service_template.auth import dependencies
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings, get_settings
+
+logger = get_logger(__name__)
+
+# Profile formats selected by the value of the profiling header
+PROFILE_FORMATS = {
+    "speedscope": "application/json",
+    "html": "text/html; charset=utf-8",
+}
+
+
+def _new_profiler(interval: float):
+    """Return a pyinstrument profiler following the request's task, or None if not installed."""
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+
+    return Profiler(interval=interval, async_mode="enabled")
+
+
+def _render(profiler, profile_format: str) -> str:
+    if profile_format == "html":
+        return profiler.output_html()
+
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    return profiler.output(renderer=SpeedscopeRenderer())
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling single requests on demand for admins.
+
+    A request carrying the `profiling_header` (e.g. `X-Profile: speedscope`) from
+    a user with the admin role runs under the pyinstrument sampling profiler, and
+    the profile is returned instead of the response: a speedscope JSON document,
+    or pyinstrument's HTML flame view for `html`. The status of the profiled
+    response is reported in `X-Profiled-Status`. Routing, dependencies (including
+    authentication), request validation and the service function all run inside
+    the profile. Requests without the header are passed straight through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings_provider: Callable[[], Settings] = get_settings,
+    ) -> None:
+        self.app = app
+        self._settings_provider = settings_provider
+        self._settings: Optional[Settings] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._settings is None:
+            self._settings = self._settings_provider()
+
+        settings = self._settings
+
+        if not settings.profiling_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        header = settings.profiling_header.lower().encode("latin-1")
+
+        if not any(name == header for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        response = await self._profile(scope, receive, settings)
+        await response(scope, receive, send)
+
+    async def _profile(self, scope: Scope, receive: Receive, settings: Settings) -> Response:
+        headers = Headers(scope=scope)
+        profile_format = headers[settings.profiling_header].strip().lower() or "speedscope"
+
+        if profile_format not in PROFILE_FORMATS:
+            return JSONResponse(
+                {"detail": f"Profile format must be one of: {', '.join(PROFILE_FORMATS)}"},
+                status_code=400,
+            )
+
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+
+        if scheme.lower() != "bearer" or not token:
+            return JSONResponse({"detail": "Profiling requires a bearer token"}, status_code=401)
+
+        try:
+            user = await dependencies.authenticate_admin(token, settings)
+        except HTTPException as e:
+            return JSONResponse({"detail": e.detail}, status_code=e.status_code)
+
+        profiler = _new_profiler(settings.profiling_interval)
+
+        if profiler is None:
+            return JSONResponse(
+                {"detail": "Profiling requires pyinstrument: pip install relife-service-template[profiling]"},
+                status_code=501,
+            )
+
+        status_code = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        start = time.perf_counter()
+        profiler.start()
+
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        duration = time.perf_counter() - start
+        logger.info(
+            "Request profiled",
+            path=scope["path"],
+            user_id=user.user_id,
+            status=status_code,
+            duration_ms=round(duration * 1000, 3),
+        )
+
+        response_headers = {"X-Profiled-Status": str(status_code)}
+
+        if profile_format == "speedscope":
+            # Downloaded and opened at https://www.speedscope.app
+            response_headers["Content-Disposition"] = 'attachment; filename="profile.speedscope.json"'
+
+        return Response(
+            _render(profiler, profile_format),
+            media_type=PROFILE_FORMATS[profile_format],
+            headers=response_headers,
+        )
@@ -0,0 +1,48 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from relife_service_template.observability import tracing
+from relife_service_template.observability.metrics import route_label
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span for every HTTP request.
+
+    Incoming W3C trace context headers are honoured so that spans join the
+    caller's trace. The span is renamed to the matched route template once
+    routing has happened. When tracing is disabled the request is passed
+    straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        with tracing.server_span(
+            f"{method} request", headers, **{"http.request.method": method}
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_label(scope)
+                span.update_name(f"{method} {route}")
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status_code)
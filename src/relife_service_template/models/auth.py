@@ -1,12 +1,14 @@
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from fastapi import HTTPException, status
-from gotrue.types import UserResponse
 from pydantic import BaseModel
 
 from relife_service_template.config.settings import get_settings
 
+if TYPE_CHECKING:
+    from gotrue.types import UserResponse
+
 
 class AuthenticationMethod(str, Enum):
     """Authentication method used to authenticate the user."""
@@ -50,7 +52,7 @@ class UniversalUser(BaseModel):
     identities: List[UserIdentity] = []
 
     @classmethod
-    def from_supabase_user(cls, user_response: UserResponse) -> "UniversalUser":
+    def from_supabase_user(cls, user_response: "UserResponse") -> "UniversalUser":
         """Create UniversalUser from Supabase UserResponse."""
 
         user = user_response.user
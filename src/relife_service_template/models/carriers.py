@@ -0,0 +1,68 @@
+#Define pydantic models for energy use and prices per carrier and year
+from typing import Dict, List, Union
+from pydantic import BaseModel, model_validator
+
+# Rows per carrier: keyed by carrier name, or a list of rows named by position
+CarrierMatrix = Union[Dict[str, List[float]], List[List[float]]]
+
+
+def carrier_rows(matrix: CarrierMatrix) -> Dict[str, List[float]]:
+    """Return the rows of a carrier matrix keyed by carrier name ("0", "1", ... for lists)."""
+
+    if isinstance(matrix, dict):
+        return matrix
+
+    return {str(i): row for i, row in enumerate(matrix)}
+
+
+def check_flat_energy(request: BaseModel) -> None:
+    """Reject flat energy use sent without the `energy_prices` field.
+
+    Both flat lists may be left out when a request only has carrier matrices,
+    but `energy_mix` alone is rejected as it was before they became optional.
+    """
+
+    if request.energy_mix and "energy_prices" not in request.model_fields_set:
+        raise ValueError("energy_prices is required when energy_mix is given")
+
+
+class CarrierEnergy(BaseModel):
+    """Yearly energy use and prices of several carriers (electricity, gas, district heat, ...).
+
+    Each carrier has one consumption value per year and either one price per
+    year or a single price applied to every year. Its energy cost is the sum
+    over the years of consumption times price.
+    """
+
+    consumption: CarrierMatrix
+    prices: CarrierMatrix
+
+    @model_validator(mode="after")
+    def _check_shapes(self):
+        if isinstance(self.consumption, list) and isinstance(self.prices, list):
+            if len(self.consumption) != len(self.prices):
+                raise ValueError(
+                    f"Got {len(self.consumption)} consumption rows "
+                    f"and {len(self.prices)} price rows"
+                )
+
+        consumption = carrier_rows(self.consumption)
+        prices = carrier_rows(self.prices)
+        unknown = set(prices) - set(consumption)
+
+        if unknown:
+            raise ValueError(
+                f"Prices for carriers without consumption: {', '.join(sorted(unknown))}"
+            )
+
+        for name, row in consumption.items():
+            if name not in prices:
+                raise ValueError(f"No prices for carrier '{name}'")
+
+            if len(prices[name]) not in (1, len(row)):
+                raise ValueError(
+                    f"Carrier '{name}' needs one price or one per year ({len(row)}), "
+                    f"got {len(prices[name])}"
+                )
+
+        return self
@@ -1,6 +1,7 @@
 #Define pydantic models for II calculations
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from relife_service_template.models.carriers import CarrierEnergy, check_flat_energy
 
 class IRRRequest(BaseModel):
         capex: float
@@ -9,15 +10,23 @@ class IRRRequest(BaseModel):
         loan_amount: float
         subsidy: float
         energy_savings: float
-        energy_mix: List[float]
-        energy_prices: List[float]
+        energy_mix: List[float] = []
+        energy_prices: List[float] = []
+        # Energy use and prices per carrier and year, added to the flat lists above
+        carriers: Optional[CarrierEnergy] = None
         maintenance_cost: float
         other_outflows: float
         project_lifetime: float
 
+        @model_validator(mode="after")
+        def _check_energy(self):
+            check_flat_energy(self)
+            return self
+
 
 class IRRResponse(BaseModel):
     irr: float
+    carrier_costs: Optional[Dict[str, float]] = None
     input: IRRRequest
 
 
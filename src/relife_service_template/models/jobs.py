@@ -0,0 +1,52 @@
+#Define pydantic models for asynchronous computation jobs
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.models.roi import ROIRequest
+
+JobKind = Literal["portfolio", "npv", "roi", "payback", "lcse"]
+JobState = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class NPVJobInput(BaseModel):
+    scenarios: List[NPVRequest] = Field(min_length=1)
+
+
+class ROIJobInput(BaseModel):
+    scenarios: List[ROIRequest] = Field(min_length=1)
+
+
+class JobSubmitRequest(BaseModel):
+    """Computation to run in the background."""
+
+    kind: JobKind
+    # Queued jobs with a higher priority start first
+    priority: int = Field(default=0, ge=0, le=9)
+    # Portfolio request, or {"scenarios": [...]} for the batch kinds
+    input: Dict[str, Any]
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: JobKind
+    status: JobState
+    priority: int
+    # Fraction of the work done, from 0 to 1
+    progress: float
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobListResponse(BaseModel):
+    jobs: List[JobStatus]
+
+
+class JobResultResponse(BaseModel):
+    id: str
+    kind: JobKind
+    # Portfolio response, or {"results": [...]} in scenario order for the batch kinds
+    result: Dict[str, Any]
@@ -0,0 +1,37 @@
+#Define pydantic models for LCSE and EAC calculations
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class LCSERequest(BaseModel):
+    capex: float
+    subsidy: float = 0.0
+    loan_amount: float = 0.0
+    discount_rate: float
+    lifetime: int = Field(ge=1)
+    # Energy saved per year by the renovation, in kWh
+    annual_energy_saved: float = Field(gt=0)
+    energy_mix: List[float] = []
+    energy_prices: List[float] = []
+    maintenance_cost: float = 0.0
+
+
+class LCSEResult(BaseModel):
+    # Levelized cost of saved energy, per kWh
+    lcse: float
+    # Equivalent annual cost of the investment and operating expenditure
+    eac: float
+    annuity_factor: float
+    capital_recovery_factor: float
+
+
+class LCSEResponse(LCSEResult):
+    input: LCSERequest
+
+
+class LCSEBatchRequest(BaseModel):
+    scenarios: List[LCSERequest] = Field(min_length=1)
+
+
+class LCSEBatchResponse(BaseModel):
+    results: List[LCSEResult]
@@ -0,0 +1,85 @@
+#Define pydantic models for meter data aggregation
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from relife_service_template.models.carriers import CarrierEnergy
+from relife_service_template.models.roi import ROIRequest
+
+
+class TariffRate(BaseModel):
+    """Time-of-use rate applying to the readings within its hours, weekdays and months."""
+
+    name: str
+    price: float
+    # Hours of the day (0-23) at the start of the reading
+    hours: List[int] = Field(default_factory=lambda: list(range(24)))
+    # Days of the week, Monday = 0
+    weekdays: List[int] = Field(default_factory=lambda: list(range(7)))
+    months: List[int] = Field(default_factory=lambda: list(range(1, 13)))
+
+
+class MeterTariff(BaseModel):
+    """Price per unit of a carrier; the first matching rate applies, else the default price."""
+
+    default_price: float
+    rates: List[TariffRate] = []
+
+
+class MeterOptions(BaseModel):
+    """How to read and aggregate a meter data file."""
+
+    # Column with the start time of each reading (ISO 8601)
+    timestamp_column: str = "timestamp"
+    # Columns with the consumption of each carrier in the reading
+    carriers: List[str] = Field(default=["consumption"], min_length=1)
+    resolution: Literal["yearly", "monthly"] = "yearly"
+    # Time zone for tariff hours if timestamps carry an offset (e.g. "Europe/Madrid")
+    timezone: Optional[str] = None
+    # Tariff per carrier column; carriers without one are aggregated but not priced
+    tariffs: Dict[str, MeterTariff] = {}
+    # Added to the energy cost of the priced carriers to give the OPEX
+    maintenance_cost: float = 0.0
+    # ROI inputs evaluated with the aggregated energy costs
+    roi: Optional[ROIRequest] = None
+    # File format; detected from the file name when not given
+    format: Optional[Literal["csv", "parquet"]] = None
+
+    @model_validator(mode="after")
+    def _check_tariffs(self):
+        unknown = set(self.tariffs) - set(self.carriers)
+
+        if unknown:
+            raise ValueError(f"Tariffs for unknown carriers: {', '.join(sorted(unknown))}")
+
+        return self
+
+
+class MeterStorageRequest(MeterOptions):
+    """Meter data file in the user's folder of the Supabase Storage bucket."""
+
+    path: str
+
+
+class MeterPeriod(BaseModel):
+    period: str
+    consumption: float
+    cost: Optional[float] = None
+
+
+class MeterCarrierSummary(BaseModel):
+    carrier: str
+    consumption: float
+    cost: Optional[float] = None
+    periods: List[MeterPeriod]
+    # Consumption per tariff rate ("default" outside every rate)
+    rate_consumption: Dict[str, float] = {}
+
+
+class MeterAggregationResponse(BaseModel):
+    resolution: str
+    readings: int
+    carriers: List[MeterCarrierSummary]
+    # Priced carriers per period, ready to send as `carriers` to OPEX, ROI and IRR
+    energy: Optional[CarrierEnergy] = None
+    opex: Optional[float] = None
+    roi: Optional[float] = None
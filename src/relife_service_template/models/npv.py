@@ -9,6 +9,7 @@ class NPVRequest(BaseModel):
     energy_savings: float
     initial_investment: float
     lifetime: int
+    energy_savings_growth: float = 0.0
 
 
 class NPVResponse(BaseModel):
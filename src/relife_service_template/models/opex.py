@@ -1,17 +1,26 @@
 #Define pydantic models for II calculations
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from relife_service_template.models.carriers import CarrierEnergy, check_flat_energy
 
 class OPEXRequest(BaseModel):
 
 
-    energy_mix: List[float]
-    energy_prices: List[float]
+    energy_mix: List[float] = []
+    energy_prices: List[float] = []
     maintenance_cost: float
+    # Energy use and prices per carrier and year, added to the flat lists above
+    carriers: Optional[CarrierEnergy] = None
+
+    @model_validator(mode="after")
+    def _check_energy(self):
+        check_flat_energy(self)
+        return self
 
 
 class OPEXResponse(BaseModel):
     opex: float
+    carrier_costs: Optional[Dict[str, float]] = None
     input: OPEXRequest
 
 
@@ -0,0 +1,24 @@
+#Define pydantic models for payback calculations
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from relife_service_template.models.npv import NPVRequest
+
+
+class PaybackResult(BaseModel):
+    # Years until cumulative flows repay the investment, None if not within the lifetime
+    payback_years: Optional[float]
+    # Same, using flows discounted at the request's discount rate
+    discounted_payback_years: Optional[float]
+
+
+class PaybackResponse(PaybackResult):
+    input: NPVRequest
+
+
+class PaybackBatchRequest(BaseModel):
+    scenarios: List[NPVRequest] = Field(min_length=1)
+
+
+class PaybackBatchResponse(BaseModel):
+    results: List[PaybackResult]
@@ -0,0 +1,68 @@
+#Define pydantic models for portfolio evaluation and budget-constrained selection
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class PortfolioBuilding(BaseModel):
+    """Renovation scenario of a single building in a portfolio."""
+
+    id: str
+    capex: float
+    subsidy: float = 0.0
+    loan_amount: float = 0.0
+    energy_savings: float
+    cash_flows: List[float] = []
+    lifetime: int
+    energy_mix: List[float] = []
+    energy_prices: List[float] = []
+    maintenance_cost: float = 0.0
+    other_outflows: float = 0.0
+
+
+class PortfolioRequest(BaseModel):
+    """Portfolio of buildings to evaluate and select under a capex budget."""
+
+    buildings: List[PortfolioBuilding] = Field(min_length=1)
+    discount_rate: float
+    budget: float = Field(ge=0)
+    # Cost charged against the budget: the gross capex or the initial investment
+    # after subsidies and loans
+    cost_basis: Literal["capex", "initial_investment"] = "capex"
+    # "knapsack" maximises total NPV exactly (up to the budget resolution),
+    # "greedy" selects by NPV per unit of cost, "auto" picks by portfolio size
+    method: Literal["auto", "knapsack", "greedy"] = "auto"
+    # Number of budget units used by the knapsack solver
+    budget_resolution: int = Field(default=1000, ge=1, le=100_000)
+    # Limit the returned rankings to the best N buildings (all when unset)
+    top: Optional[int] = Field(default=None, ge=0)
+
+
+class BuildingRanking(BaseModel):
+    id: str
+    rank: int
+    npv: float
+    roi: float
+    ii: float
+    cost: float
+    # NPV gained per unit of budget spent, unset for buildings without cost
+    npv_per_cost: Optional[float]
+    # Simple and discounted payback in years, unset if not reached within the lifetime
+    payback_years: Optional[float]
+    discounted_payback_years: Optional[float]
+    selected: bool
+
+
+class PortfolioTotals(BaseModel):
+    buildings: int
+    selected: int
+    cost: float
+    ii: float
+    npv: float
+    budget_remaining: float
+
+
+class PortfolioResponse(BaseModel):
+    method: Literal["knapsack", "greedy"]
+    selected: List[str]
+    totals: PortfolioTotals
+    rankings: List[BuildingRanking]
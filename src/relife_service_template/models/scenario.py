@@ -0,0 +1,44 @@
+#Define pydantic models for interactive what-if scenario sessions
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+
+from relife_service_template.models.irr import IRRRequest
+from relife_service_template.models.roi import ROIRequest
+
+
+class ScenarioCreateRequest(BaseModel):
+    """Scenario to keep on the server for incremental edits."""
+
+    indicator: Literal["roi", "irr"]
+    # Full ROI or IRR request, validated against the model of the indicator
+    input: Dict[str, Any]
+
+
+class PatchOperation(BaseModel):
+    """One JSON Patch (RFC 6902) operation.
+
+    Paths address a request field (`/subsidy`) or an item of an array field
+    (`/energy_prices/3`, `/energy_mix/-` to append).
+    """
+
+    op: Literal["add", "remove", "replace", "test"]
+    path: str
+    value: Any = None
+
+
+class ScenarioPatchRequest(BaseModel):
+    # Applied in order and atomically: the scenario is unchanged if any operation fails
+    operations: List[PatchOperation] = Field(min_length=1)
+
+
+class ScenarioResponse(BaseModel):
+    scenario_id: str
+    indicator: Literal["roi", "irr"]
+    roi: Optional[float] = None
+    irr: Optional[float] = None
+    # Cached intermediates the indicator was computed from
+    opex: float
+    ii: float
+    # Stages recomputed by this call; unchanged stages were served from the session
+    recomputed: List[str]
+    input: Union[ROIRequest, IRRRequest]
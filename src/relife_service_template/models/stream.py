@@ -0,0 +1,13 @@
+#Define pydantic models for batch evaluations streamed as server-sent events
+from typing import Any, Dict, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchStreamRequest(BaseModel):
+    """Batch of scenarios evaluated chunk by chunk with streamed progress."""
+
+    kind: Literal["npv", "roi", "payback", "lcse"]
+    # {"scenarios": [...]} with the request of the indicator for each scenario
+    input: Dict[str, Any]
+    # Scenarios per results event; the configured default when unset
+    chunk_size: Optional[int] = Field(default=None, ge=1, le=100_000)
@@ -0,0 +1,256 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from relife_service_template.observability import tracing
+
+# Latency buckets (seconds) covering sub-millisecond computations up to slow upstreams
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# HTTP methods reported as-is; anything else is folded into "OTHER"
+KNOWN_METHODS = frozenset(
+    {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+)
+
+# Route label used for requests that did not match any route (e.g. 404 scans),
+# so arbitrary paths never become label values
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "relife_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "relife_http_requests_in_flight",
+    "Number of HTTP requests currently being processed",
+    multiprocess_mode="livesum",
+)
+
+AUTH_LATENCY = Histogram(
+    "relife_auth_duration_seconds",
+    "Time spent authenticating requests by provider path and outcome",
+    ["provider", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+COMPUTATION_LATENCY = Histogram(
+    "relife_financial_computation_duration_seconds",
+    "Time spent in financial service functions by indicator",
+    ["indicator", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+OUTBOUND_LATENCY = Histogram(
+    "relife_outbound_http_duration_seconds",
+    "Latency of outbound calls to Supabase and Keycloak by target",
+    ["target", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DEPENDENCY_UP = Gauge(
+    "relife_dependency_up",
+    "Result of the latest background probe of each dependency (1 = healthy)",
+    ["dependency"],
+    multiprocess_mode="livemin",
+)
+
+CACHE_LOOKUPS = Counter(
+    "relife_cache_lookups_total",
+    "Cache lookups by cache name and result (hit or miss)",
+    ["cache", "result"],
+)
+
+COALESCED_REQUESTS = Counter(
+    "relife_coalesced_requests_total",
+    "Financial requests by indicator that ran a computation (leader) "
+    "or awaited an identical in-flight one (follower)",
+    ["indicator", "role"],
+)
+
+ADMISSION_QUEUED = Gauge(
+    "relife_admission_queued_requests",
+    "Requests waiting for admission by route template",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+
+ADMISSION_REJECTED = Counter(
+    "relife_admission_rejected_total",
+    "Requests rejected by admission control by route template and reason",
+    ["route", "reason"],
+)
+
+MICROBATCH_SIZE = Histogram(
+    "relife_microbatch_size",
+    "Number of requests evaluated together by the micro-batching dispatcher",
+    ["indicator"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+
+RESULTS_WRITTEN = Counter(
+    "relife_results_written_total",
+    "Computed results stored by the background result writer",
+)
+
+RESULTS_DROPPED = Counter(
+    "relife_results_dropped_total",
+    "Computed results the background result writer dropped, by reason",
+    ["reason"],
+)
+
+
+class _CacheHitRatioCollector:
+    """Expose the hit ratio of every cache as a gauge derived from lookup counts."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, Tuple[int, int]] = {}
+
+    def record(self, cache: str, hit: bool) -> None:
+        hits, total = self._counts.get(cache, (0, 0))
+        self._counts[cache] = (hits + int(hit), total + 1)
+
+    def collect(self):
+        yield _cache_hit_ratio_family(self._counts)
+
+
+class MultiProcessCacheHitRatioCollector:
+    """Expose the metrics of all workers, with hit ratios derived from their summed lookups.
+
+    The per-process ratio collector only sees its own worker, so in multi-process
+    mode the ratio is computed from the aggregated `relife_cache_lookups_total`.
+    """
+
+    def __init__(self, source) -> None:
+        self._source = source
+
+    def collect(self):
+        counts: Dict[str, Tuple[float, float]] = {}
+
+        for family in self._source.collect():
+            for sample in family.samples:
+                if sample.name == "relife_cache_lookups_total":
+                    hits, total = counts.get(sample.labels["cache"], (0.0, 0.0))
+                    hit = sample.value if sample.labels["result"] == "hit" else 0.0
+                    counts[sample.labels["cache"]] = (hits + hit, total + sample.value)
+
+            yield family
+
+        yield _cache_hit_ratio_family(counts)
+
+
+def _cache_hit_ratio_family(counts: Dict[str, Tuple[float, float]]) -> GaugeMetricFamily:
+    family = GaugeMetricFamily(
+        "relife_cache_hit_ratio",
+        "Fraction of cache lookups that were hits since process start",
+        labels=["cache"],
+    )
+
+    for cache, (hits, total) in counts.items():
+        family.add_metric([cache], hits / total if total else 0.0)
+
+    return family
+
+
+_cache_hit_ratio = _CacheHitRatioCollector()
+REGISTRY.register(_cache_hit_ratio)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Record the result of a cache lookup.
+
+    Args:
+        cache: Fixed, code-defined name of the cache
+        hit: Whether the lookup was served from the cache
+    """
+
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+    _cache_hit_ratio.record(cache, hit)
+
+
+def record_coalescing(indicator: str, follower: bool) -> None:
+    """Record whether a request ran its computation or joined an in-flight one.
+
+    Args:
+        indicator: Financial indicator of the request
+        follower: Whether the request awaited an identical in-flight computation
+    """
+
+    COALESCED_REQUESTS.labels(indicator, "follower" if follower else "leader").inc()
+
+
+@contextmanager
+def _timed(histogram: Histogram, span_name: str, *labels: str) -> Iterator[None]:
+    """Observe the duration of the wrapped block, labelled with its outcome.
+
+    The block is also wrapped in a tracing span, which is a no-op unless
+    tracing is enabled.
+    """
+
+    start = time.perf_counter()
+    outcome = "error"
+
+    try:
+        with tracing.span(span_name):
+            yield
+        outcome = "success"
+    finally:
+        histogram.labels(*labels, outcome).observe(time.perf_counter() - start)
+
+
+def observe_auth(provider: str):
+    """Time an authentication step (`supabase`, `keycloak` or `keycloak_roles`)."""
+
+    return _timed(AUTH_LATENCY, f"auth.{provider}", provider)
+
+
+def observe_computation(indicator: str):
+    """Time a financial service computation for the given indicator."""
+
+    return _timed(COMPUTATION_LATENCY, f"financial.{indicator}", indicator)
+
+
+def observe_outbound(target: str):
+    """Time an outbound call to an upstream dependency."""
+
+    return _timed(OUTBOUND_LATENCY, f"outbound.{target}", target)
+
+
+def route_label(scope: dict) -> str:
+    """Return a bounded route label for a request scope.
+
+    Args:
+        scope: The ASGI scope after routing
+
+    Returns:
+        The matched route template (e.g. `/table/{table_name}`) or `unmatched`
+    """
+
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def method_label(method: str) -> str:
+    """Return a bounded HTTP method label."""
+
+    return method if method in KNOWN_METHODS else "OTHER"
@@ -0,0 +1,230 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional
+
+import anyio
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability.metrics import DEPENDENCY_UP
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+ProbeCheck = Callable[[], Awaitable[None]]
+"""An async callable that returns when the dependency is healthy and raises otherwise."""
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of the most recent check of a single dependency."""
+
+    healthy: bool
+    checked_at: float
+    latency_ms: float
+    error: Optional[str] = None
+
+
+class DependencyProbes:
+    """Periodically checks dependencies in the background and caches the results.
+
+    Readiness is answered from the cached results only, so the `/ready` endpoint
+    never waits on Supabase or Keycloak. Results older than `max_staleness`
+    seconds count as unhealthy, which also covers a stalled probe loop.
+    """
+
+    def __init__(
+        self,
+        checks: Dict[str, ProbeCheck],
+        interval: float = 10.0,
+        timeout: float = 2.0,
+        max_staleness: float = 30.0,
+    ) -> None:
+        self._checks = checks
+        self._interval = interval
+        self._timeout = timeout
+        self._max_staleness = max_staleness
+        self._results: Dict[str, ProbeResult] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_check(self, name: str, check: ProbeCheck) -> None:
+        start = time.perf_counter()
+        error = None
+
+        try:
+            with anyio.fail_after(self._timeout):
+                await check()
+        except TimeoutError:
+            error = f"timed out after {self._timeout}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        result = ProbeResult(
+            healthy=error is None,
+            checked_at=time.time(),
+            latency_ms=(time.perf_counter() - start) * 1000,
+            error=error,
+        )
+
+        previous = self._results.get(name)
+        self._results[name] = result
+        DEPENDENCY_UP.labels(name).set(int(result.healthy))
+
+        if previous is None or previous.healthy != result.healthy:
+            if result.healthy:
+                logger.info("Dependency probe healthy", dependency=name)
+            else:
+                logger.warning("Dependency probe failing", dependency=name, error=error)
+
+    async def run_once(self) -> None:
+        """Run every check concurrently and update the cached results."""
+
+        await asyncio.gather(
+            *(self._run_check(name, check) for name, check in self._checks.items())
+        )
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        """Start the background refresh loop on the running event loop."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="dependency-probes")
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop."""
+
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    def _is_fresh(self, result: ProbeResult, now: float) -> bool:
+        return now - result.checked_at <= self._max_staleness
+
+    @property
+    def ready(self) -> bool:
+        """Whether every dependency has a fresh, healthy result."""
+
+        now = time.time()
+
+        return len(self._results) == len(self._checks) and all(
+            result.healthy and self._is_fresh(result, now)
+            for result in self._results.values()
+        )
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return the cached result of every dependency check."""
+
+        now = time.time()
+        snapshot = {}
+
+        for name in self._checks:
+            result = self._results.get(name)
+
+            if result is None:
+                snapshot[name] = {"healthy": False, "error": "not checked yet"}
+            else:
+                snapshot[name] = {**asdict(result), "stale": not self._is_fresh(result, now)}
+
+        return snapshot
+
+
+def _supabase_check(client: "httpx.AsyncClient", settings: Settings) -> ProbeCheck:
+    """Check the Supabase Auth (GoTrue) health endpoint."""
+
+    url = f"{settings.supabase_url.rstrip('/')}/auth/v1/health"
+    headers = {"apikey": settings.supabase_key}
+
+    async def check() -> None:
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+
+    return check
+
+
+def _keycloak_jwks_check(client: "httpx.AsyncClient", settings: Settings) -> ProbeCheck:
+    """Check that the Keycloak JWKS endpoint serves signing keys."""
+
+    url = f"{settings.keycloak_realm_url.rstrip('/')}/protocol/openid-connect/certs"
+
+    async def check() -> None:
+        response = await client.get(url)
+        response.raise_for_status()
+
+        if not response.json().get("keys"):
+            raise ValueError("JWKS document contains no keys")
+
+    return check
+
+
+async def _worker_pool_check() -> None:
+    """Check that the worker thread pool accepts and runs work."""
+
+    await anyio.to_thread.run_sync(time.monotonic)
+
+
+_probes: Optional[DependencyProbes] = None
+_probe_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_probes() -> Optional[DependencyProbes]:
+    """Return the running dependency probes, or None before startup."""
+
+    return _probes
+
+
+async def start_probes(settings: Settings) -> DependencyProbes:
+    """Create and start the dependency probes for the application lifetime.
+
+    Args:
+        settings: Application settings with dependency URLs and probe timings
+
+    Returns:
+        The started DependencyProbes instance
+    """
+
+    global _probes, _probe_client
+
+    import httpx
+
+    _probe_client = httpx.AsyncClient(timeout=settings.readiness_probe_timeout)
+
+    _probes = DependencyProbes(
+        checks={
+            "supabase": _supabase_check(_probe_client, settings),
+            "keycloak_jwks": _keycloak_jwks_check(_probe_client, settings),
+            "worker_pool": _worker_pool_check,
+        },
+        interval=settings.readiness_probe_interval,
+        timeout=settings.readiness_probe_timeout,
+        max_staleness=settings.readiness_max_staleness,
+    )
+    _probes.start()
+
+    return _probes
+
+
+async def stop_probes() -> None:
+    """Stop the dependency probes and close their HTTP client."""
+
+    global _probes, _probe_client
+
+    if _probes is not None:
+        await _probes.stop()
+        _probes = None
+
+    if _probe_client is not None:
+        await _probe_client.aclose()
+        _probe_client = None
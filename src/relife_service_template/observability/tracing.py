@@ -0,0 +1,165 @@
+from contextlib import nullcontext
+from typing import IO, Any, ContextManager, Optional
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+
+logger = get_logger(__name__)
+
+# Shared no-op context manager returned while tracing is disabled, so that
+# instrumented code pays a single global lookup and no allocation
+_NOOP_SPAN = nullcontext()
+
+_tracer: Optional[Any] = None
+_provider: Optional[Any] = None
+_propagate: Optional[Any] = None
+_trace_file: Optional[IO[str]] = None
+
+
+def is_enabled() -> bool:
+    """Check whether tracing has been configured and is active."""
+
+    return _tracer is not None
+
+
+def span(name: str, **attributes: Any) -> ContextManager:
+    """Open a span around the wrapped block.
+
+    Args:
+        name: The span name, e.g. `auth.supabase`
+        **attributes: Attributes to attach to the span
+
+    Returns:
+        A context manager that records the span, or a no-op when tracing is disabled
+    """
+
+    if _tracer is None:
+        return _NOOP_SPAN
+
+    return _tracer.start_as_current_span(name, attributes=attributes or None)
+
+
+def server_span(name: str, headers: dict, **attributes: Any) -> ContextManager:
+    """Open a server span continuing any trace propagated in the request headers.
+
+    Args:
+        name: The initial span name
+        headers: Request headers as a lower-cased string mapping
+        **attributes: Attributes to attach to the span
+
+    Returns:
+        A context manager yielding the span, or a no-op when tracing is disabled
+    """
+
+    if _tracer is None:
+        return _NOOP_SPAN
+
+    from opentelemetry.trace import SpanKind
+
+    return _tracer.start_as_current_span(
+        name,
+        context=_propagate.extract(headers),
+        kind=SpanKind.SERVER,
+        attributes=attributes or None,
+    )
+
+
+def _create_exporter(settings: Settings):
+    """Create the span exporter selected by `tracing_exporter`."""
+
+    global _trace_file
+
+    if settings.tracing_exporter == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        _trace_file = open(settings.tracing_file_path, "a", encoding="utf-8")
+
+        return ConsoleSpanExporter(
+            out=_trace_file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+
+    raise ValueError(f"Unknown tracing exporter: {settings.tracing_exporter}")
+
+
+def _instrument_httpx() -> None:
+    """Trace every outbound httpx request, including those made by the Supabase client."""
+
+    try:
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    except ImportError:
+        logger.debug("opentelemetry-instrumentation-httpx not installed")
+        return
+
+    HTTPXClientInstrumentor().instrument()
+
+
+def configure_tracing(settings: Settings) -> None:
+    """Configure OpenTelemetry tracing if enabled in settings.
+
+    Tracing requires the optional `tracing` extra. When it is disabled or the
+    OpenTelemetry SDK is not installed, all spans are no-ops.
+
+    Args:
+        settings: Application settings holding the tracing configuration
+    """
+
+    global _tracer, _provider, _propagate
+
+    if not settings.tracing_enabled or _tracer is not None:
+        return
+
+    try:
+        from opentelemetry import propagate, trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning(
+            "Tracing enabled but OpenTelemetry SDK is not installed",
+            extra="relife-service-template[tracing]",
+        )
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter(settings)))
+    trace.set_tracer_provider(provider)
+
+    _instrument_httpx()
+
+    _provider = provider
+    _propagate = propagate
+    _tracer = provider.get_tracer("relife_service_template")
+
+    logger.info(
+        "Tracing configured",
+        exporter=settings.tracing_exporter,
+        sample_ratio=settings.tracing_sample_ratio,
+    )
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and disable tracing."""
+
+    global _tracer, _provider, _trace_file
+
+    if _provider is not None:
+        _provider.shutdown()
+
+    if _trace_file is not None:
+        _trace_file.close()
+
+    _tracer = None
+    _provider = None
+    _trace_file = None
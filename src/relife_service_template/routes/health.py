@@ -1,8 +1,10 @@
 import time
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from relife_service_template.config.logging import get_logger
+from relife_service_template.observability.probes import get_probes
 
 router = APIRouter(tags=["health"])
 
@@ -14,3 +16,41 @@ async def health_check():
     """Basic health check endpoint that returns service status and current timestamp."""
 
     return {"status": "healthy", "timestamp": int(time.time())}
+
+
+@router.get("/live")
+async def liveness_check():
+    """Liveness probe that succeeds as long as the process can serve requests.
+
+    Dependency failures do not affect liveness, so a broken upstream does not
+    cause the orchestrator to restart healthy pods.
+    """
+
+    return {"status": "alive", "timestamp": int(time.time())}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness probe answered from cached background checks of dependencies.
+
+    Returns 503 until every dependency (Supabase, Keycloak JWKS and the worker
+    pool) has a fresh, healthy result. No dependency is contacted inline.
+    """
+
+    probes = get_probes()
+
+    if probes is None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "dependencies": {}},
+        )
+
+    ready = probes.ready
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "dependencies": probes.snapshot(),
+        },
+    )
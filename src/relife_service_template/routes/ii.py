@@ -2,12 +2,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from relife_service_template.models.ii import IIRequest, IIResponse
 from relife_service_template.services.ii import calculate_ii
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.results import record_result
 from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
 
 router = APIRouter(
     prefix="/financial",
     tags=["financial"],
     responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
 )
 
 @router.post("/ii", response_model=IIResponse, summary="Calculate Initial Investment")
@@ -20,16 +24,17 @@ async def ii_endpoint(
     """
 
     try:
-       ii_value = calculate_ii(
-            capex=request.capex,
-            interest_rate=request.interest_rate,
-            loan_term=request.loan_term,
-            loan_amount=request.loan_amount,
-            subsidy=request.subsidy,
-            
-
-        )
-       return IIResponse(ii=ii_value, input=request)
+       with observe_computation("ii"):
+           ii_value = calculate_ii(
+                capex=request.capex,
+                interest_rate=request.interest_rate,
+                loan_term=request.loan_term,
+                loan_amount=request.loan_amount,
+                subsidy=request.subsidy,
+            )
+       response = IIResponse(ii=ii_value, input=request)
+       record_result("ii", request, response)
+       return response
     except Exception as e:
         # Return a 400 with the error message if something went wrong
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
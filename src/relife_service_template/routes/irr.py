@@ -2,17 +2,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from relife_service_template.models.irr import IRRRequest, IRRResponse
 from relife_service_template.services.irr import calculate_irr
+from relife_service_template.services.opex import carrier_breakdown
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.services.coalescing import compute_coalesced
+from relife_service_template.services.results import record_result
 from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
 
 router = APIRouter(
     prefix="/financial",
     tags=["financial"],
     responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
 )
 
 @router.post("/irr", response_model=IRRResponse, summary="Calculate IRR")
 async def irr_endpoint(
     request: IRRRequest,
+    settings: SettingsDep,
     #user = Depends(get_current_user),
 ):
     """
@@ -20,20 +27,29 @@ async def irr_endpoint(
     """
 
     try:
-     irr_value = calculate_irr(
-        other_outflows=request.other_outflows,
-        energy_savings=request.energy_savings,
-        project_lifetime=request.project_lifetime,
-        energy_mix=request.energy_mix,
-        energy_prices=request.energy_prices,
-        maintenance_cost=request.maintenance_cost,
-        capex=request.capex,
-        interest_rate=request.interest_rate,
-        loan_term=request.loan_term,
-        loan_amount=request.loan_amount,
-        subsidy=request.subsidy,
-    )
-     return IRRResponse(irr=irr_value, input=request)
+     carrier_costs = carrier_breakdown(request.carriers)
+     irr_value = await compute_coalesced(
+        "irr",
+        request,
+        lambda: calculate_irr(
+          other_outflows=request.other_outflows,
+          energy_savings=request.energy_savings,
+          project_lifetime=request.project_lifetime,
+          energy_mix=request.energy_mix,
+          energy_prices=request.energy_prices,
+          maintenance_cost=request.maintenance_cost,
+          capex=request.capex,
+          interest_rate=request.interest_rate,
+          loan_term=request.loan_term,
+          loan_amount=request.loan_amount,
+          subsidy=request.subsidy,
+          carrier_energy_cost=sum((carrier_costs or {}).values()),
+        ),
+        enabled=settings.coalescing_enabled,
+     )
+     response = IRRResponse(irr=irr_value, carrier_costs=carrier_costs, input=request)
+     record_result("irr", request, response)
+     return response
     except Exception as e:
         # Return a 400 with the error message if something went wrong
      raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,135 @@
+import anyio
+from fastapi import APIRouter, HTTPException, Query
+from relife_service_template.auth.dependencies import RateLimitedUserDep
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.models.jobs import (
+    JobListResponse,
+    JobResultResponse,
+    JobStatus,
+    JobSubmitRequest,
+)
+from relife_service_template.services.jobs import (
+    JobManager,
+    JobQueueFull,
+    JobQuotaExceeded,
+    get_job_manager,
+    validate_job_input,
+)
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+)
+
+
+async def _job_manager(settings: SettingsDep) -> JobManager:
+    # Starting the manager creates the schema and worker threads, so keep it off the event loop
+    return await anyio.to_thread.run_sync(get_job_manager, settings)
+
+
+def _not_found(job_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202, summary="Submit a background job")
+async def submit_job_endpoint(
+    request: JobSubmitRequest,
+    settings: SettingsDep,
+    user: RateLimitedUserDep,
+):
+    """
+    Queue a portfolio optimisation or a batch of NPV, ROI, payback or LCSE
+    scenarios. Poll the returned job for its progress and fetch the result once
+    it has succeeded.
+    """
+
+    try:
+        job_input = validate_job_input(request.kind, request.input)
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+    manager = await _job_manager(settings)
+
+    try:
+        job = await anyio.to_thread.run_sync(
+            manager.submit, user.user_id, request.kind, request.priority, job_input
+        )
+    except JobQuotaExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    return JobStatus(**job)
+
+
+@router.get("/jobs", response_model=JobListResponse, summary="List background jobs")
+async def list_jobs_endpoint(
+    settings: SettingsDep,
+    user: RateLimitedUserDep,
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    """
+    List the most recent jobs of the user, newest first.
+    """
+
+    manager = await _job_manager(settings)
+    jobs = await anyio.to_thread.run_sync(manager.list, user.user_id, limit)
+
+    return JobListResponse(jobs=jobs)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus, summary="Get the status of a background job")
+async def get_job_endpoint(job_id: str, settings: SettingsDep, user: RateLimitedUserDep):
+    """
+    Return the status and progress of a job.
+    """
+
+    manager = await _job_manager(settings)
+    job = await anyio.to_thread.run_sync(manager.get, job_id, user.user_id)
+
+    if job is None:
+        raise _not_found(job_id)
+
+    return JobStatus(**job)
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=JobResultResponse,
+    summary="Get the result of a background job",
+)
+async def get_job_result_endpoint(job_id: str, settings: SettingsDep, user: RateLimitedUserDep):
+    """
+    Return the result of a succeeded job; 409 while it is queued or running,
+    or if it failed or was cancelled.
+    """
+
+    manager = await _job_manager(settings)
+    job = await anyio.to_thread.run_sync(manager.result, job_id, user.user_id)
+
+    if job is None:
+        raise _not_found(job_id)
+
+    if job["status"] != "succeeded":
+        detail = job["error"] or f"Job is {job['status']}"
+        raise HTTPException(status_code=409, detail=detail)
+
+    return JobResultResponse(id=job["id"], kind=job["kind"], result=job["result"])
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus, summary="Cancel a background job")
+async def cancel_job_endpoint(job_id: str, settings: SettingsDep, user: RateLimitedUserDep):
+    """
+    Cancel a job. Queued jobs are cancelled at once, running batch jobs stop at
+    their next progress update; finished jobs are returned unchanged.
+    """
+
+    manager = await _job_manager(settings)
+    job = await anyio.to_thread.run_sync(manager.cancel, job_id, user.user_id)
+
+    if job is None:
+        raise _not_found(job_id)
+
+    return JobStatus(**job)
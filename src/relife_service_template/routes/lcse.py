@@ -0,0 +1,76 @@
+import anyio
+from fastapi import APIRouter, Depends, HTTPException
+from relife_service_template.models.lcse import (
+    LCSEBatchRequest,
+    LCSEBatchResponse,
+    LCSERequest,
+    LCSEResponse,
+)
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.results import record_result
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
+)
+
+
+def _evaluate(scenarios):
+    # Imported here so numpy is only loaded once LCSE is computed
+    from relife_service_template.services.lcse import evaluate_lcse_requests
+
+    with observe_computation("lcse"):
+        return evaluate_lcse_requests(scenarios)
+
+
+@router.post(
+    "/lcse",
+    response_model=LCSEResponse,
+    summary="Calculate levelized cost of saved energy and equivalent annual cost",
+)
+async def lcse_endpoint(
+    request: LCSERequest,
+    #user = Depends(get_current_user),
+):
+    """
+    Calculate the Levelized Cost of Saved Energy (LCSE) and the Equivalent Annual
+    Cost (EAC) of a renovation.
+    """
+
+    try:
+        result = _evaluate([request])[0]
+        record_result("lcse", request, result)
+        return LCSEResponse(**result, input=request)
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/lcse/batch",
+    response_model=LCSEBatchResponse,
+    summary="Calculate LCSE and EAC for many scenarios",
+)
+async def lcse_batch_endpoint(
+    request: LCSEBatchRequest,
+    #user = Depends(get_current_user),
+):
+    """
+    Calculate LCSE and EAC for many scenarios in one vectorized pass. Results are
+    returned in the order of the scenarios.
+    """
+
+    try:
+        results = await anyio.to_thread.run_sync(_evaluate, request.scenarios)
+
+        for scenario, result in zip(request.scenarios, results):
+            record_result("lcse", scenario, result)
+
+        return LCSEBatchResponse(results=results)
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,107 @@
+import anyio
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.models.meter import (
+    MeterAggregationResponse,
+    MeterOptions,
+    MeterStorageRequest,
+)
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.results import record_result
+from relife_service_template.services.storage import download_storage_object
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import RateLimitedUserDep, rate_limit
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+)
+
+
+def _aggregate(file, filename, options, chunk_rows):
+    # Imported here so numpy and pandas are only loaded once meter data is aggregated
+    from relife_service_template.services.meter import aggregate_meter_file
+
+    with observe_computation("meter"):
+        return aggregate_meter_file(file, filename, options, chunk_rows)
+
+
+async def _evaluate(file, filename, options: MeterOptions, settings) -> MeterAggregationResponse:
+    try:
+        # Parsing runs chunk by chunk off the event loop
+        response = await anyio.to_thread.run_sync(
+            _aggregate, file, filename, options, settings.meter_chunk_rows
+        )
+    except ImportError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+    record_result("meter", options, response)
+    return response
+
+
+@router.post(
+    "/meter",
+    response_model=MeterAggregationResponse,
+    summary="Aggregate an uploaded meter data file",
+    dependencies=[Depends(rate_limit)],
+)
+async def meter_upload_endpoint(
+    settings: SettingsDep,
+    file: UploadFile = File(...),
+    options: str = Form("{}", description="MeterOptions as JSON"),
+    #user = Depends(get_current_user),
+):
+    """
+    Aggregate a CSV or Parquet file of high-resolution meter readings into
+    yearly or monthly consumption and costs per carrier, pricing each reading
+    with its time-of-use tariff. The priced carriers are returned in the form
+    OPEX, ROI and IRR accept, together with the OPEX and ROI they lead to.
+    """
+
+    try:
+        meter_options = MeterOptions.model_validate_json(options)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+    if file.size is not None and file.size > settings.meter_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Meter file is larger than {settings.meter_max_bytes} bytes",
+        )
+
+    # Uploads are spooled to disk by the server, so the file is read without loading it whole
+    return await _evaluate(file.file, file.filename, meter_options, settings)
+
+
+@router.post(
+    "/meter/storage",
+    response_model=MeterAggregationResponse,
+    summary="Aggregate a meter data file from storage",
+)
+async def meter_storage_endpoint(
+    request: MeterStorageRequest,
+    settings: SettingsDep,
+    user: RateLimitedUserDep,
+):
+    """
+    Aggregate a meter data file stored in the user's folder of the storage
+    bucket, as uploaded through `/storage`. The path is relative to the bucket
+    and must start with the user's id.
+    """
+
+    if not request.path.startswith(f"{user.user_id}/") or ".." in request.path.split("/"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Path outside the user's folder")
+
+    file = await download_storage_object(request.path, settings, settings.meter_max_bytes)
+
+    try:
+        options = MeterOptions(**request.model_dump(exclude={"path"}))
+        return await _evaluate(file, request.path, options, settings)
+    finally:
+        file.close()
@@ -0,0 +1,34 @@
+import os
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+)
+
+router = APIRouter(tags=["health"])
+
+
+def _registry() -> CollectorRegistry:
+    """Return the registry to expose, aggregating all workers in multi-process mode."""
+
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+
+    from prometheus_client import multiprocess
+
+    from relife_service_template.observability.metrics import MultiProcessCacheHitRatioCollector
+
+    registry = CollectorRegistry()
+    # Not registered itself: the wrapper yields its metrics along with the cache hit ratios
+    registry.register(MultiProcessCacheHitRatioCollector(multiprocess.MultiProcessCollector(None)))
+    return registry
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose Prometheus metrics in the text exposition format."""
+
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
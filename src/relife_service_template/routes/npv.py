@@ -3,17 +3,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from relife_service_template.models.npv import NPVRequest, NPVResponse
 from relife_service_template.services.npv import calculate_npv
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.services.coalescing import compute_coalesced
+from relife_service_template.services.microbatch import get_batcher
+from relife_service_template.services.results import record_result
 from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
 
 router = APIRouter(
     prefix="/financial",
     tags=["financial"],
     responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
 )
 
 @router.post("/npv", response_model=NPVResponse, summary="Calculate Net Present Value")
 async def npv_endpoint(
     request: NPVRequest,
+    settings: SettingsDep,
     #user = Depends(get_current_user),
 ):
     """
@@ -21,14 +28,23 @@ async def npv_endpoint(
     """
 
     try:
-       npv_value = calculate_npv(
-            cash_flows=request.cash_flows,
-            discount_rate=request.discount_rate,
-            energy_savings=request.energy_savings,
-            initial_investment=request.initial_investment,
-            lifetime=request.lifetime,
-        )
-       return NPVResponse(npv=npv_value, input=request)
+       npv_value = await compute_coalesced(
+            "npv",
+            request,
+            lambda: calculate_npv(
+                cash_flows=request.cash_flows,
+                discount_rate=request.discount_rate,
+                energy_savings=request.energy_savings,
+                initial_investment=request.initial_investment,
+                lifetime=request.lifetime,
+                energy_savings_growth=request.energy_savings_growth,
+            ),
+            enabled=settings.coalescing_enabled,
+            batcher=get_batcher("npv", settings),
+       )
+       response = NPVResponse(npv=npv_value, input=request)
+       record_result("npv", request, response)
+       return response
     except Exception as e:
         # Return a 400 with the error message if something went wrong
         raise HTTPException(status_code=400, detail=str(e))
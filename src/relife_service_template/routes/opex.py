@@ -1,13 +1,17 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from relife_service_template.models.opex import OPEXRequest, OPEXResponse
-from relife_service_template.services.opex import calculate_opex
+from relife_service_template.services.opex import calculate_opex, carrier_breakdown
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.results import record_result
 from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
 
 router = APIRouter(
     prefix="/financial",
     tags=["financial"],
     responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
 )
 
 @router.post("/opex", response_model=OPEXResponse, summary="Calculate Operational Expenses")
@@ -16,17 +20,22 @@ async def ii_endpoint(
     #user = Depends(get_current_user),
 ):
     """
-    Calculate the OPEX of Project.
+    Calculate the OPEX of Project. Energy use and prices may be given per
+    carrier and year in `carriers`; their costs are returned per carrier.
     """
 
     try:
-       opex_value = calculate_opex(
-            energy_mix=request.energy_mix,
-            energy_prices=request.energy_prices,
-            maintenance_cost=request.maintenance_cost,
-            
-  )
-       return OPEXResponse(opex=opex_value, input=request)
+       with observe_computation("opex"):
+           carrier_costs = carrier_breakdown(request.carriers)
+           opex_value = calculate_opex(
+                energy_mix=request.energy_mix,
+                energy_prices=request.energy_prices,
+                maintenance_cost=request.maintenance_cost,
+                carrier_energy_cost=sum((carrier_costs or {}).values()),
+            )
+       response = OPEXResponse(opex=opex_value, carrier_costs=carrier_costs, input=request)
+       record_result("opex", request, response)
+       return response
     except Exception as e:
         # Return a 400 with the error message if something went wrong
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,72 @@
+import anyio
+from fastapi import APIRouter, Depends, HTTPException
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.models.payback import (
+    PaybackBatchRequest,
+    PaybackBatchResponse,
+    PaybackResponse,
+)
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.results import record_result
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
+)
+
+
+def _evaluate(scenarios):
+    # Imported here so numpy is only loaded once payback is computed
+    from relife_service_template.services.payback import evaluate_payback_requests
+
+    with observe_computation("payback"):
+        return evaluate_payback_requests(scenarios)
+
+
+@router.post("/payback", response_model=PaybackResponse, summary="Calculate payback period")
+async def payback_endpoint(
+    request: NPVRequest,
+    #user = Depends(get_current_user),
+):
+    """
+    Calculate the simple and discounted payback period, in fractional years, of
+    the cash flows used for the Net Present Value.
+    """
+
+    try:
+        result = _evaluate([request])[0]
+        record_result("payback", request, result)
+        return PaybackResponse(**result, input=request)
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/payback/batch",
+    response_model=PaybackBatchResponse,
+    summary="Calculate payback periods for many scenarios",
+)
+async def payback_batch_endpoint(
+    request: PaybackBatchRequest,
+    #user = Depends(get_current_user),
+):
+    """
+    Calculate simple and discounted payback periods for many scenarios in one
+    vectorized pass. Results are returned in the order of the scenarios.
+    """
+
+    try:
+        results = await anyio.to_thread.run_sync(_evaluate, request.scenarios)
+
+        for scenario, result in zip(request.scenarios, results):
+            record_result("payback", scenario, result)
+
+        return PaybackBatchResponse(results=results)
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
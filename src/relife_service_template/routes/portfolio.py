@@ -0,0 +1,47 @@
+import anyio
+from fastapi import APIRouter, Depends, HTTPException
+from relife_service_template.models.portfolio import PortfolioRequest, PortfolioResponse
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.results import record_result
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
+)
+
+
+def _optimise(request: PortfolioRequest) -> PortfolioResponse:
+    # Imported here so numpy is only loaded once a portfolio is evaluated
+    from relife_service_template.services.portfolio import optimise_portfolio
+
+    with observe_computation("portfolio"):
+        return optimise_portfolio(request)
+
+
+@router.post(
+    "/portfolio",
+    response_model=PortfolioResponse,
+    summary="Rank a building portfolio and select renovations within a budget",
+)
+async def portfolio_endpoint(
+    request: PortfolioRequest,
+    #user = Depends(get_current_user),
+):
+    """
+    Evaluate NPV, ROI and II of every building in a portfolio, rank the buildings
+    by NPV per unit of cost and select the set maximising total NPV within the
+    capex budget.
+    """
+
+    try:
+        # Large portfolios take a while, so they are evaluated off the event loop
+        response = await anyio.to_thread.run_sync(_optimise, request)
+        record_result("portfolio", request, response)
+        return response
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
@@ -2,17 +2,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from relife_service_template.models.roi import ROIRequest, ROIResponse
 from relife_service_template.services.roi import calculate_roi
+from relife_service_template.services.opex import carrier_breakdown
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.services.coalescing import compute_coalesced
+from relife_service_template.services.microbatch import get_batcher
+from relife_service_template.services.results import record_result
 from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
 
 router = APIRouter(
     prefix="/financial",
     tags=["financial"],
     responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
 )
 
 @router.post("/roi", response_model=ROIResponse, summary="Calculate ROI")
 async def roi_endpoint(
     request: ROIRequest,
+    settings: SettingsDep,
     #user = Depends(get_current_user),
 ):
     """
@@ -20,19 +28,29 @@ async def roi_endpoint(
     """
 
     try:
-     roi_value = calculate_roi(
-        capex=request.capex,
-        interest_rate=request.interest_rate,
-        loan_term=request.loan_term,
-        loan_amount=request.loan_amount,
-        subsidy=request.subsidy,
-        energy_savings=request.energy_savings,
-        energy_mix=request.energy_mix,
-        energy_prices=request.energy_prices,
-        maintenance_cost=request.maintenance_cost,
-        other_outflows=request.other_outflows,
-    )
-     return ROIResponse(roi=roi_value, input=request)
+     carrier_costs = carrier_breakdown(request.carriers)
+     roi_value = await compute_coalesced(
+        "roi",
+        request,
+        lambda: calculate_roi(
+          capex=request.capex,
+          interest_rate=request.interest_rate,
+          loan_term=request.loan_term,
+          loan_amount=request.loan_amount,
+          subsidy=request.subsidy,
+          energy_savings=request.energy_savings,
+          energy_mix=request.energy_mix,
+          energy_prices=request.energy_prices,
+          maintenance_cost=request.maintenance_cost,
+          other_outflows=request.other_outflows,
+          carrier_energy_cost=sum((carrier_costs or {}).values()),
+        ),
+        enabled=settings.coalescing_enabled,
+        batcher=get_batcher("roi", settings),
+     )
+     response = ROIResponse(roi=roi_value, carrier_costs=carrier_costs, input=request)
+     record_result("roi", request, response)
+     return response
     except Exception as e:
         # Return a 400 with the error message if something went wrong
      raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.models.scenario import (
+    ScenarioCreateRequest,
+    ScenarioPatchRequest,
+    ScenarioResponse,
+)
+from relife_service_template.services.scenarios import Scenario, ScenarioTooLarge, get_scenario_store
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
+)
+
+
+def _response(scenario_id: str, scenario: Scenario) -> ScenarioResponse:
+    return ScenarioResponse(
+        scenario_id=scenario_id,
+        indicator=scenario.indicator,
+        roi=scenario.values.get("roi"),
+        irr=scenario.values.get("irr"),
+        opex=scenario.values["opex"],
+        ii=scenario.values["ii"],
+        recomputed=scenario.recomputed,
+        input=scenario.request,
+    )
+
+
+def _not_found(scenario_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' not found or expired")
+
+
+@router.post(
+    "/scenarios",
+    response_model=ScenarioResponse,
+    status_code=201,
+    summary="Create a what-if scenario",
+)
+async def create_scenario_endpoint(
+    request: ScenarioCreateRequest,
+    settings: SettingsDep,
+    #user = Depends(get_current_user),
+):
+    """
+    Evaluate an ROI or IRR request and keep it on the server, so later edits
+    can be sent as JSON Patch operations instead of the full request.
+    """
+
+    try:
+        scenario_id, scenario = get_scenario_store(settings).create(request.indicator, request.input)
+        return _response(scenario_id, scenario)
+    except ScenarioTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/scenarios/{scenario_id}", response_model=ScenarioResponse, summary="Get a what-if scenario")
+async def get_scenario_endpoint(
+    scenario_id: str,
+    settings: SettingsDep,
+    #user = Depends(get_current_user),
+):
+    """
+    Return the current request and results of a scenario.
+    """
+
+    scenario = get_scenario_store(settings).get(scenario_id)
+
+    if scenario is None:
+        raise _not_found(scenario_id)
+
+    return _response(scenario_id, scenario)
+
+
+@router.patch(
+    "/scenarios/{scenario_id}",
+    response_model=ScenarioResponse,
+    summary="Edit a what-if scenario",
+)
+async def patch_scenario_endpoint(
+    scenario_id: str,
+    request: ScenarioPatchRequest,
+    settings: SettingsDep,
+    #user = Depends(get_current_user),
+):
+    """
+    Apply JSON Patch operations to the scenario request and recompute only the
+    intermediates (energy costs, OPEX, II) that depend on the changed fields.
+    """
+
+    try:
+        scenario = get_scenario_store(settings).apply(scenario_id, request.operations)
+    except ScenarioTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if scenario is None:
+        raise _not_found(scenario_id)
+
+    return _response(scenario_id, scenario)
+
+
+@router.delete("/scenarios/{scenario_id}", status_code=204, summary="Delete a what-if scenario")
+async def delete_scenario_endpoint(
+    scenario_id: str,
+    settings: SettingsDep,
+    #user = Depends(get_current_user),
+):
+    """
+    Drop a scenario before it expires.
+    """
+
+    if not get_scenario_store(settings).delete(scenario_id):
+        raise _not_found(scenario_id)
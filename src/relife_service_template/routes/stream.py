@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from relife_service_template.config.settings import SettingsDep
+from relife_service_template.models.stream import BatchStreamRequest
+from relife_service_template.services.jobs import validate_job_input
+from relife_service_template.services.streaming import stream_batch
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles as get_current_user
+from relife_service_template.auth.dependencies import rate_limit
+
+router = APIRouter(
+    prefix="/financial",
+    tags=["financial"],
+    responses={401: {"description": "Unauthorized"}},
+    dependencies=[Depends(rate_limit)],
+)
+
+
+@router.post(
+    "/batch/stream",
+    response_class=StreamingResponse,
+    summary="Evaluate a batch with streamed progress",
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def batch_stream_endpoint(
+    request: BatchStreamRequest,
+    http_request: Request,
+    response: Response,
+    settings: SettingsDep,
+    #user = Depends(get_current_user),
+):
+    """
+    Evaluate NPV, ROI, payback or LCSE scenarios chunk by chunk and stream the
+    results of every chunk with the progress (scenarios done, throughput, ETA)
+    as server-sent events. Closing the connection stops the evaluation.
+    """
+
+    try:
+        batch = validate_job_input(request.kind, request.input)
+    except Exception as e:
+        # Return a 400 with the error message if something went wrong
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_batch(
+            request.kind,
+            batch.scenarios,
+            request.chunk_size or settings.stream_chunk_size,
+            http_request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the events; rate limit headers are set by the dependency
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **response.headers},
+    )
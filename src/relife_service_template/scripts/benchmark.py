@@ -0,0 +1,662 @@
+"""
+Benchmarks the financial service functions, the HTTP endpoints and the
+authentication dependency, and compares results against a saved baseline.
+
+Three groups of benchmarks are run:
+- Service functions (NPV, IRR, ROI, OPEX, II) across project lifetimes, as single
+  scenarios and through their vectorized batch kernels at several batch sizes
+- End-to-end endpoint throughput through an in-process ASGI client
+- Authentication dependency overhead with stubbed Supabase and Keycloak upstreams
+
+Results are written as JSON so that a later run can be compared against them
+with the `compare` command, which exits non-zero on regressions.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+import httpx
+import jwt
+import numpy as np
+from cryptography.hazmat.primitives.asymmetric import rsa
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from relife_service_template.app import app
+from relife_service_template.config.settings import Settings, get_settings
+from relife_service_template.services.batch import (
+    initial_investment_batch,
+    irr_batch,
+    npv_batch,
+    opex_batch,
+    roi_batch,
+)
+from relife_service_template.services.ii import calculate_ii
+from relife_service_template.services.irr import calculate_irr
+from relife_service_template.services.npv import calculate_npv
+from relife_service_template.services.opex import calculate_opex
+from relife_service_template.services.roi import calculate_roi
+
+# Configuration constants
+DEFAULT_OUTPUT = ".benchmarks/results.json"
+DEFAULT_PROFILE = "quick"
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+ENDPOINT_CONCURRENCY = 16
+# Small batches are repeated until at least this much time has been measured
+MIN_MEASURE_SECONDS = 0.2
+BENCH_BASE_URL = "http://benchmark"
+BENCH_REALM_URL = "http://keycloak.benchmark/realms/relife"
+BENCH_CLIENT_ID = "benchmark-client"
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "quick": {
+        "lifetimes": [1, 30, 100],
+        "batch_sizes": [1, 100, 1_000],
+        "endpoint_requests": 200,
+        "auth_requests": 200,
+    },
+    "full": {
+        "lifetimes": [1, 10, 30, 50, 100],
+        # Larger batches of 100-year scenarios need several GB for the NPV matrix
+        "batch_sizes": [1, 100, 10_000, 100_000],
+        "endpoint_requests": 2_000,
+        "auth_requests": 2_000,
+    },
+}
+
+
+def _result(
+    group: str, name: str, seconds_per_op: float, operations: int, **extra: Any
+) -> Dict[str, Any]:
+    """Build a single benchmark result record."""
+
+    return {
+        "group": group,
+        "name": name,
+        "seconds_per_op": seconds_per_op,
+        "ops_per_second": 1.0 / seconds_per_op if seconds_per_op > 0 else 0.0,
+        "operations": operations,
+        **extra,
+    }
+
+
+def build_service_cases(lifetime: int) -> Dict[str, Callable[[], Any]]:
+    """Build one representative scenario per financial indicator.
+
+    Args:
+        lifetime: Project lifetime in years, which sets the length of every
+            yearly array in the scenario.
+
+    Returns:
+        Mapping of indicator name to a zero-argument callable evaluating it
+    """
+
+    cash_flows = [1_000.0 + 10.0 * year for year in range(lifetime)]
+    energy_mix = [12_000.0 - 50.0 * year for year in range(lifetime)]
+    energy_prices = [0.25 + 0.002 * year for year in range(lifetime)]
+
+    loan = {
+        "capex": 50_000.0,
+        "interest_rate": 0.04,
+        "loan_term": 10.0,
+        "loan_amount": 20_000.0,
+        "subsidy": 5_000.0,
+    }
+    operations = {
+        "energy_savings": 4_000.0,
+        "energy_mix": energy_mix,
+        "energy_prices": energy_prices,
+        "maintenance_cost": 500.0,
+        "other_outflows": 200.0,
+    }
+
+    return {
+        "npv": lambda: calculate_npv(
+            cash_flows=cash_flows,
+            discount_rate=0.05,
+            energy_savings=4_000.0,
+            initial_investment=50_000.0,
+            lifetime=lifetime,
+        ),
+        "irr": lambda: calculate_irr(
+            **loan, **operations, project_lifetime=float(lifetime)
+        ),
+        "roi": lambda: calculate_roi(**loan, **operations),
+        "opex": lambda: calculate_opex(
+            energy_mix=energy_mix,
+            energy_prices=energy_prices,
+            maintenance_cost=500.0,
+        ),
+        "ii": lambda: calculate_ii(**loan),
+    }
+
+
+def build_batch_cases(lifetime: int, batch_size: int) -> Dict[str, Callable[[], Any]]:
+    """Build the scenarios of `build_service_cases` as batches for the vectorized kernels.
+
+    Args:
+        lifetime: Project lifetime in years, which sets the width of the yearly matrices
+        batch_size: Number of scenarios per batch
+
+    Returns:
+        Mapping of indicator name to a zero-argument callable evaluating the whole batch
+    """
+
+    def column(value: float) -> np.ndarray:
+        return np.full(batch_size, value)
+
+    def rows(row: List[float]) -> np.ndarray:
+        return np.tile(np.asarray(row, dtype=float), (batch_size, 1))
+
+    years = np.arange(lifetime)
+    cash_flows = rows(1_000.0 + 10.0 * years)
+    energy_mix = rows(12_000.0 - 50.0 * years)
+    energy_prices = rows(0.25 + 0.002 * years)
+
+    capex, loan_amount, subsidy = column(50_000.0), column(20_000.0), column(5_000.0)
+    operations = {
+        "capex": capex,
+        "loan_amount": loan_amount,
+        "subsidy": subsidy,
+        "energy_savings": column(4_000.0),
+        "energy_mix": energy_mix,
+        "energy_prices": energy_prices,
+        "maintenance_cost": column(500.0),
+        "other_outflows": column(200.0),
+    }
+
+    return {
+        "npv": lambda: npv_batch(
+            cash_flows=cash_flows,
+            discount_rate=column(0.05),
+            energy_savings=column(4_000.0),
+            initial_investment=column(50_000.0),
+            lifetime=column(lifetime),
+        ),
+        "irr": lambda: irr_batch(**operations, unpriced_carriers=column(0.0)),
+        "roi": lambda: roi_batch(**operations),
+        "opex": lambda: opex_batch(energy_mix, energy_prices, column(500.0)),
+        "ii": lambda: initial_investment_batch(capex, subsidy, loan_amount),
+    }
+
+
+def measure(function: Callable[[], Any], scenarios: int = 1) -> float:
+    """Measure the mean time to evaluate one scenario.
+
+    Args:
+        function: Zero-argument callable evaluating `scenarios` scenarios per call
+        scenarios: Number of scenarios evaluated by one call
+
+    Returns:
+        Mean seconds per scenario
+    """
+
+    calls = 0
+    start = time.perf_counter()
+
+    while True:
+        function()
+        calls += 1
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= MIN_MEASURE_SECONDS:
+            return elapsed / (calls * scenarios)
+
+
+def run_service_benchmarks(
+    lifetimes: List[int], batch_sizes: List[int]
+) -> List[Dict[str, Any]]:
+    """Benchmark every financial service function.
+
+    A batch size of 1 measures the scalar function used by the single-scenario
+    endpoints; larger sizes measure the vectorized kernel evaluating the whole
+    batch in one call. Either way the result is seconds per scenario.
+
+    Args:
+        lifetimes: Project lifetimes (years) to benchmark
+        batch_sizes: Numbers of scenarios evaluated per batch
+
+    Returns:
+        List of benchmark result records
+    """
+
+    results = []
+
+    for lifetime in lifetimes:
+        for batch_size in batch_sizes:
+            if batch_size == 1:
+                cases = build_service_cases(lifetime)
+            else:
+                cases = build_batch_cases(lifetime, batch_size)
+
+            for indicator, function in cases.items():
+                seconds = measure(function, batch_size)
+                results.append(
+                    _result(
+                        "service",
+                        f"service.{indicator}[lifetime={lifetime},batch={batch_size}]",
+                        seconds,
+                        batch_size,
+                    )
+                )
+
+    return results
+
+
+def build_endpoint_payloads(lifetime: int = 30) -> Dict[str, Dict[str, Any]]:
+    """Build request bodies for every financial endpoint.
+
+    Args:
+        lifetime: Project lifetime in years used for yearly arrays
+
+    Returns:
+        Mapping of endpoint path to JSON request body
+    """
+
+    energy_mix = [12_000.0] * lifetime
+    energy_prices = [0.25] * lifetime
+    loan = {
+        "capex": 50_000.0,
+        "interest_rate": 0.04,
+        "loan_term": 10.0,
+        "loan_amount": 20_000.0,
+        "subsidy": 5_000.0,
+    }
+    operations = {
+        "energy_savings": 4_000.0,
+        "energy_mix": energy_mix,
+        "energy_prices": energy_prices,
+        "maintenance_cost": 500.0,
+        "other_outflows": 200.0,
+    }
+
+    return {
+        "/financial/npv": {
+            "cash_flows": [1_000.0] * lifetime,
+            "discount_rate": 0.05,
+            "energy_savings": 4_000.0,
+            "initial_investment": 50_000.0,
+            "lifetime": lifetime,
+        },
+        "/financial/irr": {**loan, **operations, "project_lifetime": lifetime},
+        "/financial/roi": {**loan, **operations},
+        "/financial/opex": {
+            "energy_mix": energy_mix,
+            "energy_prices": energy_prices,
+            "maintenance_cost": 500.0,
+        },
+        "/financial/ii": loan,
+    }
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    requests: int,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Send requests with bounded concurrency and summarize throughput and latency."""
+
+    semaphore = asyncio.Semaphore(ENDPOINT_CONCURRENCY)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - start)
+
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    return {
+        "seconds_per_op": elapsed / requests,
+        "p50_seconds": statistics.median(latencies),
+        "p99_seconds": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "errors": errors,
+    }
+
+
+async def run_endpoint_benchmarks(requests: int) -> List[Dict[str, Any]]:
+    """Benchmark end-to-end throughput of the financial endpoints.
+
+    Args:
+        requests: Number of requests sent to each endpoint
+
+    Returns:
+        List of benchmark result records
+    """
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url=BENCH_BASE_URL) as client:
+        for path, payload in build_endpoint_payloads().items():
+            summary = await _drive(client, "POST", path, requests, json=payload)
+            seconds = summary.pop("seconds_per_op")
+            results.append(
+                _result("endpoint", f"endpoint.POST {path}", seconds, requests, **summary)
+            )
+
+    return results
+
+
+class _StubSupabaseAuth:
+    """Stand-in for the Supabase auth API returning a fixed user."""
+
+    def __init__(self, user: SimpleNamespace) -> None:
+        self._user = user
+
+    async def get_user(self, token: str) -> SimpleNamespace:
+        return SimpleNamespace(user=self._user)
+
+
+def _benchmark_settings() -> Settings:
+    """Settings pointing at stub upstreams that are never contacted."""
+
+    return Settings(
+        supabase_url="http://supabase.benchmark",
+        supabase_key="benchmark-key",
+        keycloak_client_id=BENCH_CLIENT_ID,
+        keycloak_client_secret="benchmark-secret",
+        keycloak_realm_url=BENCH_REALM_URL,
+    )
+
+
+def _keycloak_token() -> tuple[str, Any]:
+    """Create an RS256 token as Keycloak would issue it, and its public key."""
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    claims = {
+        "iss": BENCH_REALM_URL,
+        "sub": "benchmark-keycloak-user",
+        "azp": BENCH_CLIENT_ID,
+        "email": "keycloak@benchmark.local",
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+    }
+    token = jwt.encode(claims, private_key, algorithm="RS256")
+
+    return token, private_key.public_key()
+
+
+async def run_auth_benchmarks(requests: int) -> List[Dict[str, Any]]:
+    """Benchmark authentication overhead with stubbed Supabase and Keycloak.
+
+    `/health` (no authentication) is measured as a reference alongside `/whoami`
+    authenticated through the Supabase path and through the Keycloak fallback,
+    where the JWT signature is verified for real against a local key.
+
+    Args:
+        requests: Number of requests sent per scenario
+
+    Returns:
+        List of benchmark result records
+    """
+
+    supabase_user = SimpleNamespace(
+        id="benchmark-supabase-user",
+        email="supabase@benchmark.local",
+        user_metadata={},
+        identities=[],
+    )
+    token, public_key = _keycloak_token()
+    jwks_client = SimpleNamespace(
+        get_signing_key_from_jwt=lambda _: SimpleNamespace(key=public_key)
+    )
+
+    async def supabase_client(settings):
+        return SimpleNamespace(auth=_StubSupabaseAuth(supabase_user))
+
+    async def unavailable_supabase_client(settings):
+        raise ConnectionError("Supabase stubbed as unavailable")
+
+    async def no_roles(*args):
+        return []
+
+    scenarios = {
+        "auth.none[/health]": ("/health", supabase_client),
+        "auth.supabase[/whoami]": ("/whoami", supabase_client),
+        "auth.keycloak_fallback[/whoami]": ("/whoami", unavailable_supabase_client),
+    }
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    app.dependency_overrides[get_settings] = _benchmark_settings
+
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=BENCH_BASE_URL
+        ) as client:
+            for name, (path, client_factory) in scenarios.items():
+                with (
+                    patch(
+                        "relife_service_template.auth.dependencies.get_service_client",
+                        client_factory,
+                    ),
+                    patch(
+                        "relife_service_template.auth.dependencies.fetch_user_roles",
+                        no_roles,
+                    ),
+                    patch(
+                        "relife_service_template.auth.keycloak._get_jwks_client",
+                        lambda _: jwks_client,
+                    ),
+                ):
+                    summary = await _drive(
+                        client, "GET", path, requests, headers=headers
+                    )
+
+                seconds = summary.pop("seconds_per_op")
+                results.append(_result("auth", name, seconds, requests, **summary))
+    finally:
+        app.dependency_overrides.pop(get_settings, None)
+
+    return results
+
+
+def run_benchmarks(profile: str) -> Dict[str, Any]:
+    """Run every benchmark group for a profile.
+
+    Args:
+        profile: Name of the profile in PROFILES
+
+    Returns:
+        Benchmark report with environment metadata and results
+    """
+
+    config = PROFILES[profile]
+
+    results = run_service_benchmarks(config["lifetimes"], config["batch_sizes"])
+    results += asyncio.run(run_endpoint_benchmarks(config["endpoint_requests"]))
+    results += asyncio.run(run_auth_benchmarks(config["auth_requests"]))
+
+    return {
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "profile": profile,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    """Compare two benchmark reports.
+
+    Args:
+        baseline: Previously saved report
+        current: Report to check against the baseline
+        threshold: Relative slowdown (e.g. 0.1 for 10%) above which a
+            benchmark counts as a regression
+
+    Returns:
+        One comparison per benchmark present in both reports
+    """
+
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    comparisons = []
+
+    for result in current["results"]:
+        reference = baseline_results.get(result["name"])
+
+        if reference is None or reference["seconds_per_op"] <= 0:
+            continue
+
+        change = result["seconds_per_op"] / reference["seconds_per_op"] - 1.0
+
+        comparisons.append(
+            {
+                "name": result["name"],
+                "baseline_seconds_per_op": reference["seconds_per_op"],
+                "current_seconds_per_op": result["seconds_per_op"],
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+
+    return comparisons
+
+
+def display_report(report: Dict[str, Any]) -> None:
+    """Display benchmark results in a table."""
+
+    table = Table(title=f"Benchmarks ({report['metadata']['profile']} profile)")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Time/op", justify="right")
+    table.add_column("Ops/s", justify="right")
+
+    for result in report["results"]:
+        table.add_row(
+            escape(result["name"]),
+            f"{result['seconds_per_op'] * 1e6:,.2f} µs",
+            f"{result['ops_per_second']:,.0f}",
+        )
+
+    Console().print(table)
+
+
+def display_comparisons(comparisons: List[Dict[str, Any]]) -> None:
+    """Display baseline comparisons, highlighting regressions."""
+
+    table = Table(title="Comparison against baseline")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+
+    for comparison in comparisons:
+        style = "red" if comparison["regression"] else "green"
+        table.add_row(
+            escape(comparison["name"]),
+            f"{comparison['baseline_seconds_per_op'] * 1e6:,.2f} µs",
+            f"{comparison['current_seconds_per_op'] * 1e6:,.2f} µs",
+            f"[{style}]{comparison['change']:+.1%}[/{style}]",
+        )
+
+    Console().print(table)
+
+
+def _load_report(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def main() -> None:
+    """Main script function."""
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the financial services and compare against a baseline"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help=f"Benchmark sizes to run (default: {DEFAULT_PROFILE})",
+    )
+    run_parser.add_argument(
+        "--output",
+        default=DEFAULT_OUTPUT,
+        help=f"Path of the JSON results file (default: {DEFAULT_OUTPUT})",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare results against a baseline"
+    )
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument(
+        "current",
+        nargs="?",
+        default=DEFAULT_OUTPUT,
+        help=f"Results file to check (default: {DEFAULT_OUTPUT})",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Relative slowdown treated as a regression (default: 0.10)",
+    )
+
+    args = parser.parse_args()
+    console = Console()
+
+    if args.command == "run":
+        report = run_benchmarks(args.profile)
+
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+
+        display_report(report)
+        console.print(f"[green]Results written to {output}[/green]")
+        return
+
+    comparisons = compare_reports(
+        _load_report(args.baseline), _load_report(args.current), args.threshold
+    )
+    display_comparisons(comparisons)
+
+    regressions = [c for c in comparisons if c["regression"]]
+
+    if regressions:
+        console.print(f"[red]{len(regressions)} benchmark(s) regressed[/red]")
+        sys.exit(1)
+
+    console.print("[green]No regressions[/green]")
+
+
+def cli():
+    """CLI entry point."""
+
+    main()
+
+
+if __name__ == "__main__":
+    cli()
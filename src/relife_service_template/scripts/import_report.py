@@ -0,0 +1,177 @@
+"""
+Reports where the service spends its import time.
+
+The application is imported in a fresh interpreter with `python -X importtime`,
+so the numbers reflect a cold start as seen by a new worker process. Import
+time is grouped by top-level package and can be checked against a budget to
+catch regressions in CI.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+# Configuration constants
+DEFAULT_MODULE = "relife_service_template.app"
+DEFAULT_TOP = 15
+
+
+def parse_importtime(output: str) -> List[Dict[str, object]]:
+    """Parse the stderr output of `python -X importtime`.
+
+    Args:
+        output: Raw `-X importtime` output
+
+    Returns:
+        One entry per imported module with its self and cumulative time in microseconds
+    """
+
+    modules = []
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        fields = line[len("import time:") :].split("|")
+
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Skip the header line
+            continue
+
+        name = fields[2].rstrip()
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+            }
+        )
+
+    return modules
+
+
+def group_by_package(modules: List[Dict[str, object]]) -> Dict[str, float]:
+    """Sum the self time of imported modules per top-level package.
+
+    Args:
+        modules: Entries returned by `parse_importtime`
+
+    Returns:
+        Milliseconds per top-level package, slowest first
+    """
+
+    totals: Dict[str, float] = defaultdict(float)
+
+    for entry in modules:
+        package = str(entry["module"]).split(".")[0]
+        totals[package] += int(entry["self_us"]) / 1000
+
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def measure_imports(module: str = DEFAULT_MODULE) -> List[Dict[str, object]]:
+    """Import a module in a fresh interpreter and return its import-time entries.
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    return parse_importtime(result.stderr)
+
+
+def build_report(modules: List[Dict[str, object]], top: int) -> Dict[str, object]:
+    """Summarise import-time entries into a report."""
+
+    total_ms = sum(int(entry["self_us"]) for entry in modules) / 1000
+    packages = group_by_package(modules)
+
+    return {
+        "total_ms": total_ms,
+        "module_count": len(modules),
+        "packages": dict(list(packages.items())[:top]),
+    }
+
+
+def display_report(report: Dict[str, object], budget_ms: Optional[float]) -> None:
+    """Display the import-time report grouped by package."""
+
+    table = Table(
+        title=(
+            f"{report['module_count']} modules imported in {report['total_ms']:,.1f} ms"
+        )
+    )
+    table.add_column("Package", style="cyan")
+    table.add_column("Self time (ms)", justify="right")
+    table.add_column("Share", justify="right")
+
+    for package, milliseconds in report["packages"].items():
+        table.add_row(
+            escape(package),
+            f"{milliseconds:,.1f}",
+            f"{milliseconds / report['total_ms']:.1%}",
+        )
+
+    console = Console()
+    console.print(table)
+
+    if budget_ms is not None:
+        style = "red" if report["total_ms"] > budget_ms else "green"
+        console.print(f"[{style}]Budget: {budget_ms:,.1f} ms[/{style}]")
+
+
+def main() -> int:
+    """Main script function."""
+
+    parser = argparse.ArgumentParser(
+        description="Report the import time of the service grouped by package"
+    )
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import")
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP, help="Number of packages to show"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="Exit with a non-zero status if the total import time exceeds this",
+    )
+    args = parser.parse_args()
+
+    report = build_report(measure_imports(args.module), args.top)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        display_report(report, args.budget_ms)
+
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        return 1
+
+    return 0
+
+
+def cli():
+    """CLI entry point."""
+
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,341 @@
+"""
+Drives the service API with concurrent load against local Keycloak and
+Supabase stand-ins and reports per-route throughput, latency and error rates.
+
+By default the script starts two subprocesses:
+1. The mock upstreams (see `mock_upstreams.py`) with the requested latency and
+   failure injection
+2. The real service API, configured to authenticate against the mocks
+
+It then obtains Supabase and Keycloak tokens from the mocks and runs a
+closed-loop load generator for the requested duration.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from relife_service_template.scripts.benchmark import build_endpoint_payloads
+from relife_service_template.scripts.mock_upstreams import (
+    REALM_NAME,
+    add_injection_arguments,
+)
+
+# Configuration constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_MOCK_PORT = 8180
+DEFAULT_APP_PORT = 9190
+DEFAULT_DURATION = 30.0
+DEFAULT_CONCURRENCY = 32
+STARTUP_TIMEOUT = 20.0
+STARTUP_POLL_INTERVAL = 0.2
+REQUEST_TIMEOUT = 30.0
+MOCK_CLIENT_ID = "relife-load-test"
+MOCK_USER_EMAIL = "load-test@mock.local"
+
+# Request mix as (route label, method, path, token kind, weight)
+SCENARIOS: List[Tuple[str, str, str, Optional[str], int]] = [
+    ("GET /health", "GET", "/health", None, 1),
+    ("POST /financial/npv", "POST", "/financial/npv", None, 3),
+    ("POST /financial/roi", "POST", "/financial/roi", None, 3),
+    ("POST /financial/irr", "POST", "/financial/irr", None, 1),
+    ("GET /whoami [supabase]", "GET", "/whoami", "supabase", 2),
+    ("GET /whoami [keycloak]", "GET", "/whoami", "keycloak", 2),
+]
+
+
+@contextmanager
+def run_process(command: List[str], env: Dict[str, str]) -> Iterator[subprocess.Popen]:
+    """Run a subprocess for the duration of the context."""
+
+    process = subprocess.Popen(command, env=env)
+
+    try:
+        yield process
+    finally:
+        process.terminate()
+
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_until_ready(url: str) -> None:
+    """Poll a URL until it answers successfully.
+
+    Raises:
+        TimeoutError: If the URL does not answer within STARTUP_TIMEOUT
+    """
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+
+    async with httpx.AsyncClient(timeout=STARTUP_POLL_INTERVAL * 5) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+
+            await asyncio.sleep(STARTUP_POLL_INTERVAL)
+
+    raise TimeoutError(f"{url} did not become ready in {STARTUP_TIMEOUT}s")
+
+
+async def obtain_tokens(mock_url: str) -> Dict[str, str]:
+    """Obtain a Supabase and a Keycloak access token from the mock upstreams."""
+
+    async with httpx.AsyncClient(base_url=mock_url) as client:
+        supabase = await client.post(
+            "/auth/v1/token",
+            params={"grant_type": "password"},
+            json={"email": MOCK_USER_EMAIL, "password": "unused"},
+        )
+        keycloak = await client.post(
+            f"/realms/{REALM_NAME}/protocol/openid-connect/token",
+            data={"grant_type": "client_credentials", "client_id": MOCK_CLIENT_ID},
+        )
+
+    supabase.raise_for_status()
+    keycloak.raise_for_status()
+
+    return {
+        "supabase": supabase.json()["access_token"],
+        "keycloak": keycloak.json()["access_token"],
+    }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def generate_load(
+    base_url: str,
+    tokens: Dict[str, str],
+    duration: float,
+    concurrency: int,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run closed-loop workers against the service API.
+
+    Args:
+        base_url: Base URL of the service API
+        tokens: Access tokens keyed by token kind
+        duration: Seconds to generate load for
+        concurrency: Number of concurrent workers
+        seed: Random seed for the request mix
+
+    Returns:
+        Report with per-route throughput, latency percentiles and error rates
+    """
+
+    payloads = build_endpoint_payloads()
+    weighted = [scenario for scenario in SCENARIOS for _ in range(scenario[4])]
+    samples: Dict[str, List[Tuple[float, bool]]] = {s[0]: [] for s in SCENARIOS}
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=REQUEST_TIMEOUT, limits=limits
+    ) as client:
+
+        async def worker(deadline: float) -> None:
+            while time.monotonic() < deadline:
+                label, method, path, token_kind, _ = rng.choice(weighted)
+                headers = (
+                    {"Authorization": f"Bearer {tokens[token_kind]}"}
+                    if token_kind
+                    else {}
+                )
+
+                start = time.perf_counter()
+
+                try:
+                    response = await client.request(
+                        method, path, json=payloads.get(path), headers=headers
+                    )
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+
+                samples[label].append((time.perf_counter() - start, ok))
+
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+        elapsed = time.monotonic() - start
+
+    routes = {}
+
+    for label, route_samples in samples.items():
+        latencies = sorted(latency for latency, _ in route_samples)
+        errors = sum(1 for _, ok in route_samples if not ok)
+        count = len(route_samples)
+
+        routes[label] = {
+            "requests": count,
+            "throughput_rps": count / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "error_rate": errors / count if count else 0.0,
+        }
+
+    return {
+        "duration_seconds": elapsed,
+        "concurrency": concurrency,
+        "total_requests": sum(r["requests"] for r in routes.values()),
+        "routes": routes,
+    }
+
+
+def display_report(report: Dict[str, Any]) -> None:
+    """Display the per-route load test report."""
+
+    table = Table(
+        title=(
+            f"{report['total_requests']:,} requests in "
+            f"{report['duration_seconds']:.1f}s at concurrency {report['concurrency']}"
+        )
+    )
+    table.add_column("Route", style="cyan")
+
+    for column in ("Requests", "Req/s", "p50 ms", "p95 ms", "p99 ms", "Errors"):
+        table.add_column(column, justify="right")
+
+    for label, stats in report["routes"].items():
+        error_style = "red" if stats["error_rate"] > 0 else "green"
+        table.add_row(
+            escape(label),
+            f"{stats['requests']:,}",
+            f"{stats['throughput_rps']:,.1f}",
+            f"{stats['p50_ms']:,.1f}",
+            f"{stats['p95_ms']:,.1f}",
+            f"{stats['p99_ms']:,.1f}",
+            f"[{error_style}]{stats['error_rate']:.1%}[/{error_style}]",
+        )
+
+    Console().print(table)
+
+
+def _mock_command(args: argparse.Namespace) -> List[str]:
+    """Build the command starting the mock upstreams with the injection options."""
+
+    command = [
+        sys.executable,
+        "-m",
+        "relife_service_template.scripts.mock_upstreams",
+        "--host",
+        args.host,
+        "--port",
+        str(args.mock_port),
+        "--jitter-ms",
+        str(args.jitter_ms),
+    ]
+
+    for value in args.latency_ms:
+        command += ["--latency-ms", value]
+
+    for value in args.failure_rate:
+        command += ["--failure-rate", value]
+
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+
+    return command
+
+
+async def main():
+    """Main script function."""
+
+    parser = argparse.ArgumentParser(
+        description="Load test the service API against local Keycloak and Supabase stand-ins"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Host for both servers")
+    parser.add_argument("--mock-port", type=int, default=DEFAULT_MOCK_PORT)
+    parser.add_argument("--app-port", type=int, default=DEFAULT_APP_PORT)
+    parser.add_argument(
+        "--target",
+        help="Base URL of an already running service API (it must use the mocks)",
+    )
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    add_injection_arguments(parser)
+    args = parser.parse_args()
+
+    console = Console()
+    mock_url = f"http://{args.host}:{args.mock_port}"
+    app_url = args.target or f"http://{args.host}:{args.app_port}"
+
+    app_env = {
+        **os.environ,
+        "SUPABASE_URL": mock_url,
+        "SUPABASE_KEY": os.getenv("SUPABASE_KEY", "mock-service-role-key"),
+        "KEYCLOAK_CLIENT_ID": MOCK_CLIENT_ID,
+        "KEYCLOAK_CLIENT_SECRET": "mock-client-secret",
+        "KEYCLOAK_REALM_URL": f"{mock_url}/realms/{REALM_NAME}",
+        "API_HOST": args.host,
+        "API_PORT": str(args.app_port),
+    }
+    app_command = [sys.executable, "-c", "from relife_service_template import main; main()"]
+
+    with run_process(_mock_command(args), dict(os.environ)):
+        await wait_until_ready(f"{mock_url}/auth/v1/health")
+        console.print(f"[green]Mock upstreams running on {mock_url}[/green]")
+
+        if args.target:
+            report = await _run(app_url, mock_url, args)
+        else:
+            with run_process(app_command, app_env):
+                await wait_until_ready(f"{app_url}/health")
+                console.print(f"[green]Service API running on {app_url}[/green]")
+                report = await _run(app_url, mock_url, args)
+
+    display_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        console.print(f"[green]Report written to {args.output}[/green]")
+
+
+async def _run(app_url: str, mock_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    tokens = await obtain_tokens(mock_url)
+    Console().print(
+        f"[blue]Generating load for {args.duration:.0f}s "
+        f"at concurrency {args.concurrency}[/blue]"
+    )
+
+    return await generate_load(
+        app_url, tokens, args.duration, args.concurrency, args.seed
+    )
+
+
+def cli():
+    """CLI entry point."""
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,327 @@
+"""
+Local stand-ins for the Keycloak and Supabase endpoints used by the service API.
+
+A single server exposes:
+- Keycloak realm endpoints: JWKS, token (client credentials and password grants)
+  and the admin role-mapping API
+- Supabase Auth (GoTrue) endpoints: password sign-in, `get_user` and health
+
+Tokens are RS256-signed with a key generated at startup, so the service API
+verifies them exactly as it would in production. Latency and failures can be
+injected per endpoint group to reproduce slow or flaky upstreams locally.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import jwt
+import uvicorn
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Form, Header, Request
+from fastapi.responses import JSONResponse
+
+# Configuration constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8180
+REALM_NAME = "relife"
+TOKEN_LIFETIME_SECONDS = 3600
+SIGNING_KEY_ID = "mock-signing-key"
+
+# Endpoint groups that latency and failures can be injected into
+ENDPOINT_GROUPS = ("jwks", "token", "roles", "gotrue")
+ALL_GROUPS = "*"
+
+
+@dataclass
+class MockUpstreamConfig:
+    """Behaviour of the mock upstreams.
+
+    Latency and failure rates are keyed by endpoint group (see ENDPOINT_GROUPS);
+    the `*` key applies to every group without its own value.
+    """
+
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    jitter_ms: float = 0.0
+    failure_rate: Dict[str, float] = field(default_factory=dict)
+    roles: List[str] = field(default_factory=lambda: ["relife_admin", "premium"])
+    seed: Optional[int] = None
+
+    def latency_for(self, group: str) -> float:
+        return self.latency_ms.get(group, self.latency_ms.get(ALL_GROUPS, 0.0))
+
+    def failure_rate_for(self, group: str) -> float:
+        return self.failure_rate.get(group, self.failure_rate.get(ALL_GROUPS, 0.0))
+
+
+def _endpoint_group(path: str) -> Optional[str]:
+    """Map a request path to its endpoint group."""
+
+    if path.endswith("/protocol/openid-connect/certs"):
+        return "jwks"
+    if path.endswith("/protocol/openid-connect/token") or path == "/auth/v1/token":
+        return "token"
+    if "/role-mappings/" in path:
+        return "roles"
+    if path.startswith("/auth/v1/"):
+        return "gotrue"
+    return None
+
+
+def create_mock_app(config: MockUpstreamConfig) -> FastAPI:
+    """Create the mock Keycloak and Supabase Auth application.
+
+    Args:
+        config: Latency, failure injection and role configuration
+
+    Returns:
+        FastAPI application serving the mock endpoints
+    """
+
+    app = FastAPI(title="ReLIFE mock upstreams")
+    rng = random.Random(config.seed)
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = jwt.algorithms.RSAAlgorithm.to_jwk(
+        private_key.public_key(), as_dict=True
+    )
+    public_jwk.update({"kid": SIGNING_KEY_ID, "alg": "RS256", "use": "sig"})
+
+    def realm_url(request: Request) -> str:
+        return f"{str(request.base_url).rstrip('/')}/realms/{REALM_NAME}"
+
+    def supabase_issuer(request: Request) -> str:
+        return f"{str(request.base_url).rstrip('/')}/auth/v1"
+
+    def issue_token(claims: Dict[str, Any]) -> str:
+        now = int(time.time())
+        claims = {"iat": now, "exp": now + TOKEN_LIFETIME_SECONDS, **claims}
+        return jwt.encode(
+            claims, private_key, algorithm="RS256", headers={"kid": SIGNING_KEY_ID}
+        )
+
+    def token_response(token: str) -> Dict[str, Any]:
+        return {
+            "access_token": token,
+            "token_type": "bearer",
+            "expires_in": TOKEN_LIFETIME_SECONDS,
+        }
+
+    @app.middleware("http")
+    async def inject_latency_and_failures(request: Request, call_next):
+        group = _endpoint_group(request.url.path)
+
+        if group is not None:
+            delay = config.latency_for(group) + rng.uniform(0, config.jitter_ms)
+
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+
+            if rng.random() < config.failure_rate_for(group):
+                return JSONResponse(
+                    status_code=503, content={"error": "injected failure"}
+                )
+
+        return await call_next(request)
+
+    @app.get(f"/realms/{REALM_NAME}/protocol/openid-connect/certs")
+    async def jwks():
+        return {"keys": [public_jwk]}
+
+    @app.post(f"/realms/{REALM_NAME}/protocol/openid-connect/token")
+    async def keycloak_token(
+        request: Request,
+        grant_type: str = Form(...),
+        client_id: str = Form(...),
+        username: Optional[str] = Form(None),
+    ):
+        subject = (
+            str(uuid.uuid5(uuid.NAMESPACE_DNS, username))
+            if grant_type == "password" and username
+            else str(uuid.uuid5(uuid.NAMESPACE_DNS, client_id))
+        )
+
+        token = issue_token(
+            {
+                "iss": realm_url(request),
+                "sub": subject,
+                "azp": client_id,
+                "aud": "account",
+                "email": username,
+            }
+        )
+
+        return token_response(token)
+
+    @app.get(f"/admin/realms/{REALM_NAME}/users/{{user_id}}/role-mappings/realm")
+    async def role_mappings(user_id: str):
+        return [
+            {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_DNS, role)),
+                "name": role,
+                "composite": False,
+                "clientRole": False,
+                "containerId": REALM_NAME,
+            }
+            for role in config.roles
+        ]
+
+    @app.post("/auth/v1/token")
+    async def supabase_sign_in(request: Request):
+        body = await request.json()
+        email = body.get("email", "user@mock.local")
+        user_id = str(uuid.uuid5(uuid.NAMESPACE_URL, email))
+
+        token = issue_token(
+            {
+                "iss": supabase_issuer(request),
+                "sub": user_id,
+                "email": email,
+                "role": "authenticated",
+                "aud": "authenticated",
+            }
+        )
+
+        return token_response(token)
+
+    @app.get("/auth/v1/user")
+    async def supabase_get_user(
+        request: Request, authorization: str = Header("")
+    ):
+        token = authorization.removeprefix("Bearer ").strip()
+
+        try:
+            claims = jwt.decode(
+                token,
+                private_key.public_key(),
+                algorithms=["RS256"],
+                options={"verify_aud": False},
+            )
+        except jwt.InvalidTokenError as e:
+            return JSONResponse(
+                status_code=401, content={"code": 401, "msg": f"invalid JWT: {e}"}
+            )
+
+        # Only tokens issued by the Supabase stand-in are accepted, so Keycloak
+        # tokens exercise the service's Keycloak fallback path
+        if claims.get("iss") != supabase_issuer(request):
+            return JSONResponse(
+                status_code=401, content={"code": 401, "msg": "invalid JWT issuer"}
+            )
+
+        created_at = "2024-01-01T00:00:00Z"
+        user_id = claims["sub"]
+
+        return {
+            "id": user_id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": claims.get("email"),
+            "app_metadata": {"provider": "keycloak", "providers": ["keycloak"]},
+            "user_metadata": {"provider_id": user_id, "iss": realm_url(request)},
+            "identities": [
+                {
+                    "id": user_id,
+                    "identity_id": str(uuid.uuid5(uuid.NAMESPACE_OID, user_id)),
+                    "user_id": user_id,
+                    "identity_data": {"sub": user_id},
+                    "provider": "keycloak",
+                    "created_at": created_at,
+                }
+            ],
+            "created_at": created_at,
+        }
+
+    @app.get("/auth/v1/health")
+    async def supabase_health():
+        return {"name": "GoTrue", "description": "Mock GoTrue"}
+
+    return app
+
+
+def parse_group_values(values: List[str]) -> Dict[str, float]:
+    """Parse `GROUP=VALUE` (or a bare `VALUE` for every group) CLI arguments.
+
+    Args:
+        values: Raw argument values
+
+    Returns:
+        Mapping of endpoint group (or `*`) to value
+
+    Raises:
+        ValueError: If a group name is unknown
+    """
+
+    parsed = {}
+
+    for value in values:
+        group, _, number = value.rpartition("=")
+        group = group or ALL_GROUPS
+
+        if group != ALL_GROUPS and group not in ENDPOINT_GROUPS:
+            raise ValueError(
+                f"Unknown endpoint group '{group}', expected one of {ENDPOINT_GROUPS}"
+            )
+
+        parsed[group] = float(number)
+
+    return parsed
+
+
+def add_injection_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add latency and failure injection options to an argument parser."""
+
+    parser.add_argument(
+        "--latency-ms",
+        action="append",
+        default=[],
+        metavar="[GROUP=]MS",
+        help=f"Added latency, for all groups or one of {', '.join(ENDPOINT_GROUPS)}",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0.0,
+        help="Uniform random latency added on top of --latency-ms",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        action="append",
+        default=[],
+        metavar="[GROUP=]RATE",
+        help="Fraction of requests answered with 503, for all groups or one group",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+
+
+def config_from_arguments(args: argparse.Namespace) -> MockUpstreamConfig:
+    """Build the mock configuration from parsed CLI arguments."""
+
+    return MockUpstreamConfig(
+        latency_ms=parse_group_values(args.latency_ms),
+        jitter_ms=args.jitter_ms,
+        failure_rate=parse_group_values(args.failure_rate),
+        seed=args.seed,
+    )
+
+
+def cli():
+    """CLI entry point."""
+
+    parser = argparse.ArgumentParser(
+        description="Run local Keycloak and Supabase Auth stand-ins"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Server host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Server port")
+    add_injection_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_mock_app(config_from_arguments(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    cli()
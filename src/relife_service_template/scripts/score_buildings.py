@@ -0,0 +1,462 @@
+"""
+Scores a building dataset offline with the financial indicators of the service.
+
+Rows are read from CSV or Parquet in chunks, each chunk is evaluated with the
+vectorized service kernels in a pool of worker processes, and the results are
+written as one part file per chunk to an output directory. Finished parts are
+skipped when the same command is run again, so an interrupted run resumes
+where it stopped.
+
+Scalar inputs are columns named like the request fields (`capex`, `subsidy`,
+`loan_amount`, `energy_savings`, `energy_savings_growth`, `maintenance_cost`,
+`other_outflows`, `discount_rate`, `initial_investment`, `lifetime`). Array
+inputs (`cash_flows`, `energy_mix`, `energy_prices`) are list columns (JSON
+lists in CSV) or numbered columns such as `energy_mix_0`, `energy_mix_1`, ...
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+
+from relife_service_template.services.batch import (
+    initial_investment_batch,
+    irr_batch,
+    npv_batch,
+    opex_batch,
+    pad_rows,
+    roi_batch,
+)
+
+# Configuration constants
+INDICATORS = ("ii", "opex", "roi", "npv", "irr")
+DEFAULT_CHUNK_SIZE = 100_000
+MANIFEST_NAME = "_manifest.json"
+
+# Columns each indicator needs; NPV falls back to capex when there is no
+# initial_investment column, and optional columns default to 0
+REQUIRED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "ii": ("capex",),
+    "opex": ("energy_mix", "energy_prices"),
+    "roi": ("capex", "energy_savings", "energy_mix", "energy_prices"),
+    "npv": ("energy_savings", "lifetime"),
+    "irr": ("capex", "energy_savings", "energy_mix", "energy_prices"),
+}
+
+
+def _parse_list(value: Any) -> List[float]:
+    if isinstance(value, str):
+        return json.loads(value) if value.strip() else []
+
+    if value is None or (np.isscalar(value) and pd.isna(value)):
+        return []
+
+    return list(value)
+
+
+def array_column(frame: pd.DataFrame, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Read an array input as a zero-padded matrix.
+
+    Args:
+        frame: Chunk of the dataset
+        name: Array input, as a list column or numbered `<name>_<i>` columns
+
+    Returns:
+        The matrix (rows x longest array) and the array length of each row
+    """
+
+    if name in frame.columns:
+        rows = [_parse_list(value) for value in frame[name].tolist()]
+        return pad_rows(rows), np.array([len(row) for row in rows], dtype=np.int64)
+
+    prefix = f"{name}_"
+    numbered = sorted(
+        (int(column[len(prefix) :]), column)
+        for column in frame.columns
+        if column.startswith(prefix) and column[len(prefix) :].isdigit()
+    )
+
+    if not numbered:
+        return np.zeros((len(frame), 0)), np.zeros(len(frame), dtype=np.int64)
+
+    values = frame[[column for _, column in numbered]].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+
+    return np.where(present, values, 0.0), present.sum(axis=1)
+
+
+def missing_columns(
+    columns: Sequence[str], indicators: Sequence[str], discount_rate: Optional[float]
+) -> List[str]:
+    """Return the inputs the selected indicators need but the dataset lacks."""
+
+    def has(name: str) -> bool:
+        # Numbered columns only, so e.g. energy_savings_growth is not energy_savings
+        prefix = f"{name}_"
+        return name in columns or any(
+            c.startswith(prefix) and c[len(prefix) :].isdigit() for c in columns
+        )
+
+    missing = {
+        name
+        for indicator in indicators
+        for name in REQUIRED_COLUMNS[indicator]
+        if not has(name)
+    }
+
+    if "npv" in indicators:
+        if discount_rate is None and not has("discount_rate"):
+            missing.add("discount_rate")
+
+        if not has("initial_investment") and not has("capex"):
+            missing.add("initial_investment")
+
+    return sorted(missing)
+
+
+def score_frame(
+    frame: pd.DataFrame,
+    indicators: Sequence[str],
+    discount_rate: Optional[float] = None,
+    id_column: Optional[str] = None,
+) -> pd.DataFrame:
+    """Compute the selected indicators for every row of a chunk.
+
+    Args:
+        frame: Chunk of the dataset
+        indicators: Indicators to compute, from INDICATORS
+        discount_rate: Discount rate for rows without a `discount_rate` column
+        id_column: Column copied to the output to identify rows
+
+    Returns:
+        One column per indicator (and the id column), in row order
+    """
+
+    n = len(frame)
+
+    def scalar(name: str) -> np.ndarray:
+        if name in frame.columns:
+            return frame[name].to_numpy(dtype=float)
+
+        if name == "discount_rate" and discount_rate is not None:
+            return np.full(n, discount_rate)
+
+        return np.zeros(n)
+
+    output = pd.DataFrame(index=frame.index)
+
+    if id_column is not None:
+        output[id_column] = frame[id_column]
+
+    capex = scalar("capex")
+    subsidy = scalar("subsidy")
+    loan_amount = scalar("loan_amount")
+    maintenance_cost = scalar("maintenance_cost")
+    ii = initial_investment_batch(capex, subsidy, loan_amount)
+
+    if "ii" in indicators:
+        output["ii"] = ii
+
+    if {"opex", "roi", "irr"} & set(indicators):
+        energy_mix, mix_lengths = array_column(frame, "energy_mix")
+        energy_prices, price_lengths = array_column(frame, "energy_prices")
+        costs = dict(
+            capex=capex,
+            loan_amount=loan_amount,
+            subsidy=subsidy,
+            energy_savings=scalar("energy_savings"),
+            energy_mix=energy_mix,
+            energy_prices=energy_prices,
+            maintenance_cost=maintenance_cost,
+            other_outflows=scalar("other_outflows"),
+        )
+
+        if "opex" in indicators:
+            output["opex"] = opex_batch(energy_mix, energy_prices, maintenance_cost)
+
+        if "roi" in indicators:
+            output["roi"] = roi_batch(**costs)
+
+        if "irr" in indicators:
+            unpriced = np.maximum(mix_lengths - price_lengths, 0)
+            output["irr"] = irr_batch(**costs, unpriced_carriers=unpriced)
+
+    if "npv" in indicators:
+        lifetime = scalar("lifetime").astype(np.int64)
+        cash_flows, _ = array_column(frame, "cash_flows")
+        # Like the portfolio endpoint, NPV uses the initial investment when not given
+        investment = (
+            scalar("initial_investment") if "initial_investment" in frame.columns else ii
+        )
+        output["npv"] = npv_batch(
+            cash_flows,
+            scalar("discount_rate"),
+            scalar("energy_savings"),
+            investment,
+            lifetime,
+            scalar("energy_savings_growth"),
+        )
+
+    return output
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit(
+            "Parquet files require pyarrow: pip install relife-service-template[parquet]"
+        )
+
+    return pyarrow.parquet
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read a CSV or Parquet file in chunks of `chunk_size` rows."""
+
+    if path.suffix.lower() in (".parquet", ".pq"):
+        for batch in _parquet().ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def write_part(frame: pd.DataFrame, path: Path) -> None:
+    """Write a part file atomically, so a part that exists is always complete."""
+
+    partial = path.with_name(f".{path.name}.partial")
+
+    if path.suffix == ".parquet":
+        frame.to_parquet(partial, index=False)
+    else:
+        frame.to_csv(partial, index=False)
+
+    os.replace(partial, path)
+
+
+def _fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {"path": str(path.resolve()), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def prepare_output(output: Path, manifest: Dict[str, Any], overwrite: bool) -> None:
+    """Create the output directory, checking that a resumed run matches the earlier one."""
+
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / MANIFEST_NAME
+
+    # Parts left half-written by an interrupted run
+    for partial in output.glob(".part-*.partial"):
+        partial.unlink()
+
+    if manifest_path.exists() and not overwrite:
+        previous = json.loads(manifest_path.read_text())
+
+        if previous != manifest:
+            raise SystemExit(
+                f"{output} holds results of a different input or options; "
+                "use --overwrite to start over"
+            )
+
+        return
+
+    for part in output.glob("part-*"):
+        part.unlink()
+
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+
+
+def _score_part(
+    frame: pd.DataFrame,
+    indicators: Sequence[str],
+    discount_rate: Optional[float],
+    id_column: Optional[str],
+    path: Path,
+) -> int:
+    write_part(score_frame(frame, indicators, discount_rate, id_column), path)
+    return len(frame)
+
+
+def run(
+    input_path: Path,
+    output: Path,
+    indicators: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    discount_rate: Optional[float] = None,
+    id_column: Optional[str] = "id",
+    output_format: str = "parquet",
+    overwrite: bool = False,
+    console: Optional[Console] = None,
+) -> Dict[str, Any]:
+    """Score a dataset chunk by chunk, skipping the chunks already written.
+
+    Args:
+        input_path: CSV or Parquet dataset
+        output: Directory receiving one part file per chunk
+        indicators: Indicators to compute, from INDICATORS
+        chunk_size: Rows per chunk
+        workers: Worker processes (chunks are scored in the main process if 1)
+        discount_rate: Discount rate for datasets without a `discount_rate` column
+        id_column: Column copied to the output, if the dataset has it
+        output_format: "parquet" or "csv"
+        overwrite: Discard the results of an earlier run instead of resuming it
+        console: Console receiving progress lines
+
+    Returns:
+        Summary with the rows scored and skipped, chunks, seconds and rows per second
+    """
+
+    console = console or Console(stderr=True)
+    manifest = {
+        "input": _fingerprint(input_path),
+        "indicators": list(indicators),
+        "chunk_size": chunk_size,
+        "discount_rate": discount_rate,
+        "format": output_format,
+    }
+    prepare_output(output, manifest, overwrite)
+
+    started = time.perf_counter()
+    scored = skipped = chunks = 0
+    checked = False
+    pending = []
+
+    def report(rows: int) -> None:
+        nonlocal scored
+        scored += rows
+        elapsed = time.perf_counter() - started
+        console.print(
+            f"{scored + skipped:,} rows ({scored:,} scored, {skipped:,} resumed) "
+            f"in {elapsed:,.1f} s, {scored / elapsed:,.0f} rows/s"
+        )
+
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+
+    try:
+        for index, frame in enumerate(read_chunks(input_path, chunk_size)):
+            if not checked:
+                missing = missing_columns(list(frame.columns), indicators, discount_rate)
+
+                if missing:
+                    raise SystemExit(f"Missing input columns: {', '.join(missing)}")
+
+                if id_column not in frame.columns:
+                    id_column = None
+
+                checked = True
+
+            chunks += 1
+            path = output / f"part-{index:05d}.{output_format}"
+
+            if path.exists():
+                skipped += len(frame)
+                continue
+
+            args = (frame, indicators, discount_rate, id_column, path)
+
+            if executor is None:
+                report(_score_part(*args))
+                continue
+
+            pending.append(executor.submit(_score_part, *args))
+
+            # Bound the chunks held in memory while workers are busy
+            while len(pending) >= 2 * workers:
+                report(pending.pop(0).result())
+
+        for future in pending:
+            report(future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rows_scored": scored,
+        "rows_resumed": skipped,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "rows_per_second": scored / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> int:
+    """Main script function."""
+
+    # Imported here so the pool size follows the same CPU limits as the server
+    from relife_service_template.server import available_cpus
+
+    parser = argparse.ArgumentParser(
+        description="Compute financial indicators over a CSV or Parquet building dataset"
+    )
+    parser.add_argument("input", type=Path, help="CSV or Parquet dataset")
+    parser.add_argument("output", type=Path, help="Output directory of part files")
+    parser.add_argument(
+        "--indicators",
+        default=",".join(INDICATORS),
+        help=f"Comma-separated indicators to compute ({', '.join(INDICATORS)})",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument(
+        "--workers", type=int, default=available_cpus(), help="Worker processes"
+    )
+    parser.add_argument(
+        "--discount-rate", type=float, help="Discount rate for datasets without that column"
+    )
+    parser.add_argument("--id-column", default="id", help="Column copied to the output")
+    parser.add_argument(
+        "--format", choices=("parquet", "csv"), default="parquet", help="Output format"
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", help="Start over instead of resuming"
+    )
+    args = parser.parse_args()
+
+    indicators = [name.strip() for name in args.indicators.split(",") if name.strip()]
+    unknown = sorted(set(indicators) - set(INDICATORS))
+
+    if unknown:
+        parser.error(f"Unknown indicators: {', '.join(unknown)}")
+
+    if args.format == "parquet":
+        _parquet()
+
+    summary = run(
+        args.input,
+        args.output,
+        indicators,
+        chunk_size=args.chunk_size,
+        workers=max(1, args.workers),
+        discount_rate=args.discount_rate,
+        id_column=args.id_column,
+        output_format=args.format,
+        overwrite=args.overwrite,
+    )
+
+    Console(stderr=True).print(
+        f"[green]{summary['rows_scored']:,} rows scored in {summary['seconds']:,.1f} s "
+        f"({summary['rows_per_second']:,.0f} rows/s), "
+        f"{summary['rows_resumed']:,} rows resumed from earlier runs[/green]"
+    )
+
+    return 0
+
+
+def cli():
+    """CLI entry point."""
+
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    cli()
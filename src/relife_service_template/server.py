@@ -0,0 +1,322 @@
+"""
+Runs the service API with uvicorn in development or production mode.
+
+Development mode (the default) starts a single uvicorn process, as before.
+
+Production mode imports the application and binds the listening socket once in
+a supervisor process, then forks the worker processes. Workers therefore share
+the imported code and data with the supervisor copy-on-write instead of each
+importing the application again. The supervisor restarts workers that exit,
+which is also how workers are recycled after serving a number of requests.
+"""
+
+import gc
+import os
+import random
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from relife_service_template.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Dynamically determine the module path
+APP_IMPORT_STRING = f"{__name__.split('.')[0]}.app:app"
+
+# A worker failing within this many seconds of starting is treated as a crash loop
+MIN_WORKER_UPTIME = 5.0
+# Seconds to wait before restarting a worker that crashed right after starting
+RESPAWN_BACKOFF = 1.0
+
+
+def _cgroup_cpu_limit() -> Optional[int]:
+    """Return the CPU limit of the container from cgroup v2, if one is set."""
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        return None
+
+    if quota == "max":
+        return None
+
+    return max(1, int(int(quota) // int(period)))
+
+
+def available_cpus() -> int:
+    """Return the number of CPUs this process may use.
+
+    Takes both the CPU affinity mask and a container CPU quota into account, so
+    a pod limited to two cores gets two workers even on a larger node.
+    """
+
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+
+    return min(cpus, limit) if limit else cpus
+
+
+@dataclass
+class ServerOptions:
+    """Server options read from the `API_*` environment variables."""
+
+    host: str = "0.0.0.0"
+    port: int = 9090
+    mode: str = "development"
+    workers: int = 1
+    loop: str = "auto"
+    http: str = "auto"
+    timeout_keep_alive: int = 5
+    backlog: int = 2048
+    limit_max_requests: Optional[int] = None
+    max_requests_jitter: int = 0
+    timeout_graceful_shutdown: int = 30
+
+    @classmethod
+    def from_env(cls) -> "ServerOptions":
+        """Build the options from environment variables.
+
+        Raises:
+            ValueError: If API_MODE is not "development" or "production"
+        """
+
+        mode = os.getenv("API_MODE", "development").lower()
+
+        if mode not in ("development", "production"):
+            raise ValueError(f"API_MODE must be development or production, got {mode!r}")
+
+        workers = os.getenv("API_WORKERS", "auto")
+        max_requests = int(os.getenv("API_MAX_REQUESTS", 0))
+
+        return cls(
+            host=os.getenv("API_HOST", "0.0.0.0"),
+            port=int(os.getenv("API_PORT", 9090)),
+            mode=mode,
+            workers=available_cpus() if workers == "auto" else max(1, int(workers)),
+            loop=os.getenv("API_LOOP", "auto"),
+            http=os.getenv("API_HTTP", "auto"),
+            timeout_keep_alive=int(os.getenv("API_KEEP_ALIVE", 5)),
+            backlog=int(os.getenv("API_BACKLOG", 2048)),
+            limit_max_requests=max_requests or None,
+            max_requests_jitter=int(os.getenv("API_MAX_REQUESTS_JITTER", 0)),
+            timeout_graceful_shutdown=int(os.getenv("API_GRACEFUL_TIMEOUT", 30)),
+        )
+
+
+class Supervisor:
+    """Pre-forking process manager for uvicorn workers sharing one listening socket."""
+
+    def __init__(self, config, options: ServerOptions) -> None:
+        self.config = config
+        self.options = options
+        self.socket = None
+        self.workers: Dict[int, float] = {}
+        self.should_exit = False
+
+    def _worker_request_limit(self) -> Optional[int]:
+        """Spread recycling over time so workers do not all restart together."""
+
+        if self.options.limit_max_requests is None:
+            return None
+
+        jitter = random.randint(0, self.options.max_requests_jitter)
+        return self.options.limit_max_requests + jitter
+
+    def _run_worker(self) -> None:
+        import uvicorn
+
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+
+        self.config.limit_max_requests = self._worker_request_limit()
+        exit_code = 1
+
+        try:
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.socket])
+
+            # A failed lifespan startup returns normally; report it so it is backed off
+            if server.started:
+                exit_code = 0
+            else:
+                logger.error("Worker failed to start", pid=os.getpid())
+        except BaseException as e:
+            logger.error("Worker failed", pid=os.getpid(), error=str(e))
+        finally:
+            os._exit(exit_code)
+
+    def spawn_worker(self) -> None:
+        """Fork a new worker process serving the shared socket."""
+
+        pid = os.fork()
+
+        if pid == 0:
+            self._run_worker()
+
+        self.workers[pid] = time.monotonic()
+        logger.info("Worker started", pid=pid)
+
+    def _signal_workers(self, signum: int) -> None:
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _handle_exit(self, signum, frame) -> None:
+        self.should_exit = True
+        self._signal_workers(signal.SIGTERM)
+
+    def _handle_reload(self, signum, frame) -> None:
+        # Workers shut down gracefully and are replaced by the supervisor loop
+        logger.info("Restarting workers")
+        self._signal_workers(signal.SIGTERM)
+
+    def _reap(self, pid: int, status: int) -> None:
+        started_at = self.workers.pop(pid, None)
+
+        if started_at is None:
+            return
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        _mark_metrics_process_dead(pid)
+
+        if self.should_exit:
+            return
+
+        # uvicorn re-raises the SIGTERM it handled after a graceful shutdown
+        if exit_code in (0, -signal.SIGTERM):
+            logger.info("Worker exited, restarting", pid=pid)
+        else:
+            logger.warning("Worker died, restarting", pid=pid, exit_code=exit_code)
+
+            if time.monotonic() - started_at < MIN_WORKER_UPTIME:
+                time.sleep(RESPAWN_BACKOFF)
+
+        self.spawn_worker()
+
+    def run(self) -> None:
+        """Bind the socket, fork the workers and supervise them until shutdown."""
+
+        self.config.load()
+        self.socket = self.config.bind_socket()
+
+        # Move everything imported so far out of the garbage collector's reach, so
+        # collections in the workers do not touch (and copy) the shared pages
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        logger.info(
+            "Starting supervisor",
+            workers=self.options.workers,
+            host=self.options.host,
+            port=self.options.port,
+        )
+
+        for _ in range(self.options.workers):
+            self.spawn_worker()
+
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+
+            self._reap(pid, status)
+
+        self.socket.close()
+        logger.info("Supervisor stopped")
+
+
+def _mark_metrics_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker when metrics are shared across processes."""
+
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
+def _preload_application():
+    """Import the application and its lazily loaded dependencies before forking."""
+
+    from relife_service_template.app import app, preload_modules
+
+    preload_modules()
+    return app
+
+
+def run_production(options: ServerOptions) -> None:
+    """Run the pre-forked production server."""
+
+    import uvicorn
+
+    if not hasattr(os, "fork"):
+        # Platforms without fork fall back to uvicorn's spawning process manager
+        uvicorn.run(
+            APP_IMPORT_STRING,
+            host=options.host,
+            port=options.port,
+            workers=options.workers,
+            loop=options.loop,
+            http=options.http,
+            timeout_keep_alive=options.timeout_keep_alive,
+            backlog=options.backlog,
+            limit_max_requests=options.limit_max_requests,
+            timeout_graceful_shutdown=options.timeout_graceful_shutdown,
+        )
+        return
+
+    config = uvicorn.Config(
+        _preload_application(),
+        host=options.host,
+        port=options.port,
+        loop=options.loop,
+        http=options.http,
+        timeout_keep_alive=options.timeout_keep_alive,
+        backlog=options.backlog,
+        timeout_graceful_shutdown=options.timeout_graceful_shutdown,
+    )
+    Supervisor(config, options).run()
+
+
+def run_development(options: ServerOptions) -> None:
+    """Run a single uvicorn process."""
+
+    import uvicorn
+
+    uvicorn.run(
+        APP_IMPORT_STRING,
+        host=options.host,
+        port=options.port,
+        loop=options.loop,
+        http=options.http,
+        timeout_keep_alive=options.timeout_keep_alive,
+        backlog=options.backlog,
+    )
+
+
+def main() -> None:
+    """Run the service API in the mode selected by API_MODE."""
+
+    try:
+        options = ServerOptions.from_env()
+    except ValueError as e:
+        sys.exit(str(e))
+
+    if options.mode == "production":
+        run_production(options)
+    else:
+        run_development(options)
@@ -0,0 +1,264 @@
+#Vectorized financial kernels evaluating many scenarios at once
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.models.roi import ROIRequest
+from relife_service_template.services.carriers import carrier_costs_batch
+from relife_service_template.services.factors import discount_factors, growing_annuity_factors
+
+# Longest lifetime evaluated as a dense (scenarios x years) matrix
+MAX_BATCH_LIFETIME = 1000
+
+
+def batch_years(lifetimes: Iterable[int]) -> int:
+    """Return the number of years spanned by a batch of lifetimes.
+
+    Raises:
+        ValueError: If a lifetime exceeds MAX_BATCH_LIFETIME
+    """
+
+    years = max(max(lifetimes, default=0), 0)
+
+    if years > MAX_BATCH_LIFETIME:
+        raise ValueError(f"Lifetime {years} is too long for batch evaluation")
+
+    return years
+
+
+def pad_rows(rows: Sequence[Sequence[float]], width: Optional[int] = None) -> np.ndarray:
+    """Stack variable-length rows into a zero-padded matrix.
+
+    Args:
+        rows: One sequence of values per scenario
+        width: Number of columns; rows are truncated to it. Defaults to the longest row
+
+    Returns:
+        Matrix of shape (len(rows), width)
+    """
+
+    if width is None:
+        width = max((len(row) for row in rows), default=0)
+
+    matrix = np.zeros((len(rows), width))
+
+    for i, row in enumerate(rows):
+        values = row[:width]
+        matrix[i, : len(values)] = values
+
+    return matrix
+
+
+def yearly_flows(
+    cash_flows: np.ndarray,
+    energy_savings: np.ndarray,
+    lifetime: np.ndarray,
+    energy_savings_growth: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Yearly flows (cash flow plus energy savings) as `calculate_npv` sums them.
+
+    Args:
+        cash_flows: Matrix (scenarios x years) of cash flows, zero-padded
+        energy_savings: Annual energy savings per scenario
+        lifetime: Lifetime in years per scenario
+        energy_savings_growth: Yearly growth of the energy savings per scenario
+
+    Returns:
+        Matrix (scenarios x longest lifetime) with zeros after each lifetime
+
+    Raises:
+        ValueError: If a lifetime exceeds MAX_BATCH_LIFETIME
+    """
+
+    lifetime = np.asarray(lifetime, dtype=np.int64)
+    years = int(max(lifetime.max(initial=0), 0))
+
+    if years > MAX_BATCH_LIFETIME:
+        raise ValueError(f"Lifetime {years} is too long for batch evaluation")
+
+    flows = np.zeros((len(lifetime), years))
+    width = min(years, cash_flows.shape[1])
+    flows[:, :width] = cash_flows[:, :width]
+    savings = np.asarray(energy_savings, dtype=float)[:, None]
+
+    if energy_savings_growth is not None:
+        growth = np.asarray(energy_savings_growth, dtype=float)[:, None]
+        savings = savings * (1 + growth) ** np.arange(years)[None, :]
+
+    flows += savings
+
+    within_lifetime = np.arange(1, years + 1)[None, :] <= lifetime[:, None]
+    return np.where(within_lifetime, flows, 0.0)
+
+
+def npv_batch(
+    cash_flows: np.ndarray,
+    discount_rate: np.ndarray,
+    energy_savings: np.ndarray,
+    initial_investment: np.ndarray,
+    lifetime: np.ndarray,
+    energy_savings_growth: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Vectorized equivalent of `calculate_npv` for many scenarios.
+
+    Only the explicit cash flows are discounted as a matrix; the energy savings
+    are summed in closed form, so the cost grows with the longest `cash_flows`
+    and not with the lifetimes.
+
+    - **cash_flows**: Matrix (scenarios x years) of cash flows, zero-padded
+    - **discount_rate**, **energy_savings**, **initial_investment**, **lifetime**,
+      **energy_savings_growth**: One value per scenario (no growth if omitted)
+
+    Raises:
+        ValueError: If a result is not finite
+    """
+
+    lifetime = np.asarray(lifetime, dtype=np.int64)
+    energy_savings = np.asarray(energy_savings, dtype=float)
+
+    if energy_savings_growth is None:
+        energy_savings_growth = np.zeros_like(energy_savings)
+
+    years = int(min(cash_flows.shape[1], max(lifetime.max(initial=0), 0)))
+    within_lifetime = np.arange(1, years + 1)[None, :] <= lifetime[:, None]
+    explicit = np.where(within_lifetime, cash_flows[:, :years], 0.0)
+    discount = discount_factors(discount_rate, years)
+    annuity = growing_annuity_factors(discount_rate, energy_savings_growth, lifetime)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        npv = (explicit * discount).sum(axis=1) - initial_investment
+        # Without savings the factor does not matter, even where it is not finite
+        npv += np.where(energy_savings != 0, energy_savings * annuity, 0.0)
+
+    if not np.all(np.isfinite(npv)):
+        raise ValueError("Batch evaluation produced non-finite NPV values")
+
+    return npv
+
+
+def initial_investment_batch(
+    capex: np.ndarray, subsidy: np.ndarray, loan_amount: np.ndarray
+) -> np.ndarray:
+    """Vectorized initial investment with the same case rules as `calculate_roi`."""
+
+    subsidy_applies = (subsidy > 0) & (loan_amount >= 0)
+    loan_applies = (loan_amount > 0) & (subsidy >= 0)
+
+    return capex - np.where(subsidy_applies, subsidy, 0.0) - np.where(
+        loan_applies, loan_amount, 0.0
+    )
+
+
+def opex_batch(
+    energy_mix: np.ndarray, energy_prices: np.ndarray, maintenance_cost: np.ndarray
+) -> np.ndarray:
+    """Vectorized yearly OPEX: energy use times price per carrier plus maintenance.
+
+    - **energy_mix**, **energy_prices**: Zero-padded matrices (scenarios x carriers)
+    - **maintenance_cost**: One value per scenario
+    """
+
+    width = min(energy_mix.shape[1], energy_prices.shape[1])
+    energy_costs = np.einsum("ij,ij->i", energy_mix[:, :width], energy_prices[:, :width])
+
+    return energy_costs + maintenance_cost
+
+
+def roi_batch(
+    capex: np.ndarray,
+    loan_amount: np.ndarray,
+    subsidy: np.ndarray,
+    energy_savings: np.ndarray,
+    energy_mix: np.ndarray,
+    energy_prices: np.ndarray,
+    maintenance_cost: np.ndarray,
+    other_outflows: np.ndarray,
+    carrier_energy_cost: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Vectorized equivalent of `calculate_roi` for many scenarios.
+
+    - **energy_mix**, **energy_prices**: Zero-padded matrices (scenarios x carriers)
+    - **carrier_energy_cost**: Energy cost of the carrier matrices per scenario, if any
+    - All other arguments: One value per scenario
+    """
+
+    opex = opex_batch(energy_mix, energy_prices, maintenance_cost)
+
+    if carrier_energy_cost is not None:
+        opex = opex + carrier_energy_cost
+
+    ii = initial_investment_batch(capex, subsidy, loan_amount)
+    net_profit = energy_savings - opex - other_outflows
+
+    roi = np.zeros_like(ii)
+    np.divide((net_profit - ii) * 100, ii, out=roi, where=ii != 0)
+
+    return roi
+
+
+def irr_batch(
+    capex: np.ndarray,
+    loan_amount: np.ndarray,
+    subsidy: np.ndarray,
+    energy_savings: np.ndarray,
+    energy_mix: np.ndarray,
+    energy_prices: np.ndarray,
+    maintenance_cost: np.ndarray,
+    other_outflows: np.ndarray,
+    unpriced_carriers: np.ndarray,
+    carrier_energy_cost: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Vectorized equivalent of `calculate_irr` for many scenarios.
+
+    - **energy_mix**, **energy_prices**: Zero-padded matrices (scenarios x carriers)
+    - **unpriced_carriers**: Number of energy mix entries without a price per
+      scenario, each charged the maintenance cost as `calculate_irr` does
+    - **carrier_energy_cost**: Energy cost of the carrier matrices per scenario, if any
+    - All other arguments: One value per scenario
+    """
+
+    opex = opex_batch(energy_mix, energy_prices, maintenance_cost)
+    opex += unpriced_carriers * maintenance_cost
+
+    if carrier_energy_cost is not None:
+        opex += carrier_energy_cost
+
+    funded = (subsidy > 0) | (loan_amount > 0)
+    ii = np.where(funded, capex - subsidy - loan_amount, capex)
+
+    irr = np.zeros_like(ii, dtype=float)
+    np.divide(energy_savings - opex - other_outflows, ii, out=irr, where=ii != 0)
+
+    return irr
+
+
+def evaluate_npv_requests(requests: List[NPVRequest]) -> List[float]:
+    """Evaluate a batch of NPV requests in one vectorized pass."""
+
+    return npv_batch(
+        cash_flows=pad_rows([r.cash_flows for r in requests]),
+        discount_rate=np.array([r.discount_rate for r in requests]),
+        energy_savings=np.array([r.energy_savings for r in requests]),
+        initial_investment=np.array([r.initial_investment for r in requests]),
+        lifetime=np.array([r.lifetime for r in requests]),
+        energy_savings_growth=np.array([r.energy_savings_growth for r in requests]),
+    ).tolist()
+
+
+def evaluate_roi_requests(requests: List[ROIRequest]) -> List[float]:
+    """Evaluate a batch of ROI requests in one vectorized pass."""
+
+    carriers = [r.carriers for r in requests]
+
+    return roi_batch(
+        capex=np.array([r.capex for r in requests]),
+        loan_amount=np.array([r.loan_amount for r in requests]),
+        subsidy=np.array([r.subsidy for r in requests]),
+        energy_savings=np.array([r.energy_savings for r in requests]),
+        energy_mix=pad_rows([r.energy_mix for r in requests]),
+        energy_prices=pad_rows([r.energy_prices for r in requests]),
+        maintenance_cost=np.array([r.maintenance_cost for r in requests]),
+        other_outflows=np.array([r.other_outflows for r in requests]),
+        carrier_energy_cost=carrier_costs_batch(carriers) if any(c is not None for c in carriers) else None,
+    ).tolist()
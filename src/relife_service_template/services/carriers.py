@@ -0,0 +1,103 @@
+#Energy costs of carrier x year consumption and price matrices
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from relife_service_template.models.carriers import CarrierEnergy, carrier_rows
+
+
+def _aligned_rows(
+    carriers: CarrierEnergy,
+) -> Tuple[List[str], List[List[float]], List[List[float]]]:
+    """Carrier names with their consumption rows and the price rows in the same order."""
+
+    consumption = carrier_rows(carriers.consumption)
+    prices = carrier_rows(carriers.prices)
+
+    return list(consumption), list(consumption.values()), [prices[name] for name in consumption]
+
+
+def _is_regular(mix_rows: Sequence[List[float]], price_rows: Sequence[List[float]]) -> bool:
+    """Whether all consumption rows have one length and all price rows another."""
+
+    return (
+        len(mix_rows) > 0
+        and len({len(row) for row in mix_rows}) == 1
+        and len({len(row) for row in price_rows}) == 1
+    )
+
+
+def carrier_matrices(carriers: CarrierEnergy) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Stack the consumption and prices of every carrier into (carriers x years) matrices.
+
+    Single prices are repeated over the years of their carrier, and carriers
+    with fewer years are zero-padded.
+
+    Returns:
+        Carrier names, consumption matrix and price matrix
+    """
+
+    names, mix_rows, price_rows = _aligned_rows(carriers)
+
+    if _is_regular(mix_rows, price_rows):
+        # Every carrier covers the same years: no padding needed
+        mix = np.asarray(mix_rows, dtype=float)
+        return names, mix, np.broadcast_to(np.asarray(price_rows, dtype=float), mix.shape)
+
+    years = max((len(row) for row in mix_rows), default=0)
+    mix = np.zeros((len(names), years))
+    price = np.zeros((len(names), years))
+
+    for i, (row, prices) in enumerate(zip(mix_rows, price_rows)):
+        mix[i, : len(row)] = row
+        price[i, : len(row)] = prices
+
+    return names, mix, price
+
+
+def carrier_costs(carriers: CarrierEnergy) -> Dict[str, float]:
+    """Energy cost of each carrier, summed over its years."""
+
+    names, mix, price = carrier_matrices(carriers)
+
+    return dict(zip(names, np.einsum("cy,cy->c", mix, price).tolist()))
+
+
+def carrier_costs_batch(scenarios: Sequence[Optional[CarrierEnergy]]) -> np.ndarray:
+    """Total carrier energy cost of many scenarios with one contraction.
+
+    Args:
+        scenarios: Carrier matrices per scenario, None for scenarios without any
+
+    Returns:
+        Energy cost per scenario (0 where there are no carriers)
+    """
+
+    present = [i for i, c in enumerate(scenarios) if c is not None]
+    rows = [_aligned_rows(scenarios[i])[1:] for i in present]
+    mix_rows = [row for mix, _ in rows for row in mix]
+    price_rows = [row for _, prices in rows for row in prices]
+
+    if len({len(mix) for mix, _ in rows}) == 1 and _is_regular(mix_rows, price_rows):
+        # Same carriers count and years everywhere: one (scenarios x carriers x years) array
+        mix = np.asarray([mix for mix, _ in rows], dtype=float)
+        price = np.broadcast_to(np.asarray([prices for _, prices in rows], dtype=float), mix.shape)
+        costs = np.zeros(len(scenarios))
+        costs[present] = np.einsum("scy,scy->s", mix, price)
+        return costs
+
+    stacked = [carrier_matrices(c)[1:] if c is not None else None for c in scenarios]
+    shapes = [m.shape for m, _ in filter(None, stacked)]
+    n_carriers = max((s[0] for s in shapes), default=0)
+    years = max((s[1] for s in shapes), default=0)
+
+    mix = np.zeros((len(scenarios), n_carriers, years))
+    price = np.zeros_like(mix)
+
+    for i, matrices in enumerate(stacked):
+        if matrices is not None:
+            m, p = matrices
+            mix[i, : m.shape[0], : m.shape[1]] = m
+            price[i, : p.shape[0], : p.shape[1]] = p
+
+    return np.einsum("scy,scy->s", mix, price)
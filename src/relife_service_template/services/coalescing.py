@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, TypeVar
+
+import anyio
+from pydantic import BaseModel
+
+from relife_service_template.observability.metrics import (
+    observe_computation,
+    record_coalescing,
+)
+
+if TYPE_CHECKING:
+    from relife_service_template.services.microbatch import MicroBatcher
+
+T = TypeVar("T")
+
+
+def request_key(indicator: str, request: BaseModel) -> str:
+    """Return the canonical hash of a financial request.
+
+    Args:
+        indicator: Financial indicator the request is computed for
+        request: Validated request model
+
+    Returns:
+        Hex digest identifying requests with identical inputs
+    """
+
+    payload = f"{indicator}:{request.model_dump_json()}".encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class SingleFlight:
+    """Run at most one computation per key at a time.
+
+    The first caller for a key (the leader) runs the computation. Callers
+    arriving with the same key while it is running (followers) await the
+    leader's result, or its exception, instead of computing again.
+    Nothing is cached: once the computation finishes the key is forgotten.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `func`, sharing it with concurrent callers of `key`.
+
+        Args:
+            key: Identity of the computation
+            func: Async callable performing the computation
+
+        Returns:
+            The computation result
+        """
+
+        future = self._in_flight.get(key)
+
+        if future is not None:
+            try:
+                # Shielded so a disconnecting follower does not cancel the shared result
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+                # The leader was cancelled before producing a result: compute again
+                return await self.run(key, func)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            result = await func()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case there are no followers
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def is_in_flight(self, key: str) -> bool:
+        """Whether a computation for the key is currently running."""
+
+        return key in self._in_flight
+
+
+_single_flight = SingleFlight()
+
+
+async def compute_coalesced(
+    indicator: str,
+    request: BaseModel,
+    func: Callable[[], T],
+    enabled: bool = True,
+    batcher: Optional["MicroBatcher"] = None,
+) -> T:
+    """Compute a financial indicator, coalescing concurrent identical requests.
+
+    Args:
+        indicator: Financial indicator, used for the cache key and metrics
+        request: Validated request model the computation depends on
+        func: Synchronous computation of the indicator
+        enabled: When False identical requests are computed independently
+        batcher: Micro-batcher evaluating the request together with others instead
+            of calling `func`, or None
+
+    Returns:
+        The computation result
+    """
+
+    def timed() -> T:
+        with observe_computation(indicator):
+            return func()
+
+    async def compute() -> T:
+        if batcher is not None:
+            return await batcher.submit(request)
+
+        # Off the event loop, so identical requests arriving meanwhile can join
+        return await anyio.to_thread.run_sync(timed)
+
+    if not enabled:
+        return timed() if batcher is None else await batcher.submit(request)
+
+    key = request_key(indicator, request)
+    record_coalescing(indicator, follower=_single_flight.is_in_flight(key))
+
+    return await _single_flight.run(key, compute)
@@ -0,0 +1,98 @@
+#Cached discount and annuity factors shared by the vectorized indicators
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+from relife_service_template.observability.metrics import record_cache_lookup
+
+# Number of (rate, years) discount vectors kept; the oldest is evicted first
+MAX_CACHED_FACTORS = 4096
+
+_discount_vectors: Dict[Tuple[float, int], np.ndarray] = {}
+_lock = threading.Lock()
+
+
+def discount_vector(rate: float, years: int) -> np.ndarray:
+    """Return the read-only discount factors (1 + rate)^-t for t = 1..years.
+
+    Vectors are cached per (rate, years), since most requests share a handful of
+    discount rates and lifetimes.
+    """
+
+    key = (float(rate), int(years))
+    vector = _discount_vectors.get(key)
+    record_cache_lookup("discount_factors", vector is not None)
+
+    if vector is None:
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            vector = np.power(1 + key[0], -np.arange(1, key[1] + 1, dtype=float))
+
+        vector.flags.writeable = False
+
+        with _lock:
+            if len(_discount_vectors) >= MAX_CACHED_FACTORS:
+                _discount_vectors.pop(next(iter(_discount_vectors)))
+
+            _discount_vectors[key] = vector
+
+    return vector
+
+
+def discount_factors(discount_rate: np.ndarray, years: int) -> np.ndarray:
+    """Discount factors (1 + r)^-t for t = 1..years, one row per scenario."""
+
+    rates, inverse = np.unique(np.asarray(discount_rate, dtype=float), return_inverse=True)
+    table = np.stack([discount_vector(rate, years) for rate in rates.tolist()])
+
+    return table[inverse.reshape(-1)]
+
+
+def annuity_factors(discount_rate: np.ndarray, lifetime: np.ndarray) -> np.ndarray:
+    """Present value of 1 per year for `lifetime` years, per scenario.
+
+    Args:
+        discount_rate: Discount rate per scenario
+        lifetime: Lifetime in years per scenario
+
+    Returns:
+        Sum of the discount factors over each lifetime (the lifetime itself at a 0% rate)
+    """
+
+    pairs = np.stack(
+        [np.asarray(discount_rate, dtype=float), np.asarray(lifetime, dtype=float)], axis=1
+    )
+    unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+    values = np.array(
+        [discount_vector(rate, int(years)).sum() for rate, years in unique.tolist()]
+    )
+
+    return values[inverse.reshape(-1)]
+
+
+def growing_annuity_factors(
+    discount_rate: np.ndarray, growth: np.ndarray, lifetime: np.ndarray
+) -> np.ndarray:
+    """Vectorized `growing_annuity_factor`: present value of 1 growing by `growth` per year.
+
+    Args:
+        discount_rate: Discount rate per scenario
+        growth: Yearly growth of the payment per scenario
+        lifetime: Lifetime in years per scenario
+
+    Returns:
+        Factor per scenario, in closed form whatever the lifetime (NaN for rates of -100% or less)
+    """
+
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+    years = np.maximum(np.asarray(lifetime, dtype=float), 0.0)
+    spread = discount_rate - growth
+
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        # Same spread as the denominator, see growing_annuity_factor
+        log_ratio = np.log1p(-spread / (1 + discount_rate))
+        closed_form = -np.expm1(years * log_ratio) / spread
+        level = years / (1 + discount_rate)
+
+    return np.where(spread == 0, level, closed_form)
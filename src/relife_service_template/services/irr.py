@@ -1,5 +1,4 @@
 from typing import List
-import numpy as np
 
 
 def calculate_irr(
@@ -15,6 +14,7 @@ def calculate_irr(
         maintenance_cost: float = 0.0,
         other_outflows: float = 0.0,
         project_lifetime: float = 20.0,  # Default project lifetime
+        carrier_energy_cost: float = 0.0,  # Energy cost of the per-carrier matrices
 ) -> float:
     
     if energy_mix is None:
@@ -31,7 +31,7 @@ def calculate_irr(
         else:
             opex.append(maintenance_cost)  # Default to maintenance cost if no price data available
 
-    opex_total = np.sum(opex) + maintenance_cost
+    opex_total = sum(opex) + carrier_energy_cost + maintenance_cost
 
     # Calculate Initial Investment (II)
     ii = capex - subsidy - loan_amount if (subsidy > 0 or loan_amount > 0) else capex
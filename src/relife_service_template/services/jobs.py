@@ -0,0 +1,528 @@
+#Background computation jobs: a bounded worker pool over a SQLite-backed queue
+import importlib
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability.metrics import observe_computation
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """Computation that can run as a job.
+
+    Attributes:
+        model: "module:attribute" path of the input model
+        function: "module:attribute" path of the computation
+        batched: Whether the input holds `scenarios` evaluated in chunks by a
+            function taking a list of scenarios
+    """
+
+    model: str
+    function: str
+    batched: bool
+
+
+# Resolved on first use so that numpy is not imported with the application
+JOB_KINDS: Dict[str, JobKind] = {
+    "portfolio": JobKind(
+        "relife_service_template.models.portfolio:PortfolioRequest",
+        "relife_service_template.services.portfolio:optimise_portfolio",
+        batched=False,
+    ),
+    "npv": JobKind(
+        "relife_service_template.models.jobs:NPVJobInput",
+        "relife_service_template.services.batch:evaluate_npv_requests",
+        batched=True,
+    ),
+    "roi": JobKind(
+        "relife_service_template.models.jobs:ROIJobInput",
+        "relife_service_template.services.batch:evaluate_roi_requests",
+        batched=True,
+    ),
+    "payback": JobKind(
+        "relife_service_template.models.payback:PaybackBatchRequest",
+        "relife_service_template.services.payback:evaluate_payback_requests",
+        batched=True,
+    ),
+    "lcse": JobKind(
+        "relife_service_template.models.lcse:LCSEBatchRequest",
+        "relife_service_template.services.lcse:evaluate_lcse_requests",
+        batched=True,
+    ),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_owner_status ON jobs (owner, status);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, finished_at);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+"""
+
+_STATUS_COLUMNS = (
+    "id, kind, status, priority, progress, error, created_at, started_at, finished_at"
+)
+
+
+class JobQuotaExceeded(Exception):
+    """The user already has the maximum number of queued and running jobs."""
+
+
+class JobQueueFull(Exception):
+    """The queue holds the maximum number of jobs over all users."""
+
+
+class _Interrupted(Exception):
+    """Raised inside a job that was cancelled or whose manager is stopping."""
+
+
+def _resolve(path: str) -> Any:
+    module_name, attribute = path.split(":")
+
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def validate_job_input(kind: str, data: Dict[str, Any]) -> BaseModel:
+    """Validate the input of a job against the model of its kind.
+
+    Raises:
+        ValueError: If the kind is unknown or the input invalid
+    """
+
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+
+    return _resolve(JOB_KINDS[kind].model).model_validate(data)
+
+
+def batch_function(kind: str) -> Callable[[List[Any]], List[Any]]:
+    """Return the function evaluating a list of scenarios of a batched job kind."""
+
+    return _resolve(JOB_KINDS[kind].function)
+
+
+class JobManager:
+    """Run computation jobs on a fixed number of worker threads.
+
+    Jobs and their results are stored in SQLite, so they outlive the process:
+    on start, jobs left queued or running by a process that is gone are queued
+    again, and finished results stay readable until `retention` seconds have
+    passed. Queued jobs start by priority, then in submission order.
+
+    Workers take the next queued job straight from the database, so several
+    processes can share one database: a job submitted to one process is run by
+    whichever has a free worker, and jobs of a process that died are queued
+    again by the others. Each job is claimed in a write transaction, so no job
+    runs twice.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        workers: int = 2,
+        max_active_per_user: int = 10,
+        max_queued: int = 1000,
+        chunk_size: int = 1000,
+        retention: float = 86400.0,
+        poll_interval: float = 1.0,
+    ):
+        self.database_path = database_path
+        self.workers = max(1, workers)
+        self.max_active_per_user = max_active_per_user
+        self.max_queued = max_queued
+        self.chunk_size = max(1, chunk_size)
+        self.retention = retention
+        self.poll_interval = poll_interval
+
+        # Set on local submissions so an idle worker does not wait for the next poll
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.database_path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+
+        return connection
+
+    def _requeue_abandoned(self, own: bool) -> int:
+        """Queue again the running jobs of processes that are gone.
+
+        Args:
+            own: Also requeue the running jobs of this process, left by an
+                earlier manager
+
+        Returns:
+            Number of jobs queued again
+        """
+
+        connection = self._connection()
+        stale = [
+            row["id"]
+            for row in connection.execute(
+                "SELECT id, worker_pid FROM jobs WHERE status = 'running'"
+            )
+            if (own and row["worker_pid"] == os.getpid()) or not _pid_alive(row["worker_pid"])
+        ]
+
+        for job_id in stale:
+            connection.execute(
+                "UPDATE jobs SET status = 'queued', progress = 0, worker_pid = NULL, "
+                "started_at = NULL WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+        return len(stale)
+
+    def start(self) -> None:
+        """Create the schema, requeue interrupted jobs and start the workers."""
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+        stale = self._requeue_abandoned(own=True)
+        pending = connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+        ).fetchone()[0]
+
+        if stale or pending:
+            logger.info("Resuming jobs", requeued=stale, queued=pending)
+
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers; interrupted jobs are queued again for the next start."""
+
+        self._stopping.set()
+        self._wakeup.set()
+
+        for thread in self._threads:
+            thread.join(timeout)
+
+        self._threads = []
+
+    def submit(self, owner: str, kind: str, priority: int, request: BaseModel) -> Dict[str, Any]:
+        """Queue a job.
+
+        Args:
+            owner: Id of the user submitting the job
+            kind: Key of JOB_KINDS
+            priority: Queued jobs with a higher priority start first
+            request: Validated input of the job
+
+        Returns:
+            Status of the new job
+
+        Raises:
+            JobQuotaExceeded: If the user has too many queued and running jobs
+            JobQueueFull: If too many jobs are queued overall
+        """
+
+        connection = self._connection()
+        now = time.time()
+        job_id = secrets.token_urlsafe(16)
+
+        # The write lock makes the quota checks and the insert atomic across processes
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            connection.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - self.retention,),
+            )
+            active = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE owner = ? AND status IN ('queued', 'running')",
+                (owner,),
+            ).fetchone()[0]
+
+            if active >= self.max_active_per_user:
+                raise JobQuotaExceeded(
+                    f"At most {self.max_active_per_user} queued or running jobs per user"
+                )
+
+            queued = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+
+            if queued >= self.max_queued:
+                raise JobQueueFull("The job queue is full")
+
+            connection.execute(
+                "INSERT INTO jobs (id, owner, kind, priority, status, payload, created_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, owner, kind, priority, request.model_dump_json(), now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        self._wakeup.set()
+        logger.info("Job submitted", job_id=job_id, kind=kind, priority=priority, owner=owner)
+
+        return self.get(job_id, owner)
+
+    def get(self, job_id: str, owner: str) -> Optional[Dict[str, Any]]:
+        """Return the status of a job of the user, or None if there is none."""
+
+        row = self._connection().execute(
+            f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ? AND owner = ?",
+            (job_id, owner),
+        ).fetchone()
+
+        return dict(row) if row is not None else None
+
+    def list(self, owner: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return the most recent jobs of a user, newest first."""
+
+        rows = self._connection().execute(
+            f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE owner = ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (owner, limit),
+        )
+
+        return [dict(row) for row in rows]
+
+    def result(self, job_id: str, owner: str) -> Optional[Dict[str, Any]]:
+        """Return the status of a job of the user with its decoded result, if any."""
+
+        row = self._connection().execute(
+            f"SELECT {_STATUS_COLUMNS}, result FROM jobs WHERE id = ? AND owner = ?",
+            (job_id, owner),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+
+        return job
+
+    def cancel(self, job_id: str, owner: str) -> Optional[Dict[str, Any]]:
+        """Cancel a job of the user.
+
+        A queued job is cancelled at once; a running job stops at its next
+        progress update. Finished jobs are left as they are.
+
+        Returns:
+            Status of the job, or None if the user has no such job
+        """
+
+        connection = self._connection()
+        connection.execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+            "WHERE id = ? AND owner = ? AND status = 'queued'",
+            (time.time(), job_id, owner),
+        )
+        connection.execute(
+            "UPDATE jobs SET cancel_requested = 1 "
+            "WHERE id = ? AND owner = ? AND status = 'running'",
+            (job_id, owner),
+        )
+
+        return self.get(job_id, owner)
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                row = self._claim_next()
+
+                if row is None:
+                    # Jobs of other processes, including ones that died, are
+                    # picked up on the next poll
+                    self._requeue_abandoned(own=False)
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+
+                self._run(row)
+            except Exception as e:
+                logger.error("Job worker failed", error=str(e))
+                self._stopping.wait(self.poll_interval)
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        """Mark the next queued job, by priority then age, as running in this process."""
+
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            row = connection.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' "
+                "ORDER BY priority DESC, created_at, rowid LIMIT 1"
+            ).fetchone()
+
+            if row is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', worker_pid = ?, started_at = ? WHERE id = ?",
+                    (os.getpid(), time.time(), row["id"]),
+                )
+
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return row
+
+    def _checkpoint(self, job_id: str, progress: float) -> None:
+        connection = self._connection()
+        connection.execute("UPDATE jobs SET progress = ? WHERE id = ?", (progress, job_id))
+        row = connection.execute(
+            "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+
+        if self._stopping.is_set() or row is None or row["cancel_requested"]:
+            raise _Interrupted()
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, progress = MAX(progress, ?), result = ?, error = ?, "
+            "finished_at = ?, worker_pid = NULL WHERE id = ?",
+            (
+                status,
+                1.0 if status == "succeeded" else 0.0,
+                json.dumps(result) if result is not None else None,
+                error,
+                time.time(),
+                job_id,
+            ),
+        )
+
+    def _execute(self, job_id: str, kind: str, payload: str) -> Dict[str, Any]:
+        spec = JOB_KINDS[kind]
+        request = _resolve(spec.model).model_validate_json(payload)
+        function = _resolve(spec.function)
+
+        with observe_computation(kind):
+            if not spec.batched:
+                result = function(request)
+                return result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+
+            scenarios = request.scenarios
+            results: List[Any] = []
+
+            for start in range(0, len(scenarios), self.chunk_size):
+                results.extend(function(scenarios[start : start + self.chunk_size]))
+                self._checkpoint(job_id, len(results) / len(scenarios))
+
+            return {"results": results}
+
+    def _run(self, row: sqlite3.Row) -> None:
+        job_id = row["id"]
+        logger.info("Job started", job_id=job_id, kind=row["kind"])
+
+        try:
+            result = self._execute(job_id, row["kind"], row["payload"])
+        except _Interrupted:
+            if self._stopping.is_set():
+                # Started over on the next start of a manager
+                self._connection().execute(
+                    "UPDATE jobs SET status = 'queued', progress = 0, worker_pid = NULL, "
+                    "started_at = NULL WHERE id = ?",
+                    (job_id,),
+                )
+                logger.info("Job interrupted by shutdown", job_id=job_id)
+            else:
+                self._finish(job_id, "cancelled")
+                logger.info("Job cancelled", job_id=job_id)
+            return
+        except Exception as e:
+            self._finish(job_id, "failed", error=str(e))
+            logger.warning("Job failed", job_id=job_id, error=str(e))
+            return
+
+        self._finish(job_id, "succeeded", result=result)
+        logger.info("Job succeeded", job_id=job_id)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager(settings: Settings) -> JobManager:
+    """Return the process-wide job manager, started on first use."""
+
+    global _manager
+
+    with _manager_lock:
+        if _manager is None:
+            manager = JobManager(
+                settings.jobs_database_path,
+                workers=settings.jobs_workers,
+                max_active_per_user=settings.jobs_max_active_per_user,
+                max_queued=settings.jobs_max_queued,
+                chunk_size=settings.jobs_chunk_size,
+                retention=settings.jobs_retention,
+                poll_interval=settings.jobs_poll_interval,
+            )
+            manager.start()
+            _manager = manager
+
+    return _manager
+
+
+def shutdown_job_manager() -> None:
+    """Stop the process-wide job manager, if it was started."""
+
+    global _manager
+
+    with _manager_lock:
+        if _manager is not None:
+            _manager.stop()
+            _manager = None
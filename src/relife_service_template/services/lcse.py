@@ -0,0 +1,93 @@
+#Levelized cost of saved energy (LCSE) and equivalent annual cost (EAC) business logic
+from typing import Dict, List
+
+import numpy as np
+
+from relife_service_template.models.lcse import LCSERequest
+from relife_service_template.services.batch import (
+    batch_years,
+    initial_investment_batch,
+    opex_batch,
+    pad_rows,
+)
+from relife_service_template.services.factors import annuity_factors
+
+
+def lcse_batch(
+    initial_investment: np.ndarray,
+    opex: np.ndarray,
+    maintenance_cost: np.ndarray,
+    annual_energy_saved: np.ndarray,
+    discount_rate: np.ndarray,
+    lifetime: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Vectorized LCSE and EAC for many scenarios.
+
+    - **EAC** = II x CRF + OPEX: the constant yearly amount with the same present
+      value as the investment plus the yearly operating expenditure
+    - **LCSE** = (II x CRF + maintenance) / energy saved: the cost of the measure
+      per kWh saved, excluding the energy bills themselves
+
+    where CRF is the capital recovery factor of the discount rate and lifetime.
+
+    Args:
+        initial_investment: II per scenario
+        opex: Yearly operating expenditure (energy costs plus maintenance)
+        maintenance_cost: Yearly maintenance cost
+        annual_energy_saved: Energy saved per year (kWh)
+        discount_rate: Discount rate per scenario
+        lifetime: Lifetime in years per scenario
+
+    Returns:
+        Arrays `lcse`, `eac`, `annuity_factor` and `capital_recovery_factor`
+
+    Raises:
+        ValueError: If the discount rate and lifetime give no valid factors
+    """
+
+    annuity = annuity_factors(discount_rate, lifetime)
+
+    if not np.all(np.isfinite(annuity) & (annuity > 0)):
+        raise ValueError("Discount rate and lifetime give no valid capital recovery factor")
+
+    # The capital recovery factor spreads a present amount evenly over the lifetime
+    crf = 1 / annuity
+    annualised_investment = initial_investment * crf
+
+    return {
+        "lcse": (annualised_investment + maintenance_cost) / annual_energy_saved,
+        "eac": annualised_investment + opex,
+        "annuity_factor": annuity,
+        "capital_recovery_factor": crf,
+    }
+
+
+def evaluate_lcse_requests(requests: List[LCSERequest]) -> List[Dict[str, float]]:
+    """Compute LCSE and EAC for a batch of requests in one vectorized pass."""
+
+    # Rejects lifetimes too long to build discount factors for
+    batch_years(r.lifetime for r in requests)
+    maintenance_cost = np.array([r.maintenance_cost for r in requests])
+
+    results = lcse_batch(
+        initial_investment=initial_investment_batch(
+            np.array([r.capex for r in requests]),
+            np.array([r.subsidy for r in requests]),
+            np.array([r.loan_amount for r in requests]),
+        ),
+        opex=opex_batch(
+            pad_rows([r.energy_mix for r in requests]),
+            pad_rows([r.energy_prices for r in requests]),
+            maintenance_cost,
+        ),
+        maintenance_cost=maintenance_cost,
+        annual_energy_saved=np.array([r.annual_energy_saved for r in requests]),
+        discount_rate=np.array([r.discount_rate for r in requests]),
+        lifetime=np.array([r.lifetime for r in requests]),
+    )
+    columns = {name: values.tolist() for name, values in results.items()}
+
+    return [
+        {name: values[i] for name, values in columns.items()}
+        for i in range(len(requests))
+    ]
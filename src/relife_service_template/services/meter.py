@@ -0,0 +1,255 @@
+#Streaming aggregation of high-resolution meter readings into yearly or monthly energy costs
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from relife_service_template.models.carriers import CarrierEnergy
+from relife_service_template.models.meter import (
+    MeterAggregationResponse,
+    MeterCarrierSummary,
+    MeterOptions,
+    MeterPeriod,
+    MeterTariff,
+)
+from relife_service_template.services.opex import calculate_opex, carrier_breakdown
+from relife_service_template.services.roi import calculate_roi
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def meter_format(filename: Optional[str], options: MeterOptions) -> str:
+    """Return the format of a meter file, from the options or the file name."""
+
+    if options.format is not None:
+        return options.format
+
+    name = (filename or "").lower()
+
+    if name.endswith(".csv"):
+        return "csv"
+
+    if name.endswith(PARQUET_SUFFIXES):
+        return "parquet"
+
+    raise ValueError(f"Cannot tell the format of '{filename}', set format to 'csv' or 'parquet'")
+
+
+def read_meter_chunks(file: BinaryIO, fmt: str, columns: List[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Read the given columns of a meter file in chunks of at most chunk_rows readings.
+
+    Raises:
+        ImportError: If a Parquet file is read without pyarrow installed
+    """
+
+    if fmt == "csv":
+        # Timestamps are parsed per chunk, so keep them as text here
+        yield from pd.read_csv(file, usecols=columns, chunksize=chunk_rows, dtype={columns[0]: str})
+        return
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet meter files need pyarrow, install the 'parquet' extra"
+        ) from e
+
+    for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows, columns=columns):
+        yield batch.to_pandas()
+
+
+def tariff_rate_index(tariff: MeterTariff, hour: np.ndarray, weekday: np.ndarray, month: np.ndarray) -> np.ndarray:
+    """Index of the rate applying to each reading: 0 for the default price, i for rates[i - 1]."""
+
+    index = np.zeros(len(hour), dtype=np.intp)
+
+    for i, rate in enumerate(tariff.rates, start=1):
+        # Earlier rates win where several overlap
+        matches = (
+            (index == 0)
+            & np.isin(hour, rate.hours)
+            & np.isin(weekday, rate.weekdays)
+            & np.isin(month, rate.months)
+        )
+        index[matches] = i
+
+    return index
+
+
+class MeterAggregator:
+    """Consumption and cost per carrier and period, accumulated chunk by chunk.
+
+    Memory depends on the number of periods and carriers only, never on the
+    number of readings.
+    """
+
+    def __init__(self, options: MeterOptions):
+        self.options = options
+        self.readings = 0
+        # Period code -> consumption of each carrier followed by the cost of each carrier
+        self.totals: Dict[int, np.ndarray] = {}
+        # Carrier -> consumption per tariff rate (index 0 is the default price)
+        self.rate_consumption = {
+            name: np.zeros(len(tariff.rates) + 1) for name, tariff in options.tariffs.items()
+        }
+
+    def _timestamps(self, column: pd.Series) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(column):
+            timestamps = column
+        else:
+            timestamps = pd.to_datetime(column, format="ISO8601", utc=self.options.timezone is not None)
+
+        if self.options.timezone is not None:
+            if timestamps.dt.tz is None:
+                timestamps = timestamps.dt.tz_localize("UTC")
+            timestamps = timestamps.dt.tz_convert(self.options.timezone)
+
+        if timestamps.isna().any():
+            raise ValueError(f"Missing timestamps in column '{self.options.timestamp_column}'")
+
+        return timestamps
+
+    def add(self, frame: pd.DataFrame) -> None:
+        """Add a chunk of readings."""
+
+        if frame.empty:
+            return
+
+        options = self.options
+        timestamps = self._timestamps(frame[options.timestamp_column])
+        # Gaps in a carrier column count as no consumption
+        values = frame[options.carriers].apply(pd.to_numeric).fillna(0.0).to_numpy(dtype=float)
+
+        year = timestamps.dt.year.to_numpy()
+        month = timestamps.dt.month.to_numpy()
+        hour = timestamps.dt.hour.to_numpy()
+        weekday = timestamps.dt.weekday.to_numpy()
+
+        costs = np.zeros_like(values)
+        for c, name in enumerate(options.carriers):
+            tariff = options.tariffs.get(name)
+
+            if tariff is None:
+                continue
+
+            index = tariff_rate_index(tariff, hour, weekday, month)
+            prices = np.array([tariff.default_price] + [rate.price for rate in tariff.rates])
+            costs[:, c] = values[:, c] * prices[index]
+            self.rate_consumption[name] += np.bincount(
+                index, weights=values[:, c], minlength=len(prices)
+            )
+
+        codes = year * 12 + (month - 1) if options.resolution == "monthly" else year
+        periods, inverse = np.unique(codes, return_inverse=True)
+        columns = np.hstack([values, costs])
+        sums = np.stack(
+            [np.bincount(inverse, weights=column, minlength=len(periods)) for column in columns.T],
+            axis=1,
+        )
+
+        for code, row in zip(periods.tolist(), sums):
+            if code in self.totals:
+                self.totals[code] += row
+            else:
+                self.totals[code] = row
+
+        self.readings += len(frame)
+
+    def _label(self, code: int) -> str:
+        if self.options.resolution == "monthly":
+            return f"{code // 12:04d}-{code % 12 + 1:02d}"
+
+        return f"{code:04d}"
+
+    def result(self) -> MeterAggregationResponse:
+        """Summaries per carrier, priced carriers as a CarrierEnergy and the resulting OPEX and ROI."""
+
+        options = self.options
+        n = len(options.carriers)
+        codes = sorted(self.totals)
+        labels = [self._label(code) for code in codes]
+        totals = np.array([self.totals[code] for code in codes]).reshape(len(codes), 2 * n)
+
+        summaries = []
+        consumption: Dict[str, List[float]] = {}
+        prices: Dict[str, List[float]] = {}
+
+        for c, name in enumerate(options.carriers):
+            priced = name in options.tariffs
+            used, cost = totals[:, c], totals[:, n + c]
+
+            summaries.append(
+                MeterCarrierSummary(
+                    carrier=name,
+                    consumption=float(used.sum()),
+                    cost=float(cost.sum()) if priced else None,
+                    periods=[
+                        MeterPeriod(period=label, consumption=u, cost=k if priced else None)
+                        for label, u, k in zip(labels, used.tolist(), cost.tolist())
+                    ],
+                    rate_consumption=self._rate_consumption(name) if priced else {},
+                )
+            )
+
+            if priced:
+                # Effective price per period, so consumption x price gives back the period cost
+                effective = np.divide(cost, used, out=np.zeros_like(cost), where=used != 0)
+                consumption[name] = used.tolist()
+                prices[name] = effective.tolist()
+
+        energy = CarrierEnergy(consumption=consumption, prices=prices) if consumption else None
+        energy_cost = sum(s.cost for s in summaries if s.cost is not None)
+
+        return MeterAggregationResponse(
+            resolution=options.resolution,
+            readings=self.readings,
+            carriers=summaries,
+            energy=energy,
+            opex=(
+                calculate_opex([], [], options.maintenance_cost, carrier_energy_cost=energy_cost)
+                if energy is not None
+                else None
+            ),
+            roi=self._roi(energy_cost),
+        )
+
+    def _rate_consumption(self, name: str) -> Dict[str, float]:
+        rates = ["default"] + [rate.name for rate in self.options.tariffs[name].rates]
+
+        return dict(zip(rates, self.rate_consumption[name].tolist()))
+
+    def _roi(self, energy_cost: float) -> Optional[float]:
+        roi = self.options.roi
+
+        if roi is None:
+            return None
+
+        # Meter costs add to any energy use the ROI inputs already carry
+        return calculate_roi(
+            **roi.model_dump(exclude={"carriers"}),
+            carrier_energy_cost=energy_cost + sum((carrier_breakdown(roi.carriers) or {}).values()),
+        )
+
+
+def aggregate_meter_file(
+    file: BinaryIO, filename: Optional[str], options: MeterOptions, chunk_rows: int
+) -> MeterAggregationResponse:
+    """Stream a CSV or Parquet meter file and aggregate it per carrier and period.
+
+    Args:
+        file: Binary file object positioned at the start of the data
+        filename: Name used to detect the format when the options do not set it
+        options: Columns, resolution, tariffs and OPEX/ROI inputs
+        chunk_rows: Readings parsed at a time
+
+    Returns:
+        Aggregated consumption and costs, with the OPEX and ROI they lead to
+    """
+
+    aggregator = MeterAggregator(options)
+    columns = [options.timestamp_column, *options.carriers]
+
+    for chunk in read_meter_chunks(file, meter_format(filename, options), columns, chunk_rows):
+        aggregator.add(chunk)
+
+    return aggregator.result()
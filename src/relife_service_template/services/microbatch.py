@@ -0,0 +1,196 @@
+import asyncio
+import importlib
+import weakref
+from typing import Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+import anyio
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability.metrics import (
+    MICROBATCH_SIZE,
+    observe_computation,
+)
+from relife_service_template.services.opex import carrier_breakdown
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Batch and scalar functions per indicator as "module:attribute" paths. They are
+# resolved on first use so that numpy is not imported with the application.
+BATCH_KERNELS: Dict[str, Tuple[str, str]] = {
+    "npv": (
+        "relife_service_template.services.batch:evaluate_npv_requests",
+        "relife_service_template.services.npv:calculate_npv",
+    ),
+    "roi": (
+        "relife_service_template.services.batch:evaluate_roi_requests",
+        "relife_service_template.services.roi:calculate_roi",
+    ),
+}
+
+
+class MicroBatcher(Generic[T, R]):
+    """Merge concurrently submitted items into batches evaluated in one call.
+
+    Items are buffered until `max_batch_size` items are waiting or `max_wait`
+    seconds have passed since the first one arrived, whichever comes first. The
+    batch then runs in a worker thread and each submitter receives its own
+    result. If the batch function fails, the items are evaluated one by one with
+    the scalar function so that a single bad input only fails its own request.
+    """
+
+    def __init__(
+        self,
+        indicator: str,
+        batch_func: Callable[[List[T]], List[R]],
+        single_func: Callable[[T], R],
+        max_batch_size: int = 256,
+        max_wait: float = 0.002,
+    ) -> None:
+        self.indicator = indicator
+        self._batch_func = batch_func
+        self._single_func = single_func
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """Add an item to the next batch and wait for its result.
+
+        Args:
+            item: Input of a single evaluation
+
+        Returns:
+            The result for this item
+        """
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _evaluate(self, items: List[T]) -> List[object]:
+        """Evaluate a batch, falling back to per-item evaluation on failure."""
+
+        try:
+            with observe_computation(f"{self.indicator}_batch"):
+                return list(self._batch_func(items))
+        except Exception as e:
+            logger.warning(
+                "Batch evaluation failed, evaluating items individually",
+                indicator=self.indicator,
+                size=len(items),
+                error=str(e),
+            )
+
+        results: List[object] = []
+
+        for item in items:
+            try:
+                with observe_computation(self.indicator):
+                    results.append(self._single_func(item))
+            except Exception as e:
+                results.append(e)
+
+        return results
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        MICROBATCH_SIZE.labels(self.indicator).observe(len(batch))
+
+        try:
+            results = await anyio.to_thread.run_sync(
+                self._evaluate, [item for item, _ in batch]
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The submitter went away (e.g. the client disconnected)
+                continue
+
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Event loop -> {(indicator, max size, max wait): batcher}. Keyed by loop so pending
+# items never span loops, and by the options so changed settings get their own batcher
+_batchers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _scalar_arguments(request) -> Dict[str, object]:
+    """Keyword arguments of the scalar function: the request fields, with carrier
+    matrices replaced by their total energy cost."""
+
+    arguments = request.model_dump(exclude={"carriers"})
+    carriers = getattr(request, "carriers", None)
+
+    if carriers is not None:
+        arguments["carrier_energy_cost"] = sum(carrier_breakdown(carriers).values())
+
+    return arguments
+
+
+def _resolve(path: str) -> Callable:
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_batcher(indicator: str, settings: Settings) -> Optional[MicroBatcher]:
+    """Return the micro-batcher of an indicator, or None when batching is disabled.
+
+    Args:
+        indicator: Indicator with an entry in BATCH_KERNELS
+        settings: Application settings with the micro-batching options
+
+    Returns:
+        The MicroBatcher shared by requests of the indicator on the running event
+        loop with the same batching options, created on first use
+    """
+
+    if not settings.microbatching_enabled:
+        return None
+
+    batchers = _batchers.setdefault(asyncio.get_running_loop(), {})
+    key = (indicator, settings.microbatch_max_size, settings.microbatch_max_wait_ms)
+    batcher = batchers.get(key)
+
+    if batcher is None:
+        batch_path, single_path = BATCH_KERNELS[indicator]
+        single_func = _resolve(single_path)
+
+        batcher = MicroBatcher(
+            indicator,
+            batch_func=_resolve(batch_path),
+            single_func=lambda request: single_func(**_scalar_arguments(request)),
+            max_batch_size=settings.microbatch_max_size,
+            max_wait=settings.microbatch_max_wait_ms / 1000,
+        )
+        batchers[key] = batcher
+
+    return batcher
@@ -1,26 +1,76 @@
 #NPV business logic
+import math
 from typing import List
 
+
+def growing_annuity_factor(discount_rate: float, growth: float, years: int) -> float:
+    """Present value of 1 paid at the end of year 1 and growing by `growth` per year.
+
+    Closed form of sum((1 + growth)^(t-1) / (1 + discount_rate)^t for t = 1..years),
+    so the cost does not depend on the number of years. With `growth` 0 this is
+    the ordinary annuity factor.
+    """
+
+    if years <= 0:
+        return 0.0
+
+    spread = discount_rate - growth
+
+    if spread == 0:
+        return years / (1 + discount_rate)
+
+    # log((1 + g) / (1 + r)) from the same spread as the denominator, so the
+    # ratio stays accurate (and tends to years / (1 + r)) when the rates are close
+    log_ratio = math.log1p(-spread / (1 + discount_rate))
+    return -math.expm1(years * log_ratio) / spread
+
+
 def calculate_npv(
     cash_flows: List[float],
     discount_rate: float,
     energy_savings: float,
     initial_investment: float,
-    lifetime: int
+    lifetime: int,
+    energy_savings_growth: float = 0.0,
 ) -> float:
     """
     Calculate the Net Present Value (NPV) for a series of cash flows.
-    
+
     - **cash_flows**: List of floats, e.g. [-1000, 300, 400, 500]
     - **discount_rate**: Decimal, e.g. 0.1 for 10%
     - **energy_savings**: Float representing annual energy savings
     - **initial_investment**: Float representing the initial investment cost
     - **lifetime**: Integer representing the lifetime of the investment in years
+    - **energy_savings_growth**: Decimal yearly growth of the energy savings after
+      the first year, e.g. 0.02 for 2%
+
+    Only the explicit cash flows are discounted year by year; the energy savings
+    are a (growing) annuity summed in closed form, and cash flows missing or zero
+    at the end of the list add nothing.
     """
+
+    if discount_rate <= -1 or energy_savings_growth <= -1:
+        # The closed form is undefined here, so discount every year
+        npv = -initial_investment
+        for t in range(1, lifetime + 1):
+            # guard against index errors if cash_flows list is shorter than lifetime
+            cf = cash_flows[t-1] if t-1 < len(cash_flows) else 0.0
+            savings = energy_savings * (1 + energy_savings_growth) ** (t - 1)
+            npv += (cf + savings) / ((1 + discount_rate) ** t)
+
+        return npv
+
+    explicit_years = len(cash_flows)
+    while explicit_years and cash_flows[explicit_years - 1] == 0:
+        explicit_years -= 1
+
     npv = -initial_investment
-    for t in range(1, lifetime + 1):
-        # guard against index errors if cash_flows list is shorter than lifetime
-        cf = cash_flows[t-1] if t-1 < len(cash_flows) else 0.0
-        npv += (cf + energy_savings) / ((1 + discount_rate) ** t)
-    
-    return npv
\ No newline at end of file
+    for t in range(1, min(explicit_years, lifetime) + 1):
+        npv += cash_flows[t-1] / ((1 + discount_rate) ** t)
+
+    if energy_savings:
+        npv += energy_savings * growing_annuity_factor(
+            discount_rate, energy_savings_growth, lifetime
+        )
+
+    return npv
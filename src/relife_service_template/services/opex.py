@@ -1,10 +1,12 @@
-from typing import List
-import numpy as np
+from typing import Dict, List, Optional
+
+from relife_service_template.models.carriers import CarrierEnergy
 
 def calculate_opex(
     energy_mix: List[float],
     energy_prices: List[float],
     maintenance_cost: float,
+    carrier_energy_cost: float = 0.0,
 ) -> float:
 
 
@@ -15,7 +17,20 @@ def calculate_opex(
         else:
             opex.append = 0  # Default to maintenance cost if no price data available
 
-    opex = np.sum(opex) + maintenance_cost
+    # Energy cost of the per-carrier matrices (see services.carriers)
+    opex = sum(opex) + carrier_energy_cost + maintenance_cost
     
 
-    return float(opex)
\ No newline at end of file
+    return float(opex)
+
+
+def carrier_breakdown(carriers: Optional[CarrierEnergy]) -> Optional[Dict[str, float]]:
+    """Energy cost per carrier, or None for requests without carrier matrices."""
+
+    if carriers is None:
+        return None
+
+    # Imported here so numpy is only loaded for requests with carrier matrices
+    from relife_service_template.services.carriers import carrier_costs
+
+    return carrier_costs(carriers)
\ No newline at end of file
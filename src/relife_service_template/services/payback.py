@@ -0,0 +1,118 @@
+#Payback period business logic on cumulative cash-flow arrays
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.services.batch import batch_years, pad_rows, yearly_flows
+from relife_service_template.services.factors import discount_factors
+
+
+def payback_years(flows: np.ndarray, initial_investment: np.ndarray) -> np.ndarray:
+    """Return the fractional year in which cumulative flows first repay the investment.
+
+    The cumulative position starts at `-initial_investment` and adds one yearly
+    flow per year. Within the year it turns non-negative, the position is
+    interpolated linearly, so 2.5 means halfway through the third year.
+
+    Args:
+        flows: Matrix (scenarios x years) of yearly flows
+        initial_investment: Investment per scenario
+
+    Returns:
+        Payback in years per scenario, NaN where the investment is never repaid
+    """
+
+    initial_investment = np.asarray(initial_investment, dtype=float)
+
+    if flows.shape[1] == 0:
+        return np.where(initial_investment <= 0, 0.0, np.nan)
+
+    cumulative = np.cumsum(flows, axis=1) - initial_investment[:, None]
+    repaid = cumulative >= 0
+
+    year = repaid.argmax(axis=1)
+    rows = np.arange(len(flows))
+    before = np.where(year > 0, cumulative[rows, year - 1], -initial_investment)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = -before / flows[rows, year]
+
+    payback = np.where(repaid.any(axis=1), year + fraction, np.nan)
+
+    # Nothing to repay
+    return np.where(initial_investment <= 0, 0.0, payback)
+
+
+def payback_batch(
+    cash_flows: np.ndarray,
+    discount_rate: np.ndarray,
+    energy_savings: np.ndarray,
+    initial_investment: np.ndarray,
+    lifetime: np.ndarray,
+    energy_savings_growth: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simple and discounted payback for many scenarios.
+
+    Uses the same yearly flows and discounting as `calculate_npv`, so the
+    discounted payback is the year in which the NPV over that horizon turns
+    non-negative.
+
+    - **cash_flows**: Matrix (scenarios x years) of cash flows, zero-padded
+    - **discount_rate**, **energy_savings**, **initial_investment**, **lifetime**,
+      **energy_savings_growth**: One value per scenario (no growth if omitted)
+
+    Returns:
+        Simple and discounted payback in years, NaN where never reached
+
+    Raises:
+        ValueError: If discounting produces non-finite values
+    """
+
+    flows = yearly_flows(cash_flows, energy_savings, lifetime, energy_savings_growth)
+    discount = discount_factors(discount_rate, flows.shape[1])
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        discounted = flows * discount
+
+    if not np.all(np.isfinite(discounted)):
+        raise ValueError("Discounting produced non-finite cash flows")
+
+    return (
+        payback_years(flows, initial_investment),
+        payback_years(discounted, initial_investment),
+    )
+
+
+def nan_to_none(values: np.ndarray) -> List[Optional[float]]:
+    """Convert an array to a list with None in place of NaN (e.g. payback not reached)."""
+
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def evaluate_payback_requests(requests: List[NPVRequest]) -> List[Dict[str, Optional[float]]]:
+    """Compute simple and discounted payback for a batch of NPV-style requests.
+
+    Args:
+        requests: Scenarios with the same inputs as the NPV endpoint
+
+    Returns:
+        One dict per request with `payback_years` and `discounted_payback_years`
+        (None when the investment is not repaid within the lifetime)
+    """
+
+    simple, discounted = payback_batch(
+        cash_flows=pad_rows(
+            [r.cash_flows for r in requests], batch_years(r.lifetime for r in requests)
+        ),
+        discount_rate=np.array([r.discount_rate for r in requests]),
+        energy_savings=np.array([r.energy_savings for r in requests]),
+        initial_investment=np.array([r.initial_investment for r in requests]),
+        lifetime=np.array([r.lifetime for r in requests]),
+        energy_savings_growth=np.array([r.energy_savings_growth for r in requests]),
+    )
+
+    return [
+        {"payback_years": s, "discounted_payback_years": d}
+        for s, d in zip(nan_to_none(simple), nan_to_none(discounted))
+    ]
@@ -0,0 +1,259 @@
+#Portfolio evaluation and budget-constrained selection of renovations
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from relife_service_template.models.portfolio import (
+    BuildingRanking,
+    PortfolioBuilding,
+    PortfolioRequest,
+    PortfolioResponse,
+    PortfolioTotals,
+)
+from relife_service_template.services.batch import (
+    batch_years,
+    initial_investment_batch,
+    npv_batch,
+    pad_rows,
+    roi_batch,
+)
+from relife_service_template.services.payback import nan_to_none, payback_batch
+
+# Largest knapsack table (candidate buildings x budget units) solved exactly
+MAX_KNAPSACK_CELLS = 20_000_000
+
+
+def evaluate_buildings(
+    buildings: List[PortfolioBuilding], discount_rate: float
+) -> Dict[str, np.ndarray]:
+    """Evaluate NPV, ROI and initial investment of every building in one pass.
+
+    Args:
+        buildings: Renovation scenarios of the portfolio
+        discount_rate: Discount rate applied to every building
+
+    Returns:
+        Arrays `capex`, `ii`, `npv`, `roi`, `payback` and `discounted_payback`,
+        one value per building (payback is NaN if not reached within the lifetime)
+    """
+
+    capex = np.array([b.capex for b in buildings])
+    subsidy = np.array([b.subsidy for b in buildings])
+    loan_amount = np.array([b.loan_amount for b in buildings])
+    energy_savings = np.array([b.energy_savings for b in buildings])
+    ii = initial_investment_batch(capex, subsidy, loan_amount)
+    lifetime = np.array([b.lifetime for b in buildings])
+
+    cash_flows = pad_rows([b.cash_flows for b in buildings], batch_years(lifetime.tolist()))
+    discount_rates = np.full(len(buildings), discount_rate)
+
+    # Like the NPV endpoint, NPV and payback are computed against the initial investment
+    npv = npv_batch(cash_flows, discount_rates, energy_savings, ii, lifetime)
+    payback, discounted_payback = payback_batch(
+        cash_flows, discount_rates, energy_savings, ii, lifetime
+    )
+    roi = roi_batch(
+        capex=capex,
+        loan_amount=loan_amount,
+        subsidy=subsidy,
+        energy_savings=energy_savings,
+        energy_mix=pad_rows([b.energy_mix for b in buildings]),
+        energy_prices=pad_rows([b.energy_prices for b in buildings]),
+        maintenance_cost=np.array([b.maintenance_cost for b in buildings]),
+        other_outflows=np.array([b.other_outflows for b in buildings]),
+    )
+
+    return {
+        "capex": capex,
+        "ii": ii,
+        "npv": npv,
+        "roi": roi,
+        "payback": payback,
+        "discounted_payback": discounted_payback,
+    }
+
+
+def _candidates(cost: np.ndarray, value: np.ndarray, budget: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Split worthwhile buildings into free ones and ones that consume budget."""
+
+    worthwhile = value > 0
+    free = np.flatnonzero(worthwhile & (cost <= 0))
+    paid = np.flatnonzero(worthwhile & (cost > 0) & (cost <= budget))
+
+    return free, paid
+
+
+def select_greedy(cost: np.ndarray, value: np.ndarray, budget: float) -> np.ndarray:
+    """Select buildings by value per unit of cost until the budget is spent.
+
+    Buildings that no longer fit are skipped, so cheaper buildings further down
+    the ranking can still use the remaining budget.
+
+    Args:
+        cost: Budget consumed by each building
+        value: Value (NPV) of each building
+        budget: Total budget
+
+    Returns:
+        Boolean selection mask
+    """
+
+    selected = np.zeros(len(cost), dtype=bool)
+    free, paid = _candidates(cost, value, budget)
+    selected[free] = True
+
+    order = paid[np.argsort(-(value[paid] / cost[paid]), kind="stable")]
+    spent = np.cumsum(cost[order])
+
+    # The longest prefix of the ranking that fits is taken in one step
+    prefix = int(np.searchsorted(spent, budget, side="right"))
+    selected[order[:prefix]] = True
+    remaining = budget - (spent[prefix - 1] if prefix else 0.0)
+
+    rest = order[prefix + 1 :]
+
+    for i, item_cost in zip(rest.tolist(), cost[rest].tolist()):
+        if item_cost <= remaining:
+            selected[i] = True
+            remaining -= item_cost
+
+    return selected
+
+
+def select_knapsack(
+    cost: np.ndarray, value: np.ndarray, budget: float, resolution: int
+) -> np.ndarray:
+    """Select the buildings maximising total value within the budget (0/1 knapsack).
+
+    Costs are rounded up to multiples of `budget / resolution`, so the selection
+    never exceeds the budget but may leave up to one unit per building unused.
+    The resolution is lowered if the table would exceed MAX_KNAPSACK_CELLS.
+
+    Args:
+        cost: Budget consumed by each building
+        value: Value (NPV) of each building
+        budget: Total budget
+        resolution: Number of budget units
+
+    Returns:
+        Boolean selection mask
+    """
+
+    selected = np.zeros(len(cost), dtype=bool)
+    free, paid = _candidates(cost, value, budget)
+    selected[free] = True
+
+    if len(paid) == 0:
+        return selected
+
+    capacity = max(1, min(resolution, MAX_KNAPSACK_CELLS // len(paid)))
+    # The tolerance keeps a building costing exactly the budget within capacity
+    weights = np.ceil(cost[paid] * capacity / budget - 1e-9).astype(np.int64)
+
+    best = np.zeros(capacity + 1)
+    taken = np.zeros((len(paid), capacity + 1), dtype=bool)
+
+    for row, (weight, item_value) in enumerate(zip(weights, value[paid])):
+        if weight > capacity:
+            continue
+
+        with_item = best[: capacity + 1 - weight] + item_value
+        improves = with_item > best[weight:]
+        taken[row, weight:] = improves
+        best[weight:] = np.where(improves, with_item, best[weight:])
+
+    remaining = capacity
+
+    for row in range(len(paid) - 1, -1, -1):
+        if taken[row, remaining]:
+            selected[paid[row]] = True
+            remaining -= weights[row]
+
+    return selected
+
+
+def optimise_portfolio(request: PortfolioRequest) -> PortfolioResponse:
+    """Evaluate a portfolio and select the buildings to renovate within the budget.
+
+    Args:
+        request: Buildings, discount rate, budget and selection options
+
+    Returns:
+        Selected buildings, portfolio totals and the ranking of every building
+    """
+
+    buildings = request.buildings
+    results = evaluate_buildings(buildings, request.discount_rate)
+    cost = results["capex"] if request.cost_basis == "capex" else results["ii"]
+    npv = results["npv"]
+
+    method = request.method
+
+    if method == "auto":
+        _, paid = _candidates(cost, npv, request.budget)
+        fits = len(paid) * request.budget_resolution <= MAX_KNAPSACK_CELLS
+        method = "knapsack" if fits else "greedy"
+
+    selected = select_greedy(cost, npv, request.budget)
+
+    if method == "knapsack":
+        exact = select_knapsack(cost, npv, request.budget, request.budget_resolution)
+
+        # Rounding costs up can lose to greedy on coarse resolutions; keep the better one
+        if npv[exact].sum() >= npv[selected].sum():
+            selected = exact
+        else:
+            method = "greedy"
+
+    positive_cost = cost > 0
+    npv_per_cost = np.divide(npv, cost, out=np.zeros_like(npv), where=positive_cost)
+
+    # Free buildings with a positive NPV rank first, then by NPV per unit of cost
+    free_gain = ~positive_cost & (npv > 0)
+    order = np.lexsort((-npv, -npv_per_cost, ~free_gain))
+
+    if request.top is not None:
+        order = order[: request.top]
+
+    # Plain lists make building the response models much faster than numpy scalars
+    npv_values = npv.tolist()
+    roi_values = results["roi"].tolist()
+    ii_values = results["ii"].tolist()
+    cost_values = cost.tolist()
+    ratios = npv_per_cost.tolist()
+    has_cost = positive_cost.tolist()
+    is_selected = selected.tolist()
+    paybacks = nan_to_none(results["payback"])
+    discounted_paybacks = nan_to_none(results["discounted_payback"])
+
+    rankings = [
+        BuildingRanking(
+            id=buildings[i].id,
+            rank=rank,
+            npv=npv_values[i],
+            roi=roi_values[i],
+            ii=ii_values[i],
+            cost=cost_values[i],
+            npv_per_cost=ratios[i] if has_cost[i] else None,
+            payback_years=paybacks[i],
+            discounted_payback_years=discounted_paybacks[i],
+            selected=is_selected[i],
+        )
+        for rank, i in enumerate(order.tolist(), start=1)
+    ]
+
+    spent = float(cost[selected].clip(min=0).sum())
+
+    return PortfolioResponse(
+        method=method,
+        selected=[buildings[i].id for i in np.flatnonzero(selected).tolist()],
+        totals=PortfolioTotals(
+            buildings=len(buildings),
+            selected=int(selected.sum()),
+            cost=spent,
+            ii=float(results["ii"][selected].sum()),
+            npv=float(npv[selected].sum()),
+            budget_remaining=request.budget - spent,
+        ),
+        rankings=rankings,
+    )
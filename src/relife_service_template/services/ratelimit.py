@@ -0,0 +1,200 @@
+#Token-bucket rate limiting per authenticated user
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Protocol, Sequence, Tuple
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability.metrics import observe_outbound, record_cache_lookup
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+logger = get_logger(__name__)
+
+# Users tracked by the in-memory backend; buckets idle the longest are dropped first
+MAX_TRACKED_USERS = 100_000
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of taking a token from a user's bucket.
+
+    Attributes:
+        allowed: Whether the request may proceed
+        limit: Bucket capacity (requests per window)
+        remaining: Whole tokens left after this request
+        reset: Seconds until the bucket is full again
+        retry_after: Seconds until the next request is allowed (0 if allowed)
+        window: Seconds in which an empty bucket refills completely
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int
+    window: float
+
+    def headers(self) -> Dict[str, str]:
+        """Return the RateLimit-* response headers (IETF draft), plus Retry-After if limited."""
+
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+            "RateLimit-Policy": f"{self.limit};w={self.window:g}",
+        }
+
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+
+        return headers
+
+
+def _decide(tokens: float, allowed: bool, limit: int, window: float) -> RateLimitDecision:
+    rate = limit / window
+    missing = 0.0 if allowed else 1 - tokens
+
+    return RateLimitDecision(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, int(tokens)),
+        reset=math.ceil((limit - tokens) / rate),
+        retry_after=math.ceil(missing / rate),
+        window=window,
+    )
+
+
+class RateLimitBackend(Protocol):
+    async def consume(self, key: str, limit: int, window: float) -> RateLimitDecision:
+        """Take one token from the bucket of `key` holding at most `limit` tokens,
+        refilled at `limit / window` tokens per second."""
+
+
+class MemoryRateLimitBackend:
+    """Buckets kept in the memory of one worker process.
+
+    With several workers each one limits separately, so the effective limit is
+    multiplied by the number of workers; use a shared backend there.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        # Insertion order doubles as least recently used order
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def consume(self, key: str, limit: int, window: float) -> RateLimitDecision:
+        now = self._clock()
+        tokens, updated = self._buckets.pop(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - updated) * limit / window)
+
+        allowed = tokens >= 1
+
+        if allowed:
+            tokens -= 1
+
+        if len(self._buckets) >= MAX_TRACKED_USERS:
+            self._buckets.pop(next(iter(self._buckets)))
+
+        self._buckets[key] = (tokens, now)
+
+        return _decide(tokens, allowed, limit, window)
+
+
+class SupabaseRateLimitBackend:
+    """Buckets shared by all workers through a Postgres function called over Supabase RPC.
+
+    The function `rate_limit_consume(p_key text, p_capacity int, p_refill_rate
+    float8)` must update the bucket row atomically and return the remaining
+    `tokens` and whether the request is `allowed` (see the README). If the call
+    fails the request is allowed, so an outage of the backend does not take the
+    API down with it.
+    """
+
+    def __init__(self, client_provider: Callable[[], Awaitable["AsyncClient"]]) -> None:
+        self._client_provider = client_provider
+        # Created on the first request and reused by all the following ones
+        self._client: Optional["AsyncClient"] = None
+
+    async def consume(self, key: str, limit: int, window: float) -> RateLimitDecision:
+        try:
+            if self._client is None:
+                self._client = await self._client_provider()
+
+            with observe_outbound("supabase_rate_limit"):
+                response = await self._client.rpc(
+                    "rate_limit_consume",
+                    {"p_key": key, "p_capacity": limit, "p_refill_rate": limit / window},
+                ).execute()
+
+            row = response.data[0] if isinstance(response.data, list) else response.data
+            return _decide(float(row["tokens"]), bool(row["allowed"]), limit, window)
+        except Exception as e:
+            logger.warning("Rate limit backend failed, allowing request", error=str(e))
+            return _decide(float(limit), True, limit, window)
+
+
+def limit_for_roles(role_names: Sequence[str], settings: Settings) -> int:
+    """Return the most generous per-window limit among the user's roles, or the default."""
+
+    limits = [
+        settings.rate_limit_role_limits[name]
+        for name in role_names
+        if name in settings.rate_limit_role_limits
+    ]
+
+    return max(limits, default=settings.rate_limit_requests)
+
+
+class RoleLimitCache:
+    """Per-user limits resolved from Keycloak roles, kept for a short time.
+
+    Saves the two Keycloak calls that resolving the roles takes on every
+    rate-limited request; role changes apply once the entry expires.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        # Insertion order doubles as least recently stored order
+        self._limits: Dict[str, Tuple[int, float]] = {}
+
+    def get(self, user_id: str, ttl: float) -> Optional[int]:
+        """Return the user's limit if it was stored less than `ttl` seconds ago."""
+
+        entry = self._limits.get(user_id)
+        hit = entry is not None and self._clock() - entry[1] < ttl
+        record_cache_lookup("rate_limit_roles", hit)
+
+        return entry[0] if hit else None
+
+    def put(self, user_id: str, limit: int) -> None:
+        self._limits.pop(user_id, None)
+
+        if len(self._limits) >= MAX_TRACKED_USERS:
+            self._limits.pop(next(iter(self._limits)))
+
+        self._limits[user_id] = (limit, self._clock())
+
+
+role_limits = RoleLimitCache()
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend(settings: Settings) -> RateLimitBackend:
+    """Return the process-wide backend selected by `rate_limit_backend`."""
+
+    global _backend
+
+    if _backend is None:
+        if settings.rate_limit_backend == "supabase":
+            # Imported here, as the auth dependencies import this module
+            from relife_service_template.auth.dependencies import get_service_client
+
+            _backend = SupabaseRateLimitBackend(lambda: get_service_client(settings))
+        else:
+            _backend = MemoryRateLimitBackend()
+
+    return _backend
@@ -0,0 +1,247 @@
+#Background persistence of computed results to Supabase
+import asyncio
+import random
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability.metrics import (
+    RESULTS_DROPPED,
+    RESULTS_WRITTEN,
+    observe_outbound,
+)
+
+logger = get_logger(__name__)
+
+# Longest wait (seconds) between two retries of a failed insert
+MAX_RETRY_BACKOFF = 30.0
+
+ResultInsert = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+"""An async callable that stores a batch of result rows and raises if it fails."""
+
+
+class ResultWriter:
+    """Buffer computed results in memory and store them in batches in the background.
+
+    Recording a result only appends it to the buffer, so requests never wait on
+    the database. The buffer is flushed once `batch_size` results are waiting or
+    every `flush_interval` seconds. A failed insert is retried with exponential
+    backoff; results are dropped (and counted) when the buffer is full or an
+    insert still fails after `max_retries` retries.
+    """
+
+    def __init__(
+        self,
+        insert: ResultInsert,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        max_buffer: int = 10000,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        self._insert = insert
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        # Rows of the batch being inserted
+        self._writing = 0
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of results waiting to be written."""
+
+        return len(self._buffer)
+
+    def record(self, row: Dict[str, Any]) -> bool:
+        """Queue a result row; returns False if it was dropped because the buffer is full."""
+
+        if len(self._buffer) >= self._max_buffer:
+            RESULTS_DROPPED.labels("buffer_full").inc()
+            return False
+
+        self._buffer.append(row)
+
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+
+        return True
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        # Already out of the buffer: counted as dropped if shutdown cancels the write
+        self._writing = len(batch)
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._insert(batch)
+                RESULTS_WRITTEN.inc(len(batch))
+                self._writing = 0
+                return
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+                if attempt < self._max_retries:
+                    # Full jitter keeps workers that failed together from retrying together
+                    delay = min(MAX_RETRY_BACKOFF, self._retry_backoff * 2**attempt)
+                    delay *= random.uniform(0.5, 1.0)
+                    logger.warning(
+                        "Result insert failed, retrying",
+                        rows=len(batch),
+                        attempt=attempt + 1,
+                        delay=round(delay, 3),
+                        error=error,
+                    )
+                    await asyncio.sleep(delay)
+
+        logger.error("Dropping results after failed inserts", rows=len(batch), error=error)
+        RESULTS_DROPPED.labels("insert_failed").inc(len(batch))
+        self._writing = 0
+
+    async def flush(self) -> None:
+        """Write every buffered result, one batch at a time."""
+
+        while self._buffer:
+            size = min(self._batch_size, len(self._buffer))
+            await self._write([self._buffer.popleft() for _ in range(size)])
+
+    async def _loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush()
+
+        await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush loop on the running event loop."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="result-writer")
+
+    async def stop(self, timeout: float) -> None:
+        """Write the remaining results and stop, giving up after `timeout` seconds."""
+
+        if self._task is None:
+            return
+
+        self._closing = True
+        self._wakeup.set()
+
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            dropped = len(self._buffer) + self._writing
+            logger.error("Result writer did not finish in time", dropped=dropped)
+            RESULTS_DROPPED.labels("shutdown").inc(dropped)
+            self._buffer.clear()
+            self._writing = 0
+
+        self._task = None
+
+
+def _supabase_insert(settings: Settings) -> ResultInsert:
+    """Insert rows into the `results_table` of Supabase with the service client."""
+
+    # Imported here so that the auth dependencies are only loaded if enabled
+    from relife_service_template.auth.dependencies import get_service_client
+
+    client = None
+
+    async def insert(rows: List[Dict[str, Any]]) -> None:
+        nonlocal client
+
+        if client is None:
+            client = await get_service_client(settings)
+
+        with observe_outbound("supabase_results"):
+            await client.table(settings.results_table).insert(rows).execute()
+
+    return insert
+
+
+_writer: Optional[ResultWriter] = None
+
+
+def get_result_writer() -> Optional[ResultWriter]:
+    """Return the running result writer, or None if results are not stored."""
+
+    return _writer
+
+
+async def start_result_writer(
+    settings: Settings, insert: Optional[ResultInsert] = None
+) -> Optional[ResultWriter]:
+    """Create and start the result writer for the application lifetime.
+
+    Args:
+        settings: Application settings with the `results_*` options
+        insert: Batch insert to use instead of the Supabase table
+
+    Returns:
+        The started ResultWriter, or None if `results_enabled` is off
+    """
+
+    global _writer
+
+    if not settings.results_enabled:
+        return None
+
+    _writer = ResultWriter(
+        insert or _supabase_insert(settings),
+        batch_size=settings.results_batch_size,
+        flush_interval=settings.results_flush_interval,
+        max_buffer=settings.results_max_buffer,
+        max_retries=settings.results_max_retries,
+        retry_backoff=settings.results_retry_backoff,
+    )
+    _writer.start()
+
+    return _writer
+
+
+async def stop_result_writer(settings: Settings) -> None:
+    """Flush the remaining results and stop the result writer."""
+
+    global _writer
+
+    if _writer is not None:
+        await _writer.stop(settings.results_shutdown_timeout)
+        _writer = None
+
+
+def record_result(indicator: str, request: BaseModel, result: Any) -> None:
+    """Queue a computed result for storage; does nothing unless the writer runs.
+
+    Args:
+        indicator: Endpoint that computed the result (e.g. "npv")
+        request: Validated request the result was computed from
+        result: Response model or JSON-compatible value; its echoed `input` is left out
+    """
+
+    if _writer is None:
+        return
+
+    if isinstance(result, BaseModel):
+        result = result.model_dump(mode="json", exclude={"input"})
+
+    _writer.record(
+        {
+            "indicator": indicator,
+            "input": request.model_dump(mode="json"),
+            "result": result,
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+        }
+    )
@@ -1,5 +1,4 @@
 from typing import List
-import numpy as np
 
 
 def calculate_roi(
@@ -13,6 +12,7 @@ def calculate_roi(
         energy_prices: List[float]=None,
         maintenance_cost: float= 0.0,
         other_outflows: float= 0.0,
+        carrier_energy_cost: float= 0.0,
 )-> float: 
     
 
@@ -35,7 +35,8 @@ def calculate_roi(
         else:
             opex.append(0)  # Default to maintenance cost if no price data available
 
-    opex = np.sum(opex) + maintenance_cost
+    # Energy cost of the per-carrier matrices (see services.carriers)
+    opex = sum(opex) + carrier_energy_cost + maintenance_cost
     opex=float(opex)  # Ensure opex is a float
 
     #Initial Investment (II)
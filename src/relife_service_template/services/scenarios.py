@@ -0,0 +1,446 @@
+#Interactive what-if scenarios: cached ROI/IRR intermediates updated by JSON Patch
+import copy
+import json
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+
+from relife_service_template.config.settings import Settings
+from relife_service_template.models.irr import IRRRequest
+from relife_service_template.models.roi import ROIRequest
+from relife_service_template.models.scenario import PatchOperation
+from relife_service_template.observability.metrics import record_cache_lookup
+from relife_service_template.services.ii import calculate_ii
+from relife_service_template.services.opex import carrier_breakdown
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Cached intermediate of a scenario.
+
+    Attributes:
+        name: Name of the stage
+        fields: Request fields the stage reads
+        depends_on: Earlier stages the stage reads
+        compute: Function of the request and the values of the earlier stages
+    """
+
+    name: str
+    fields: Tuple[str, ...]
+    depends_on: Tuple[str, ...]
+    compute: Callable[[Any, Dict[str, Any]], Any]
+
+
+# The stages below reproduce calculate_roi and calculate_irr step by step, so a
+# scenario gives the same values as the ROI and IRR endpoints.
+
+def _carrier_costs(request) -> List[float]:
+    return list((carrier_breakdown(request.carriers) or {}).values())
+
+
+def _roi_energy_costs(request: ROIRequest, values: Dict[str, Any]) -> List[float]:
+    # Carriers without a price cost nothing
+    return [
+        mix * request.energy_prices[t] if t < len(request.energy_prices) else 0
+        for t, mix in enumerate(request.energy_mix)
+    ] + _carrier_costs(request)
+
+
+def _irr_energy_costs(request: IRRRequest, values: Dict[str, Any]) -> List[float]:
+    # Carriers without a price are charged the maintenance cost
+    return [
+        mix * request.energy_prices[t] if t < len(request.energy_prices) else request.maintenance_cost
+        for t, mix in enumerate(request.energy_mix)
+    ] + _carrier_costs(request)
+
+
+def _opex(request, values: Dict[str, Any]) -> float:
+    return float(sum(values["energy_costs"]) + request.maintenance_cost)
+
+
+def _roi_ii(request: ROIRequest, values: Dict[str, Any]) -> float:
+    return calculate_ii(request.capex, loan_amount=request.loan_amount, subsidy=request.subsidy)
+
+
+def _irr_ii(request: IRRRequest, values: Dict[str, Any]) -> float:
+    if request.subsidy > 0 or request.loan_amount > 0:
+        return request.capex - request.subsidy - request.loan_amount
+
+    return request.capex
+
+
+def _roi(request: ROIRequest, values: Dict[str, Any]) -> float:
+    ii = values["ii"]
+    net_profit = request.energy_savings - values["opex"] - request.other_outflows
+
+    return 0.0 if ii == 0 else float((net_profit - ii) / ii * 100)
+
+
+def _irr(request: IRRRequest, values: Dict[str, Any]) -> float:
+    ii = values["ii"]
+
+    if ii == 0:
+        return 0.0
+
+    return float((request.energy_savings - values["opex"] - request.other_outflows) / ii)
+
+
+# Request model and stages of each indicator, in dependency order
+INDICATORS: Dict[str, Tuple[Type[BaseModel], Tuple[Stage, ...]]] = {
+    "roi": (
+        ROIRequest,
+        (
+            Stage(
+                "energy_costs",
+                ("energy_mix", "energy_prices", "carriers"),
+                (),
+                _roi_energy_costs,
+            ),
+            Stage("opex", ("maintenance_cost",), ("energy_costs",), _opex),
+            Stage("ii", ("capex", "subsidy", "loan_amount"), (), _roi_ii),
+            Stage("roi", ("energy_savings", "other_outflows"), ("opex", "ii"), _roi),
+        ),
+    ),
+    "irr": (
+        IRRRequest,
+        (
+            Stage(
+                "energy_costs",
+                ("energy_mix", "energy_prices", "carriers", "maintenance_cost"),
+                (),
+                _irr_energy_costs,
+            ),
+            Stage("opex", ("maintenance_cost",), ("energy_costs",), _opex),
+            Stage("ii", ("capex", "subsidy", "loan_amount"), (), _irr_ii),
+            Stage("irr", ("energy_savings", "other_outflows"), ("opex", "ii"), _irr),
+        ),
+    ),
+}
+
+
+def run_stages(
+    stages: Iterable[Stage], request: BaseModel, values: Dict[str, Any], changed: Set[str]
+) -> List[str]:
+    """Recompute the stages affected by changed request fields, in place.
+
+    A stage is recomputed if it has no value yet, reads a changed field or
+    depends on a recomputed stage; every other stage keeps its cached value.
+
+    Args:
+        stages: Stages in dependency order
+        request: Current request of the scenario
+        values: Cached stage values, updated in place
+        changed: Request fields changed since the values were computed
+
+    Returns:
+        Names of the recomputed stages
+    """
+
+    recomputed: List[str] = []
+
+    for stage in stages:
+        stale = (
+            stage.name not in values
+            or not changed.isdisjoint(stage.fields)
+            or any(name in recomputed for name in stage.depends_on)
+        )
+        record_cache_lookup("scenario_stages", not stale)
+
+        if stale:
+            values[stage.name] = stage.compute(request, values)
+            recomputed.append(stage.name)
+
+    return recomputed
+
+
+def _path_tokens(path: str) -> List[str]:
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON Patch path '{path}'")
+
+    # JSON Pointer escapes (RFC 6901)
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _array_index(token: str, array: List[Any], op: str, path: str) -> int:
+    if token == "-" and op == "add":
+        return len(array)
+
+    limit = len(array) + 1 if op == "add" else len(array)
+
+    if not token.isdigit() or int(token) >= limit:
+        raise ValueError(f"Invalid array index in path '{path}'")
+
+    return int(token)
+
+
+def apply_patch(
+    document: Dict[str, Any], operations: Iterable[PatchOperation]
+) -> Tuple[Dict[str, Any], Set[str]]:
+    """Apply JSON Patch operations to a copy of a request document.
+
+    Supports `add`, `remove`, `replace` and `test` on request fields and on items
+    of array fields; `move` and `copy` are not needed for flat requests.
+
+    Args:
+        document: Request as a dict
+        operations: Operations applied in order
+
+    Returns:
+        The patched copy and the names of the fields the operations modified
+
+    Raises:
+        ValueError: If a path is invalid or a `test` operation fails
+    """
+
+    document = copy.deepcopy(document)
+    touched: Set[str] = set()
+
+    for operation in operations:
+        op, path, value = operation.op, operation.path, operation.value
+        tokens = _path_tokens(path)
+        field = tokens[0]
+
+        if field not in document or len(tokens) > 2:
+            raise ValueError(f"Path '{path}' does not address a request field")
+
+        if len(tokens) == 1:
+            if op == "test":
+                if document[field] != value:
+                    raise ValueError(f"Test failed at path '{path}'")
+            elif op == "remove":
+                del document[field]
+            else:
+                document[field] = value
+        else:
+            array = document[field]
+
+            if not isinstance(array, list):
+                raise ValueError(f"Path '{path}' indexes a field that is not an array")
+
+            index = _array_index(tokens[1], array, op, path)
+
+            if op == "test":
+                if array[index] != value:
+                    raise ValueError(f"Test failed at path '{path}'")
+            elif op == "add":
+                array.insert(index, value)
+            elif op == "remove":
+                array.pop(index)
+            else:
+                array[index] = value
+
+        if op != "test":
+            touched.add(field)
+
+    return document, touched
+
+
+class ScenarioTooLarge(ValueError):
+    """Raised when a scenario would take more memory than allowed per scenario."""
+
+
+def _scenario_size(request: BaseModel, values: Dict[str, Any]) -> int:
+    # Serialized size, a proxy for the memory held by the request and its stage values
+    return len(request.model_dump_json()) + len(json.dumps(values))
+
+
+def _check_size(size: int, max_bytes: Optional[int]) -> None:
+    if max_bytes is not None and size > max_bytes:
+        raise ScenarioTooLarge(f"Scenario of {size} bytes exceeds the limit of {max_bytes} bytes")
+
+
+class Scenario:
+    """A request kept on the server with the cached values of its stages."""
+
+    def __init__(self, indicator: str, data: Dict[str, Any], max_bytes: Optional[int] = None):
+        """
+        Args:
+            indicator: Key of INDICATORS
+            data: Full request of the indicator
+            max_bytes: Largest serialized size of the request and its values
+
+        Raises:
+            ValueError: If the indicator is unknown or the request invalid
+            ScenarioTooLarge: If the scenario exceeds max_bytes
+        """
+
+        if indicator not in INDICATORS:
+            raise ValueError(f"Unknown scenario indicator '{indicator}'")
+
+        model, stages = INDICATORS[indicator]
+        self.indicator = indicator
+        self.max_bytes = max_bytes
+        self.request = model.model_validate(data)
+        self.values: Dict[str, Any] = {}
+        self.recomputed = run_stages(stages, self.request, self.values, set())
+        self.size = _scenario_size(self.request, self.values)
+        self.last_used = 0.0
+
+        _check_size(self.size, max_bytes)
+
+    def apply(self, operations: Iterable[PatchOperation]) -> List[str]:
+        """Patch the request and recompute the stages depending on the changed fields.
+
+        The scenario is left unchanged if the patch or the recomputation fails.
+
+        Args:
+            operations: JSON Patch operations
+
+        Returns:
+            Names of the recomputed stages
+        """
+
+        model, stages = INDICATORS[self.indicator]
+        previous = self.request.model_dump()
+        patched, touched = apply_patch(previous, operations)
+
+        request = model.model_validate(patched)
+        current = request.model_dump()
+        # Setting a field to its current value does not invalidate anything
+        changed = {field for field in touched if current[field] != previous[field]}
+
+        values = dict(self.values)
+        recomputed = run_stages(stages, request, values, changed)
+        size = _scenario_size(request, values)
+        _check_size(size, self.max_bytes)
+
+        self.request, self.values, self.recomputed, self.size = request, values, recomputed, size
+        return recomputed
+
+
+class ScenarioStore:
+    """In-memory scenarios bounded in number and size and evicted when idle.
+
+    Scenarios are kept in least recently used order. Creating one beyond
+    `max_sessions`, or growing the scenarios beyond `max_total_bytes`, evicts
+    the least recently used, and scenarios unused for `idle_timeout` seconds
+    are dropped on the next access to the store. A single scenario larger
+    than `max_bytes` is rejected.
+
+    The store is only used from the event loop and never awaits, so it needs no
+    locking. Scenarios live in the worker process that created them.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        idle_timeout: float,
+        max_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self._clock = clock
+        self._scenarios: "OrderedDict[str, Scenario]" = OrderedDict()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._scenarios)
+
+    def _expire(self, now: float) -> None:
+        while self._scenarios:
+            oldest = next(iter(self._scenarios.values()))
+
+            if now - oldest.last_used < self.idle_timeout:
+                break
+
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        _, scenario = self._scenarios.popitem(last=False)
+        self._total_bytes -= scenario.size
+
+    def _fit(self, keep: str) -> None:
+        """Evict the least recently used scenarios, other than `keep`, until the total fits."""
+
+        if self.max_total_bytes is None:
+            return
+
+        while self._total_bytes > self.max_total_bytes and next(iter(self._scenarios)) != keep:
+            self._evict_oldest()
+
+    def create(self, indicator: str, data: Dict[str, Any]) -> Tuple[str, Scenario]:
+        """Validate and evaluate a new scenario and store it under a random id."""
+
+        scenario = Scenario(indicator, data, self.max_bytes)
+        now = self._clock()
+        self._expire(now)
+
+        while len(self._scenarios) >= max(self.max_sessions, 1):
+            self._evict_oldest()
+
+        scenario_id = secrets.token_urlsafe(16)
+        scenario.last_used = now
+        self._scenarios[scenario_id] = scenario
+        self._total_bytes += scenario.size
+        self._fit(scenario_id)
+
+        return scenario_id, scenario
+
+    def get(self, scenario_id: str) -> Optional[Scenario]:
+        """Return a scenario and mark it as recently used, or None if unknown or expired."""
+
+        now = self._clock()
+        self._expire(now)
+        scenario = self._scenarios.get(scenario_id)
+
+        if scenario is not None:
+            scenario.last_used = now
+            self._scenarios.move_to_end(scenario_id)
+
+        return scenario
+
+    def apply(self, scenario_id: str, operations: Iterable[PatchOperation]) -> Optional[Scenario]:
+        """Patch a scenario (see `Scenario.apply`), or return None if unknown or expired.
+
+        Other scenarios are evicted if the patched one makes the total too large.
+        """
+
+        scenario = self.get(scenario_id)
+
+        if scenario is None:
+            return None
+
+        previous = scenario.size
+        scenario.apply(operations)
+        self._total_bytes += scenario.size - previous
+        self._fit(scenario_id)
+
+        return scenario
+
+    def delete(self, scenario_id: str) -> bool:
+        """Drop a scenario, returning whether it existed."""
+
+        scenario = self._scenarios.pop(scenario_id, None)
+
+        if scenario is None:
+            return False
+
+        self._total_bytes -= scenario.size
+        return True
+
+
+_store: Optional[ScenarioStore] = None
+
+
+def get_scenario_store(settings: Settings) -> ScenarioStore:
+    """Return the process-wide scenario store, created on first use."""
+
+    global _store
+
+    if _store is None:
+        _store = ScenarioStore(
+            settings.scenario_max_sessions,
+            settings.scenario_idle_timeout,
+            max_bytes=settings.scenario_max_bytes,
+            max_total_bytes=settings.scenario_max_total_bytes,
+        )
+
+    return _store
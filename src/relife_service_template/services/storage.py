@@ -0,0 +1,79 @@
+#Stream objects out of Supabase Storage without holding them in memory
+import tempfile
+from typing import BinaryIO
+from urllib.parse import quote
+
+from fastapi import HTTPException, status
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability.metrics import observe_outbound
+
+logger = get_logger(__name__)
+
+# Downloads larger than this are spooled to a temporary file on disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+async def download_storage_object(path: str, settings: Settings, max_bytes: int) -> BinaryIO:
+    """Download an object of the configured bucket into a temporary file.
+
+    The object is streamed with the service key, so callers must check the
+    user may read the path before calling.
+
+    Args:
+        path: Object path inside the bucket
+        settings: Application settings with the Supabase URL, key and bucket
+        max_bytes: Largest object accepted
+
+    Returns:
+        Temporary file positioned at the start of the object
+
+    Raises:
+        HTTPException: 404 if the object does not exist, 413 if it is larger than
+            max_bytes and 502 for other storage errors
+    """
+
+    import httpx
+
+    url = (
+        f"{settings.supabase_url.rstrip('/')}/storage/v1/object/"
+        f"{quote(settings.bucket_name)}/{quote(path)}"
+    )
+    headers = {"apikey": settings.supabase_key, "Authorization": f"Bearer {settings.supabase_key}"}
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+
+    try:
+        async with httpx.AsyncClient() as client:
+            with observe_outbound("supabase_storage"):
+                async with client.stream("GET", url, headers=headers) as response:
+                    if response.status_code in (400, 404):
+                        raise HTTPException(
+                            status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"Storage object '{path}' not found",
+                        )
+
+                    if response.status_code >= 400:
+                        logger.warning("Storage download failed", path=path, status=response.status_code)
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail="Storage download failed",
+                        )
+
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+
+                        if size > max_bytes:
+                            raise HTTPException(
+                                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Storage object is larger than {max_bytes} bytes",
+                            )
+
+                        spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+
+    spooled.seek(0)
+    return spooled
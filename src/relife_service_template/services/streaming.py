@@ -0,0 +1,85 @@
+#Chunked batch evaluation streamed as server-sent events
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+import anyio
+
+from relife_service_template.config.logging import get_logger
+from relife_service_template.observability.metrics import observe_computation
+from relife_service_template.services.jobs import batch_function
+
+logger = get_logger(__name__)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event with a JSON payload."""
+
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _evaluate_chunk(kind: str, function: Callable, scenarios: List[Any]) -> List[Any]:
+    with observe_computation(kind):
+        return function(scenarios)
+
+
+async def stream_batch(
+    kind: str,
+    scenarios: List[Any],
+    chunk_size: int,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    """Evaluate a batch chunk by chunk, yielding results and progress as they come.
+
+    For every chunk a `results` event carries the `offset` of the chunk in the
+    batch and its `results`, followed by a `progress` event with the number of
+    scenarios `done`, the `total`, the `elapsed` seconds, the `throughput` in
+    scenarios per second and the `eta` in seconds. A final `done` event closes
+    the stream, or an `error` event with the `detail` if a chunk fails.
+
+    Evaluation stops as soon as the client disconnects, so an aborted batch
+    costs at most the chunk that was running.
+
+    Args:
+        kind: Key of a batched job kind
+        scenarios: Validated scenarios of the batch
+        chunk_size: Scenarios evaluated per chunk
+        is_disconnected: Returns whether the client has gone away
+    """
+
+    function = batch_function(kind)
+    total = len(scenarios)
+    started = time.perf_counter()
+    done = 0
+
+    while done < total:
+        if await is_disconnected():
+            logger.info("Batch stream aborted by client", kind=kind, done=done, total=total)
+            return
+
+        chunk = scenarios[done : done + chunk_size]
+
+        try:
+            results = await anyio.to_thread.run_sync(_evaluate_chunk, kind, function, chunk)
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e), "offset": done})
+            return
+
+        yield sse_event("results", {"offset": done, "results": results})
+        done += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        throughput = done / elapsed if elapsed > 0 else None
+
+        yield sse_event(
+            "progress",
+            {
+                "done": done,
+                "total": total,
+                "elapsed": elapsed,
+                "throughput": throughput,
+                "eta": (total - done) / throughput if throughput else None,
+            },
+        )
+
+    yield sse_event("done", {"done": done, "total": total, "elapsed": time.perf_counter() - started})
@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from relife_service_template.config.settings import Settings
+from relife_service_template.middleware.admission import AdmissionLimiter, AdmissionMiddleware
+
+
+def test_limiter_admits_in_order_and_rejects_when_full():
+    """Test waiters are admitted first in, first out by cost and excess requests are rejected."""
+
+    async def scenario():
+        limiter = AdmissionLimiter("test", capacity=4, max_queue=2, timeout=1.0)
+        assert await limiter.acquire(3) is None
+
+        admitted = []
+
+        async def request(name, cost):
+            assert await limiter.acquire(cost) is None
+            admitted.append(name)
+
+        large = asyncio.create_task(request("large", 2))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(request("small", 1))
+        await asyncio.sleep(0)
+
+        # The small request would fit but must not overtake the queued large one
+        assert admitted == [] and limiter.queued == 2
+        assert await limiter.acquire(1) == "queue_full"
+
+        limiter.release(3)
+        await asyncio.gather(large, small)
+
+        assert admitted == ["large", "small"]
+        assert limiter.in_use == 3
+
+    asyncio.run(scenario())
+
+
+def test_limiter_times_out_and_unblocks_smaller_waiters():
+    """Test a waiter that times out frees the queue for the requests behind it."""
+
+    async def scenario():
+        limiter = AdmissionLimiter("test", capacity=2, max_queue=4, timeout=0.05)
+        assert await limiter.acquire(1) is None
+
+        large = asyncio.create_task(limiter.acquire(2))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(asyncio.wait_for(limiter.acquire(1), 1.0))
+
+        assert await large == "timeout"
+        assert await small is None
+        assert limiter.in_use == 2 and limiter.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_middleware_returns_503_with_retry_after():
+    """Test requests beyond the route limit and queue get a fast 503 and others are unaffected."""
+
+    inner = FastAPI()
+    release = asyncio.Event()
+
+    @inner.post("/financial/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    @inner.get("/health")
+    async def health():
+        return {"ok": True}
+
+    settings = Settings(
+        admission_route_limits={"/financial/slow": 1},
+        admission_max_queue=1,
+        admission_queue_timeout=5.0,
+        admission_retry_after=7,
+    )
+    inner.add_middleware(AdmissionMiddleware, settings_provider=lambda: settings)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=inner)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            running = asyncio.create_task(client.post("/financial/slow"))
+            queued = asyncio.create_task(client.post("/financial/slow"))
+            await asyncio.sleep(0.05)
+
+            rejected = await client.post("/financial/slow")
+            assert rejected.status_code == 503
+            assert rejected.headers["retry-after"] == "7"
+            assert (await client.get("/health")).status_code == 200
+
+            release.set()
+            assert (await running).status_code == 200
+            assert (await queued).status_code == 200
+
+    asyncio.run(scenario())
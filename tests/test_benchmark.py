@@ -0,0 +1,65 @@
+import asyncio
+
+from relife_service_template.scripts import benchmark
+
+
+def test_service_benchmarks_cover_every_indicator(monkeypatch):
+    """Test that the service benchmarks produce one result per indicator and size."""
+
+    monkeypatch.setattr(benchmark, "MIN_MEASURE_SECONDS", 0.0)
+
+    results = benchmark.run_service_benchmarks(lifetimes=[1, 100], batch_sizes=[1, 10])
+    names = {result["name"] for result in results}
+
+    assert len(results) == 2 * 5 * 2
+    assert "service.npv[lifetime=100,batch=10]" in names
+    assert all(result["seconds_per_op"] > 0 for result in results)
+
+
+def test_auth_benchmarks_run_against_stubbed_upstreams():
+    """Test that both authentication paths succeed without network access."""
+
+    results = asyncio.run(benchmark.run_auth_benchmarks(requests=3))
+
+    assert {result["name"] for result in results} == {
+        "auth.none[/health]",
+        "auth.supabase[/whoami]",
+        "auth.keycloak_fallback[/whoami]",
+    }
+    assert all(result["errors"] == 0 for result in results)
+
+
+def test_compare_reports_flags_regressions():
+    """Test that slowdowns above the threshold are reported as regressions."""
+
+    baseline = {
+        "results": [
+            {"name": "a", "seconds_per_op": 1.0},
+            {"name": "b", "seconds_per_op": 1.0},
+            {"name": "removed", "seconds_per_op": 1.0},
+        ]
+    }
+    current = {
+        "results": [
+            {"name": "a", "seconds_per_op": 1.05},
+            {"name": "b", "seconds_per_op": 1.5},
+            {"name": "new", "seconds_per_op": 1.0},
+        ]
+    }
+
+    comparisons = benchmark.compare_reports(baseline, current, threshold=0.1)
+    regressions = {c["name"]: c["regression"] for c in comparisons}
+
+    assert regressions == {"a": False, "b": True}
+
+
+def test_batch_cases_match_the_scalar_scenarios():
+    """Test that the batched benchmark cases evaluate the same scenario as the scalar ones."""
+
+    import pytest
+
+    scalar = benchmark.build_service_cases(30)
+    batched = benchmark.build_batch_cases(30, 3)
+
+    for indicator, function in scalar.items():
+        assert batched[indicator]().tolist() == pytest.approx([function()] * 3), indicator
@@ -0,0 +1,125 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.models.roi import ROIRequest
+from relife_service_template.services.batch import evaluate_roi_requests
+from relife_service_template.services.roi import calculate_roi
+
+client = TestClient(app)
+
+CARRIERS = {
+    "consumption": {
+        "electricity": [1000.0, 900.0, 800.0],
+        "gas": [500.0, 500.0],
+    },
+    # One price per year for electricity, a flat price for gas
+    "prices": {"electricity": [0.2, 0.25, 0.3], "gas": [0.1]},
+}
+ELECTRICITY = 1000 * 0.2 + 900 * 0.25 + 800 * 0.3
+GAS = 1000 * 0.1
+
+ROI_REQUEST = {
+    "capex": 10000.0,
+    "interest_rate": 0.0,
+    "loan_term": 0.0,
+    "loan_amount": 0.0,
+    "subsidy": 1000.0,
+    "energy_savings": 2500.0,
+    "maintenance_cost": 100.0,
+    "other_outflows": 50.0,
+}
+
+
+def test_opex_sums_carrier_matrices_with_breakdown():
+    """Test OPEX of carrier x year matrices, as carrier-keyed dicts or positional rows."""
+
+    response = client.post("/financial/opex", json={"maintenance_cost": 100.0, "carriers": CARRIERS})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["carrier_costs"] == {"electricity": pytest.approx(ELECTRICITY), "gas": pytest.approx(GAS)}
+    assert data["opex"] == pytest.approx(ELECTRICITY + GAS + 100.0)
+
+    rows = {"consumption": [[10.0, 20.0], [5.0]], "prices": [[1.0], [2.0]]}
+    response = client.post(
+        "/financial/opex",
+        json={"energy_mix": [100.0], "energy_prices": [0.5], "maintenance_cost": 0.0, "carriers": rows},
+    )
+
+    assert response.json()["carrier_costs"] == {"0": 30.0, "1": 10.0}
+    assert response.json()["opex"] == 90.0
+
+
+def test_carrier_matrices_are_validated():
+    """Test carriers without prices, prices of unknown carriers and mismatched shapes are rejected."""
+
+    missing = {"consumption": {"gas": [1.0]}, "prices": {"electricity": [0.2]}}
+    mismatched = {"consumption": {"gas": [1.0, 2.0, 3.0]}, "prices": {"gas": [0.1, 0.2]}}
+    unknown = {"consumption": {"el": [1.0, 2.0, 3.0]}, "prices": {"el": [3.0], "gas": [1.0, 2.0, 3.0]}}
+    extra_rows = {"consumption": [[1.0, 2.0]], "prices": [[0.1], [0.2]]}
+
+    for carriers in (missing, mismatched, unknown, extra_rows):
+        response = client.post("/financial/opex", json={"maintenance_cost": 0.0, "carriers": carriers})
+        assert response.status_code == 422
+
+
+def test_flat_energy_use_needs_prices():
+    """Test energy_mix without energy_prices is rejected now that both are optional."""
+
+    response = client.post(
+        "/financial/opex", json={"energy_mix": [1.0, 2.0], "maintenance_cost": 0.0}
+    )
+    assert response.status_code == 422
+
+    response = client.post("/financial/roi", json={**ROI_REQUEST, "energy_mix": [1.0]})
+    assert response.status_code == 422
+
+    response = client.post(
+        "/financial/irr", json={**ROI_REQUEST, "energy_mix": [1.0], "project_lifetime": 20.0}
+    )
+    assert response.status_code == 422
+
+
+def test_roi_and_irr_include_carrier_costs():
+    """Test ROI/IRR equal pre-aggregated flat inputs, in the endpoints and the batch kernel."""
+
+    aggregated = {**ROI_REQUEST, "energy_mix": [ELECTRICITY + GAS], "energy_prices": [1.0]}
+    with_carriers = {**ROI_REQUEST, "carriers": CARRIERS}
+
+    roi = client.post("/financial/roi", json=with_carriers).json()
+    irr = client.post("/financial/irr", json={**with_carriers, "project_lifetime": 20.0}).json()
+
+    assert roi["roi"] == pytest.approx(calculate_roi(**aggregated))
+    assert roi["carrier_costs"]["gas"] == pytest.approx(GAS)
+    assert irr["irr"] == pytest.approx(
+        client.post("/financial/irr", json={**aggregated, "project_lifetime": 20.0}).json()["irr"]
+    )
+
+    requests = [ROIRequest(**with_carriers), ROIRequest(**aggregated), ROIRequest(**ROI_REQUEST)]
+    assert evaluate_roi_requests(requests) == pytest.approx(
+        [calculate_roi(**aggregated), calculate_roi(**aggregated), calculate_roi(**ROI_REQUEST)]
+    )
+
+
+def test_equal_length_carriers_match_padded_results():
+    """Test carriers covering the same years give the same costs as ragged ones padded."""
+
+    from relife_service_template.models.carriers import CarrierEnergy
+    from relife_service_template.services.carriers import carrier_costs, carrier_costs_batch
+
+    regular = CarrierEnergy(
+        consumption={"electricity": [1000.0, 900.0], "gas": [500.0, 400.0]},
+        prices={"electricity": [0.2, 0.3], "gas": [0.1, 0.15]},
+    )
+    flat = CarrierEnergy(consumption=[[1000.0, 900.0], [500.0, 400.0]], prices=[[0.2], [0.1]])
+    ragged = CarrierEnergy(consumption=[[1000.0, 900.0], [500.0]], prices=[[0.2], [0.1]])
+
+    assert carrier_costs(regular) == pytest.approx({"electricity": 470.0, "gas": 110.0})
+    assert carrier_costs(flat) == pytest.approx({"0": 380.0, "1": 90.0})
+
+    # Shared shapes take the stacked path, mixed ones the padded path
+    assert carrier_costs_batch([regular, None, regular]) == pytest.approx([580.0, 0.0, 580.0])
+    assert carrier_costs_batch([regular, flat, ragged, None]) == pytest.approx(
+        [580.0, 470.0, 430.0, 0.0]
+    )
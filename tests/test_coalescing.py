@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+import anyio
+import pytest
+
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.services.coalescing import SingleFlight, request_key
+
+NPV_REQUEST = {
+    "cash_flows": [100.0, 200.0],
+    "discount_rate": 0.05,
+    "energy_savings": 500.0,
+    "initial_investment": 1000.0,
+    "lifetime": 10,
+}
+
+
+def test_request_key_is_canonical():
+    """Test that identical requests share a key and differing ones do not."""
+
+    first = NPVRequest(**NPV_REQUEST)
+    second = NPVRequest(**dict(reversed(list(NPV_REQUEST.items()))))
+    other = NPVRequest(**{**NPV_REQUEST, "lifetime": 11})
+
+    assert request_key("npv", first) == request_key("npv", second)
+    assert request_key("npv", first) != request_key("npv", other)
+    assert request_key("npv", first) != request_key("roi", first)
+
+
+def test_concurrent_duplicates_share_one_computation():
+    """Test that callers with the same key await a single in-flight computation."""
+
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return 42.0
+
+    async def scenario():
+        tasks = [
+            asyncio.create_task(flight.run("key", lambda: anyio.to_thread.run_sync(compute)))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(scenario()) == [42.0] * 5
+    assert len(calls) == 1
+    assert not flight.is_in_flight("key")
+
+
+def test_followers_receive_the_leader_exception():
+    """Test that a failing computation fails every coalesced caller."""
+
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(timeout=5)
+        raise ValueError("invalid cash flows")
+
+    async def scenario():
+        tasks = [
+            asyncio.create_task(flight.run("key", lambda: anyio.to_thread.run_sync(compute)))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+    with pytest.raises(ValueError):
+        asyncio.run(flight.run("key", lambda: anyio.to_thread.run_sync(compute)))
+
+
+def test_concurrent_identical_endpoint_requests_call_the_service_once(monkeypatch):
+    """Test that identical ROI requests sent together run calculate_roi a single time."""
+
+    import httpx
+
+    from relife_service_template.app import app
+    from relife_service_template.routes import roi
+    from relife_service_template.services import coalescing
+
+    release = threading.Event()
+    calls = []
+    arrived = []
+
+    def calculate_roi(**kwargs):
+        calls.append(1)
+        release.wait(timeout=5)
+        return 0.25
+
+    def record_coalescing(indicator, follower):
+        arrived.append(follower)
+
+    monkeypatch.setattr(roi, "calculate_roi", calculate_roi)
+    monkeypatch.setattr(coalescing, "record_coalescing", record_coalescing)
+    payload = {
+        "capex": 10000.0, "interest_rate": 0.0, "loan_term": 0.0, "loan_amount": 0.0,
+        "subsidy": 0.0, "energy_savings": 3000.0, "energy_mix": [1.0], "energy_prices": [0.2],
+        "maintenance_cost": 50.0, "other_outflows": 0.0,
+    }
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            tasks = [
+                asyncio.create_task(client.post("/financial/roi", json=payload))
+                for _ in range(5)
+            ]
+
+            # Release the leader once every request has joined it
+            while len(arrived) < 5:
+                await asyncio.sleep(0.01)
+
+            release.set()
+            return await asyncio.gather(*tasks)
+
+    responses = asyncio.run(scenario())
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert all(response.json()["roi"] == 0.25 for response in responses)
+    assert len(calls) == 1
+    assert arrived.count(False) == 1
@@ -0,0 +1,65 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.middleware.compression import negotiate_encoding
+
+client = TestClient(app)
+
+LARGE_NPV_PAYLOAD = {
+    "cash_flows": [1234.5678] * 2000,
+    "discount_rate": 0.05,
+    "energy_savings": 100.0,
+    "initial_investment": 10000.0,
+    "lifetime": 30,
+}
+
+
+def test_negotiate_encoding_respects_quality_and_preference():
+    """Test that the server preference is applied among encodings the client accepts."""
+
+    preference = ["zstd", "br", "gzip"]
+
+    assert negotiate_encoding("gzip, br", preference) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0", preference) == "gzip"
+    assert negotiate_encoding("*", preference) == "zstd"
+    assert negotiate_encoding("identity", preference) is None
+
+
+def test_large_response_is_gzip_compressed():
+    """Test that large financial responses are compressed when gzip is accepted."""
+
+    response = client.post(
+        "/financial/npv",
+        json=LARGE_NPV_PAYLOAD,
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert len(response.json()["input"]["cash_flows"]) == 2000
+
+
+def test_small_response_is_not_compressed():
+    """Test that responses below the minimum size are sent uncompressed."""
+
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_body_is_valid_gzip():
+    """Test that the raw compressed body decodes to the JSON payload."""
+
+    with client.stream(
+        "POST",
+        "/financial/npv",
+        json=LARGE_NPV_PAYLOAD,
+        headers={"Accept-Encoding": "gzip"},
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw).startswith(b'{"npv":')
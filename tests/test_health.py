@@ -1,6 +1,10 @@
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
 
 from relife_service_template.app import app
+from relife_service_template.observability.probes import DependencyProbes
 
 client = TestClient(app)
 
@@ -18,3 +22,63 @@ def test_health_check():
     assert "timestamp" in data
     assert data["status"] == "healthy"
     assert isinstance(data["timestamp"], int)
+
+
+def test_liveness_check():
+    """Test that the liveness endpoint always reports the process as alive."""
+
+    response = client.get("/live")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+
+def test_readiness_before_startup():
+    """Test that readiness fails until the background probes have been started."""
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+@pytest.mark.asyncio
+async def test_dependency_probes_cache_results():
+    """Test that probes report readiness from cached results of all checks."""
+
+    calls = []
+
+    async def healthy():
+        calls.append("healthy")
+
+    async def failing():
+        raise ConnectionError("connection refused")
+
+    probes = DependencyProbes({"a": healthy, "b": failing}, timeout=1.0)
+
+    assert not probes.ready
+
+    await probes.run_once()
+
+    assert not probes.ready
+    snapshot = probes.snapshot()
+    assert snapshot["a"]["healthy"]
+    assert snapshot["b"]["error"] == "connection refused"
+
+    # Reading the state again never re-runs the checks
+    probes.snapshot()
+    assert calls == ["healthy"]
+
+
+@pytest.mark.asyncio
+async def test_dependency_probes_time_out_slow_checks():
+    """Test that a hanging dependency is reported as unhealthy after the timeout."""
+
+    async def hanging():
+        await asyncio.sleep(10)
+
+    probes = DependencyProbes({"slow": hanging}, timeout=0.01)
+    await probes.run_once()
+
+    assert not probes.ready
+    assert "timed out" in probes.snapshot()["slow"]["error"]
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+from relife_service_template.scripts.import_report import (
+    build_report,
+    parse_importtime,
+)
+
+SAMPLE_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2000 |       2500 |   fastapi.routing
+import time:      1000 |       3500 | fastapi
+import time:       500 |        500 | relife_service_template
+"""
+
+
+def test_parse_importtime_groups_by_package():
+    """Test parsing of `-X importtime` output and grouping by top-level package."""
+
+    modules = parse_importtime(SAMPLE_OUTPUT)
+    report = build_report(modules, top=2)
+
+    assert len(modules) == 4
+    assert modules[1] == {
+        "module": "fastapi.routing",
+        "depth": 1,
+        "self_us": 2000,
+        "cumulative_us": 2500,
+    }
+    assert report["total_ms"] == 3.62
+    assert report["packages"] == {"fastapi": 3.0, "relife_service_template": 0.5}
+
+
+def test_app_import_defers_heavy_dependencies():
+    """Test that importing the app does not load dependencies only needed per request."""
+
+    deferred = ("supabase", "gotrue", "jwt", "numpy", "httpx", "uvicorn", "pandas")
+    code = (
+        "import sys, relife_service_template.app; "
+        f"print(','.join(m for m in {deferred!r} if m in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,174 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.auth.dependencies import get_authenticated_user_without_roles
+from relife_service_template.models.auth import AuthenticatedUser, AuthenticationMethod, UniversalUser
+from relife_service_template.models.jobs import NPVJobInput
+from relife_service_template.services import jobs
+from relife_service_template.services.jobs import JobManager, JobQuotaExceeded
+from relife_service_template.services.npv import calculate_npv
+
+SCENARIO = {
+    "cash_flows": [100.0, 200.0],
+    "discount_rate": 0.05,
+    "energy_savings": 300.0,
+    "initial_investment": 1000.0,
+    "lifetime": 10,
+}
+
+
+def _wait_for(manager, job_id, owner, done, timeout=10.0):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        job = manager.get(job_id, owner)
+
+        if done(job):
+            return job
+
+        time.sleep(0.01)
+
+    raise AssertionError(f"Job {job_id} did not reach the expected state: {job}")
+
+
+def _npv_input(count):
+    return NPVJobInput(scenarios=[SCENARIO] * count)
+
+
+def test_jobs_persist_and_resume_by_priority(tmp_path):
+    """Test queued jobs survive a restart and then run by priority, oldest first."""
+
+    database = str(tmp_path / "jobs.sqlite3")
+    stopped = JobManager(database, workers=1)
+    stopped.start()
+    stopped.stop()
+
+    ids = {
+        name: stopped.submit("user-1", "npv", priority, _npv_input(1))["id"]
+        for name, priority in (("low", 0), ("high", 9), ("medium", 5), ("medium_later", 5))
+    }
+    cancelled = stopped.submit("user-1", "npv", 9, _npv_input(1))["id"]
+    assert stopped.cancel(cancelled, "user-1")["status"] == "cancelled"
+
+    manager = JobManager(database, workers=1)
+    manager.start()
+
+    try:
+        finished = {
+            name: _wait_for(manager, job_id, "user-1", lambda j: j["status"] == "succeeded")
+            for name, job_id in ids.items()
+        }
+    finally:
+        manager.stop()
+
+    order = sorted(finished, key=lambda name: finished[name]["started_at"])
+    assert order == ["high", "medium", "medium_later", "low"]
+    assert manager.result(ids["low"], "user-1")["result"]["results"] == [
+        pytest.approx(calculate_npv(**SCENARIO))
+    ]
+    assert manager.get(cancelled, "user-1")["status"] == "cancelled"
+
+
+def test_running_job_can_be_cancelled_and_quota_is_enforced(tmp_path):
+    """Test a running batch job stops at a progress update and per-user quotas apply."""
+
+    manager = JobManager(
+        str(tmp_path / "jobs.sqlite3"), workers=1, max_active_per_user=1, chunk_size=1
+    )
+    manager.start()
+
+    try:
+        job_id = manager.submit("user-1", "npv", 0, _npv_input(5000))["id"]
+
+        with pytest.raises(JobQuotaExceeded):
+            manager.submit("user-1", "npv", 0, _npv_input(1))
+
+        # Other users have their own quota
+        other = manager.submit("user-2", "npv", 0, _npv_input(1))["id"]
+
+        _wait_for(manager, job_id, "user-1", lambda j: j["status"] == "running" and j["progress"] > 0)
+        manager.cancel(job_id, "user-1")
+        job = _wait_for(manager, job_id, "user-1", lambda j: j["status"] == "cancelled")
+
+        assert 0 < job["progress"] < 1
+        assert _wait_for(manager, other, "user-2", lambda j: j["status"] == "succeeded")
+        assert manager.get(job_id, "user-2") is None
+    finally:
+        manager.stop()
+
+
+def _user(user_id):
+    return AuthenticatedUser(
+        token="token",
+        user=UniversalUser(id=user_id),
+        authentication_method=AuthenticationMethod.SUPABASE,
+    )
+
+
+def test_job_endpoints(tmp_path, monkeypatch):
+    """Test submitting, polling and fetching a job, and that jobs are private to their owner."""
+
+    manager = JobManager(str(tmp_path / "jobs.sqlite3"), workers=1)
+    manager.start()
+    monkeypatch.setattr(jobs, "_manager", manager)
+    client = TestClient(app)
+
+    try:
+        app.dependency_overrides[get_authenticated_user_without_roles] = lambda: _user("owner")
+
+        invalid = client.post("/financial/jobs", json={"kind": "npv", "input": {"scenarios": []}})
+        assert invalid.status_code == 400
+
+        submitted = client.post(
+            "/financial/jobs",
+            json={"kind": "npv", "priority": 3, "input": {"scenarios": [SCENARIO, SCENARIO]}},
+        )
+        assert submitted.status_code == 202
+        job_id = submitted.json()["id"]
+
+        _wait_for(manager, job_id, "owner", lambda j: j["status"] == "succeeded")
+        status = client.get(f"/financial/jobs/{job_id}").json()
+        result = client.get(f"/financial/jobs/{job_id}/result").json()
+
+        assert status["progress"] == 1.0
+        assert result["result"]["results"] == [pytest.approx(calculate_npv(**SCENARIO))] * 2
+        assert [job["id"] for job in client.get("/financial/jobs").json()["jobs"]] == [job_id]
+
+        app.dependency_overrides[get_authenticated_user_without_roles] = lambda: _user("other")
+        assert client.get(f"/financial/jobs/{job_id}").status_code == 404
+        assert client.delete(f"/financial/jobs/{job_id}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+        manager.stop()
+
+
+def test_jobs_are_shared_between_processes(tmp_path):
+    """Test a job submitted elsewhere, or left running by a dead process, is run by a polling worker."""
+
+    import subprocess
+    import sys
+
+    database = str(tmp_path / "jobs.sqlite3")
+    worker = JobManager(database, workers=1, poll_interval=0.05)
+    worker.start()
+    # Stands in for another process: it never runs jobs itself
+    other = JobManager(database, workers=1)
+    other._stopping.set()
+
+    try:
+        submitted = other.submit("user-1", "npv", 0, _npv_input(1))["id"]
+        assert _wait_for(worker, submitted, "user-1", lambda j: j["status"] == "succeeded")
+
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True)
+        abandoned = other.submit("user-1", "npv", 0, _npv_input(1))["id"]
+        other._connection().execute(
+            "UPDATE jobs SET status = 'running', worker_pid = ? WHERE id = ?",
+            (int(dead.stdout), abandoned),
+        )
+
+        assert _wait_for(worker, abandoned, "user-1", lambda j: j["status"] == "succeeded")
+    finally:
+        worker.stop()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.services.factors import annuity_factors, discount_factors
+from relife_service_template.services.npv import calculate_npv
+
+client = TestClient(app)
+
+LCSE_REQUEST = {
+    "capex": 12000.0,
+    "subsidy": 2000.0,
+    "discount_rate": 0.04,
+    "lifetime": 20,
+    "annual_energy_saved": 8000.0,
+    "energy_mix": [3000.0],
+    "energy_prices": [0.25],
+    "maintenance_cost": 150.0,
+}
+
+
+def test_factors_match_discounting_of_calculate_npv():
+    """Test cached factors against the NPV service and the closed-form annuity."""
+
+    rates = np.array([0.05, 0.0, 0.05])
+    factors = discount_factors(rates, 10)
+
+    assert factors.shape == (3, 10)
+    assert np.array_equal(factors[0], factors[2])
+    assert annuity_factors(rates, np.array([10, 10, 3])) == pytest.approx(
+        [
+            calculate_npv([], 0.05, 1.0, 0.0, 10),
+            10.0,
+            (1 - 1.05**-3) / 0.05,
+        ]
+    )
+
+
+def test_lcse_endpoint():
+    """Test LCSE and EAC against a hand-computed capital recovery factor."""
+
+    response = client.post("/financial/lcse", json=LCSE_REQUEST)
+    data = response.json()
+    crf = 0.04 / (1 - 1.04**-20)
+
+    assert response.status_code == 200
+    assert data["capital_recovery_factor"] == pytest.approx(crf)
+    assert data["eac"] == pytest.approx(10000.0 * crf + 3000.0 * 0.25 + 150.0)
+    assert data["lcse"] == pytest.approx((10000.0 * crf + 150.0) / 8000.0)
+
+
+def test_lcse_batch_endpoint_rejects_invalid_scenarios():
+    """Test batch results keep order and invalid inputs are rejected."""
+
+    scenarios = [LCSE_REQUEST, {**LCSE_REQUEST, "lifetime": 10}]
+    response = client.post("/financial/lcse/batch", json={"scenarios": scenarios})
+    results = response.json()["results"]
+
+    assert response.status_code == 200
+    assert results[1]["eac"] > results[0]["eac"]
+
+    invalid = client.post("/financial/lcse", json={**LCSE_REQUEST, "discount_rate": -1.0})
+    assert invalid.status_code == 400
@@ -0,0 +1,83 @@
+import pytest
+from fastapi.testclient import TestClient
+from gotrue.types import UserResponse
+
+from relife_service_template.models.auth import UniversalUser
+from relife_service_template.scripts.load_test import percentile
+from relife_service_template.scripts.mock_upstreams import (
+    MockUpstreamConfig,
+    create_mock_app,
+    parse_group_values,
+)
+
+
+def _tokens(client: TestClient) -> dict:
+    supabase = client.post(
+        "/auth/v1/token",
+        params={"grant_type": "password"},
+        json={"email": "user@mock.local", "password": "x"},
+    )
+    keycloak = client.post(
+        "/realms/relife/protocol/openid-connect/token",
+        data={"grant_type": "client_credentials", "client_id": "test"},
+    )
+
+    return {
+        "supabase": supabase.json()["access_token"],
+        "keycloak": keycloak.json()["access_token"],
+    }
+
+
+def test_mock_gotrue_user_is_a_valid_supabase_user():
+    """Test that mock GoTrue users parse like real Supabase users with Keycloak identities."""
+
+    client = TestClient(create_mock_app(MockUpstreamConfig()))
+    token = _tokens(client)["supabase"]
+
+    response = client.get("/auth/v1/user", headers={"Authorization": f"Bearer {token}"})
+    user = UniversalUser.from_supabase_user(UserResponse(user=response.json()))
+
+    assert response.status_code == 200
+    assert user.email == "user@mock.local"
+    assert user.is_keycloak_provider
+    assert user.user_metadata["iss"].endswith("/realms/relife")
+
+
+def test_mock_gotrue_rejects_keycloak_tokens():
+    """Test that Keycloak tokens fail at GoTrue so the service falls back to Keycloak."""
+
+    client = TestClient(create_mock_app(MockUpstreamConfig()))
+    token = _tokens(client)["keycloak"]
+
+    response = client.get("/auth/v1/user", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+
+
+def test_mock_failure_injection_per_group():
+    """Test that failures are only injected into the configured endpoint group."""
+
+    config = MockUpstreamConfig(failure_rate=parse_group_values(["jwks=1.0"]))
+    client = TestClient(create_mock_app(config))
+
+    assert client.get("/realms/relife/protocol/openid-connect/certs").status_code == 503
+    assert client.get("/auth/v1/health").status_code == 200
+
+
+def test_parse_group_values_rejects_unknown_groups():
+    """Test validation of GROUP=VALUE arguments."""
+
+    assert parse_group_values(["5", "roles=20"]) == {"*": 5.0, "roles": 20.0}
+
+    with pytest.raises(ValueError):
+        parse_group_values(["database=5"])
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles used in the load test report."""
+
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+
+from relife_service_template.config import logging as logging_config
+from relife_service_template.config.logging import (
+    JsonFormatter,
+    configure_logging,
+    get_logger,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def _restore_root_logger():
+    """Give later tests back the root handlers, rather than a queue handler with a stopped listener."""
+
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+
+    yield
+
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class _ExplodingValue:
+    """Value that fails the test if it is ever rendered."""
+
+    def __str__(self) -> str:
+        raise AssertionError("value formatted for a filtered-out message")
+
+    __repr__ = __format__ = __str__
+
+
+def test_filtered_debug_messages_are_not_formatted(monkeypatch):
+    """Test that kwargs are not formatted for messages below the log level."""
+
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    configure_logging()
+
+    get_logger("tests.filtered").debug("Not emitted", payload=_ExplodingValue())
+
+
+def test_json_formatter_merges_structured_fields():
+    """Test that JSON lines contain the message and the structured kwargs."""
+
+    record = logging.LogRecord(
+        "tests.json", logging.INFO, __file__, 1, "Computed", None, None
+    )
+    record.fields = {"indicator": "npv", "duration_ms": 1.5}
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Computed"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "tests.json"
+    assert entry["indicator"] == "npv"
+    assert entry["duration_ms"] == 1.5
+
+
+def test_json_mode_writes_through_background_listener(monkeypatch, capsys):
+    """Test that JSON mode routes records through the queue listener to stderr."""
+
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    configure_logging()
+
+    get_logger("tests.queue").info("Queued message", user_id="abc")
+    shutdown_logging()
+
+    lines = [line for line in capsys.readouterr().err.splitlines() if line]
+    entry = json.loads(lines[-1])
+
+    assert entry["message"] == "Queued message"
+    assert entry["user_id"] == "abc"
+
+
+def test_forked_child_gets_a_new_listener(monkeypatch, capsys):
+    """Test that the listener is replaced after a fork and keeps writing queued records."""
+
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    configure_logging()
+
+    inherited = logging_config._queue_listener
+    # In a forked child the listener thread no longer exists
+    inherited.stop()
+    logging_config._restart_listener_in_child()
+
+    assert logging_config._queue_listener is not inherited
+
+    get_logger("tests.fork").info("After fork")
+    shutdown_logging()
+
+    assert json.loads(capsys.readouterr().err.splitlines()[-1])["message"] == "After fork"
@@ -0,0 +1,123 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.models.meter import MeterOptions
+from relife_service_template.services.meter import aggregate_meter_file
+from relife_service_template.services.opex import calculate_opex
+from relife_service_template.services.roi import calculate_roi
+
+client = TestClient(app)
+
+# Hourly readings over two full years: 1 kWh of electricity and 2 kWh of gas per hour
+READINGS = pd.DataFrame(
+    {
+        "timestamp": pd.date_range("2023-01-01", "2024-12-31 23:00", freq="h"),
+        "electricity": 1.0,
+        "gas": 2.0,
+    }
+)
+HOURS = {"2023": 8760, "2024": 8784}
+
+# Peak price on weekday afternoons, off-peak otherwise
+PEAK = {"name": "peak", "price": 0.3, "hours": list(range(12, 18)), "weekdays": [0, 1, 2, 3, 4]}
+TARIFFS = {"electricity": {"default_price": 0.1, "rates": [PEAK]}, "gas": {"default_price": 0.05}}
+
+
+def _csv(frame: pd.DataFrame) -> bytes:
+    return frame.to_csv(index=False).encode()
+
+
+def _peak_hours(year: int) -> int:
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    return int((days.weekday < 5).sum()) * 6
+
+
+def test_upload_aggregates_yearly_costs_with_time_of_use_tariffs():
+    """Test yearly consumption and tariff costs of an uploaded CSV and the OPEX they give."""
+
+    options = {"carriers": ["electricity", "gas"], "tariffs": TARIFFS, "maintenance_cost": 100.0}
+    response = client.post(
+        "/financial/meter",
+        files={"file": ("meter.csv", _csv(READINGS), "text/csv")},
+        data={"options": json.dumps(options)},
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["readings"] == len(READINGS)
+
+    electricity, gas = data["carriers"]
+    assert [p["period"] for p in electricity["periods"]] == ["2023", "2024"]
+    assert [p["consumption"] for p in electricity["periods"]] == [8760.0, 8784.0]
+
+    expected = {
+        year: _peak_hours(int(year)) * 0.3 + (hours - _peak_hours(int(year))) * 0.1
+        for year, hours in HOURS.items()
+    }
+    assert [p["cost"] for p in electricity["periods"]] == pytest.approx(list(expected.values()))
+    assert electricity["rate_consumption"]["peak"] == _peak_hours(2023) + _peak_hours(2024)
+    assert gas["cost"] == pytest.approx(2 * (8760 + 8784) * 0.05)
+
+    total = electricity["cost"] + gas["cost"]
+    assert data["opex"] == pytest.approx(total + 100.0)
+
+    # The priced carriers can be sent unchanged to the OPEX endpoint
+    opex = client.post("/financial/opex", json={"maintenance_cost": 100.0, "carriers": data["energy"]})
+    assert opex.json()["opex"] == pytest.approx(data["opex"])
+
+
+def test_chunked_monthly_aggregation_matches_whole_file_and_feeds_roi():
+    """Test small chunks give the same monthly totals as one chunk, with ROI from the costs."""
+
+    roi_inputs = {
+        "capex": 10000.0, "interest_rate": 0.0, "loan_term": 0.0, "loan_amount": 0.0,
+        "subsidy": 0.0, "energy_savings": 3000.0, "maintenance_cost": 50.0, "other_outflows": 0.0,
+    }
+    options = MeterOptions(
+        carriers=["electricity"], resolution="monthly", tariffs={"electricity": TARIFFS["electricity"]},
+        roi=roi_inputs,
+    )
+    content = _csv(READINGS)
+
+    whole = aggregate_meter_file(io.BytesIO(content), "meter.csv", options, chunk_rows=10**6)
+    chunked = aggregate_meter_file(io.BytesIO(content), "meter.csv", options, chunk_rows=997)
+
+    assert len(chunked.carriers[0].periods) == 24
+    assert chunked.carriers[0].periods[1].period == "2023-02"
+    assert chunked.carriers[0].periods[1].consumption == 28 * 24
+    assert [p.consumption for p in chunked.carriers[0].periods] == [p.consumption for p in whole.carriers[0].periods]
+    assert [p.cost for p in chunked.carriers[0].periods] == pytest.approx([p.cost for p in whole.carriers[0].periods])
+    assert chunked.carriers[0].rate_consumption == whole.carriers[0].rate_consumption
+
+    cost = chunked.carriers[0].cost
+    assert chunked.opex == pytest.approx(calculate_opex([], [], 0.0, carrier_energy_cost=cost))
+    assert chunked.roi == pytest.approx(calculate_roi(**roi_inputs, carrier_energy_cost=cost))
+
+
+def test_meter_input_errors():
+    """Test bad options, missing columns, unknown formats and oversized storage paths are rejected."""
+
+    upload = {"file": ("meter.csv", _csv(READINGS.head(10)), "text/csv")}
+
+    response = client.post("/financial/meter", files=upload, data={"options": '{"resolution": "daily"}'})
+    assert response.status_code == 422
+
+    options = json.dumps({"tariffs": {"water": {"default_price": 1.0}}})
+    response = client.post("/financial/meter", files=upload, data={"options": options})
+    assert response.status_code == 422
+
+    response = client.post("/financial/meter", files=upload, data={"options": '{"carriers": ["heat"]}'})
+    assert response.status_code == 400
+
+    response = client.post("/financial/meter", files={"file": ("meter.txt", b"x", "text/plain")})
+    assert response.status_code == 400
+    assert "format" in response.json()["detail"]
+
+    # Storage files are only read for authenticated users
+    response = client.post("/financial/meter/storage", json={"path": "someone/meter.csv"})
+    assert response.status_code in (401, 403)
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.observability.metrics import record_cache_lookup
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_exposes_prometheus_format():
+    """Test that /metrics returns the Prometheus text exposition format."""
+
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "relife_http_request_duration_seconds" in response.text
+    assert "relife_http_requests_in_flight" in response.text
+
+
+def test_request_latency_uses_route_template():
+    """Test that path parameters and unknown paths do not become label values."""
+
+    client.get("/table/some_table")
+    client.get("/definitely/not/a/route/12345")
+    body = client.get("/metrics").text
+
+    assert 'route="/table/{table_name}"' in body
+    assert 'route="unmatched"' in body
+    assert "some_table" not in body
+    assert "12345" not in body
+
+
+def test_financial_computation_is_timed():
+    """Test that calling a financial endpoint records computation time."""
+
+    client.post(
+        "/financial/ii",
+        json={
+            "capex": 1000.0,
+            "interest_rate": 0.0,
+            "loan_term": 0.0,
+            "loan_amount": 0.0,
+            "subsidy": 0.0,
+        },
+    )
+    body = client.get("/metrics").text
+
+    assert (
+        'relife_financial_computation_duration_seconds_count{indicator="ii",outcome="success"}'
+        in body
+    )
+
+
+def test_cache_hit_ratio_gauge():
+    """Test that cache lookups are exposed as a hit ratio gauge."""
+
+    record_cache_lookup("test_cache", True)
+    record_cache_lookup("test_cache", False)
+    body = client.get("/metrics").text
+
+    assert 'relife_cache_hit_ratio{cache="test_cache"} 0.5' in body
+
+
+def test_cache_hit_ratio_aggregates_workers_in_multiprocess_mode(tmp_path, monkeypatch):
+    """Test that /metrics derives the hit ratio from the lookups of every worker."""
+
+    from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+    # Lookup counters as two workers would have written them
+    for pid, (hits, misses) in {1: (3, 1), 2: (1, 3)}.items():
+        values = MmapedDict(str(tmp_path / f"counter_{pid}.db"))
+        for result, count in (("hit", hits), ("miss", misses)):
+            key = mmap_key(
+                "relife_cache_lookups", "relife_cache_lookups_total",
+                ["cache", "result"], ["shared_cache", result], "Cache lookups",
+            )
+            values.write_value(key, count, 0.0)
+        values.close()
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    body = client.get("/metrics").text
+
+    assert 'relife_cache_lookups_total{cache="shared_cache",result="hit"} 4.0' in body
+    assert 'relife_cache_hit_ratio{cache="shared_cache"} 0.5' in body
@@ -0,0 +1,140 @@
+import asyncio
+import random
+
+import pytest
+
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.models.roi import ROIRequest
+from relife_service_template.services.batch import (
+    evaluate_npv_requests,
+    evaluate_roi_requests,
+)
+from relife_service_template.services.microbatch import MicroBatcher
+from relife_service_template.services.npv import calculate_npv
+from relife_service_template.services.roi import calculate_roi
+
+
+def _random_npv_request(rng: random.Random) -> NPVRequest:
+    return NPVRequest(
+        cash_flows=[rng.uniform(-500, 500) for _ in range(rng.randint(0, 40))],
+        discount_rate=rng.uniform(0.0, 0.15),
+        energy_savings=rng.uniform(0, 2000),
+        initial_investment=rng.uniform(0, 50000),
+        lifetime=rng.randint(0, 30),
+    )
+
+
+def _random_roi_request(rng: random.Random) -> ROIRequest:
+    return ROIRequest(
+        capex=rng.uniform(0, 50000),
+        interest_rate=0.04,
+        loan_term=10,
+        loan_amount=rng.choice([0.0, -100.0, rng.uniform(0, 20000)]),
+        subsidy=rng.choice([0.0, -100.0, rng.uniform(0, 10000)]),
+        energy_savings=rng.uniform(0, 20000),
+        energy_mix=[rng.uniform(0, 1000) for _ in range(rng.randint(0, 4))],
+        energy_prices=[rng.uniform(0, 0.4) for _ in range(rng.randint(0, 4))],
+        maintenance_cost=rng.uniform(0, 500),
+        other_outflows=rng.uniform(0, 500),
+    )
+
+
+def test_batch_kernels_match_scalar_services():
+    """Test that vectorized NPV and ROI agree with the scalar service functions."""
+
+    rng = random.Random(7)
+    npv_requests = [_random_npv_request(rng) for _ in range(200)]
+    roi_requests = [_random_roi_request(rng) for _ in range(200)]
+
+    assert evaluate_npv_requests(npv_requests) == pytest.approx(
+        [calculate_npv(**r.model_dump()) for r in npv_requests]
+    )
+    assert evaluate_roi_requests(roi_requests) == pytest.approx(
+        [calculate_roi(**r.model_dump(exclude={"carriers"})) for r in roi_requests]
+    )
+
+
+def test_concurrent_submissions_are_evaluated_as_one_batch():
+    """Test that concurrent items are merged into a batch and results fanned out."""
+
+    batches = []
+
+    def double_all(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher("test", double_all, lambda item: item * 2, max_wait=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(scenario()) == [i * 2 for i in range(10)]
+    assert batches == [list(range(10))]
+
+
+def test_batch_size_limit_flushes_immediately():
+    """Test that a full batch is dispatched without waiting for the timer."""
+
+    batches = []
+
+    def identity(items):
+        batches.append(len(items))
+        return list(items)
+
+    batcher = MicroBatcher("test", identity, lambda item: item, max_batch_size=4, max_wait=10)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(8))), timeout=1
+        )
+
+    assert asyncio.run(scenario()) == list(range(8))
+    assert batches == [4, 4]
+
+
+def test_failing_batch_falls_back_to_individual_evaluation():
+    """Test that one invalid request only fails itself when the batch fails."""
+
+    valid = NPVRequest(
+        cash_flows=[100.0],
+        discount_rate=0.05,
+        energy_savings=50.0,
+        initial_investment=1000.0,
+        lifetime=5,
+    )
+    invalid = valid.model_copy(update={"discount_rate": -1.0})
+    batcher = MicroBatcher(
+        "npv",
+        evaluate_npv_requests,
+        lambda request: calculate_npv(**request.model_dump()),
+    )
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit(valid), batcher.submit(invalid), return_exceptions=True
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert first == pytest.approx(calculate_npv(**valid.model_dump()))
+    assert isinstance(second, ZeroDivisionError)
+
+
+def test_batchers_follow_settings_and_event_loop():
+    """Test that changed batching options and new event loops get their own batcher."""
+
+    from relife_service_template.config.settings import get_settings
+    from relife_service_template.services.microbatch import get_batcher
+
+    enabled = get_settings().model_copy(update={"microbatching_enabled": True})
+    larger = enabled.model_copy(update={"microbatch_max_size": 1024})
+
+    async def batchers():
+        return get_batcher("npv", enabled), get_batcher("npv", enabled), get_batcher("npv", larger)
+
+    first, same, other = asyncio.run(batchers())
+
+    assert first is same
+    assert other is not first and other._max_batch_size == 1024
+    assert asyncio.run(batchers())[0] is not first
+    assert get_batcher("npv", get_settings()) is None
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.services.batch import evaluate_npv_requests
+from relife_service_template.services.factors import growing_annuity_factors
+from relife_service_template.services.npv import calculate_npv, growing_annuity_factor
+
+client = TestClient(app)
+
+
+def _npv_by_year(cash_flows, discount_rate, energy_savings, initial_investment, lifetime, growth=0.0):
+    npv = -initial_investment
+    for t in range(1, lifetime + 1):
+        cf = cash_flows[t - 1] if t - 1 < len(cash_flows) else 0.0
+        npv += (cf + energy_savings * (1 + growth) ** (t - 1)) / (1 + discount_rate) ** t
+    return npv
+
+
+@pytest.mark.parametrize(
+    "cash_flows, discount_rate, lifetime, growth",
+    [
+        ([100.0, 200.0], 0.05, 10, 0.0),
+        ([100.0, 0.0, 300.0, 0.0, 0.0], 0.03, 4, 0.0),
+        ([50.0] * 30, 0.07, 20, 0.0),
+        ([], 0.0, 100, 0.0),
+        ([-500.0], 0.04, 100, 0.02),
+        ([10.0], 0.03, 60, 0.03),
+        ([10.0], 0.03, 60, 0.0300001),
+        ([10.0], -0.01, 40, 0.01),
+    ],
+)
+def test_closed_form_matches_year_by_year_discounting(cash_flows, discount_rate, lifetime, growth):
+    """Test the closed-form NPV against discounting every year, including r = g and zero tails."""
+
+    expected = _npv_by_year(cash_flows, discount_rate, 250.0, 1000.0, lifetime, growth)
+    npv = calculate_npv(cash_flows, discount_rate, 250.0, 1000.0, lifetime, growth)
+
+    assert npv == pytest.approx(expected, rel=1e-9)
+
+
+def test_growing_annuity_factor_edge_cases():
+    """Test the factor for no years, a zero rate and equal discount and growth rates."""
+
+    assert growing_annuity_factor(0.05, 0.0, 0) == 0.0
+    assert growing_annuity_factor(0.0, 0.0, 25) == 25.0
+    assert growing_annuity_factor(0.04, 0.04, 10) == pytest.approx(10 / 1.04)
+    assert growing_annuity_factor(0.05, 0.0, 20) == pytest.approx((1 - 1.05**-20) / 0.05)
+
+
+def test_long_lifetimes_and_growth_in_batch_and_endpoint():
+    """Test the batch kernel handles lifetimes beyond the dense limit and matches the endpoint."""
+
+    requests = [
+        NPVRequest(cash_flows=[100.0], discount_rate=0.04, energy_savings=300.0,
+                   initial_investment=5000.0, lifetime=5000, energy_savings_growth=0.01),
+        NPVRequest(cash_flows=[], discount_rate=0.02, energy_savings=100.0,
+                   initial_investment=1000.0, lifetime=30),
+    ]
+
+    expected = [calculate_npv(**r.model_dump()) for r in requests]
+    assert evaluate_npv_requests(requests) == pytest.approx(expected, rel=1e-9)
+
+    response = client.post("/financial/npv", json=requests[0].model_dump())
+    assert response.status_code == 200
+    assert response.json()["npv"] == pytest.approx(expected[0])
+
+
+@pytest.mark.parametrize(
+    "discount_rate, growth, years",
+    [(0.1 + 0.2, 0.3, 30), (0.07, 0.07 + 1e-15, 30), (0.04 - 1e-13, 0.04, 200), (0.02, 0.02 + 1e-9, 50)],
+)
+def test_nearly_equal_rates_tend_to_the_level_factor(discount_rate, growth, years):
+    """Test rates differing only by float noise give years / (1 + r), scalar and vectorized."""
+
+    expected = sum((1 + growth) ** (t - 1) / (1 + discount_rate) ** t for t in range(1, years + 1))
+
+    assert growing_annuity_factor(discount_rate, growth, years) == pytest.approx(expected, rel=1e-9)
+    assert growing_annuity_factors(
+        np.array([discount_rate]), np.array([growth]), np.array([years])
+    )[0] == pytest.approx(expected, rel=1e-9)
+    assert calculate_npv([], discount_rate, 100.0, 0.0, years, growth) == pytest.approx(100.0 * expected, rel=1e-9)
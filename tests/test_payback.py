@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.services.npv import calculate_npv
+from relife_service_template.services.payback import payback_years
+
+client = TestClient(app)
+
+
+def test_payback_interpolates_within_the_year():
+    """Test fractional payback, immediate repayment and never repaid cases."""
+
+    flows = np.array([[400.0, 400.0, 400.0], [1500.0, 0.0, 0.0], [100.0, 100.0, 100.0]])
+    initial_investment = np.array([1000.0, 1000.0, 1000.0])
+
+    simple = payback_years(flows, initial_investment)
+
+    assert simple[0] == pytest.approx(2.5)
+    assert simple[1] == pytest.approx(1000 / 1500)
+    assert np.isnan(simple[2])
+    assert payback_years(flows[:1], np.array([0.0]))[0] == 0.0
+
+
+def test_payback_endpoint_matches_npv_horizon():
+    """Test that NPV turns non-negative exactly at the discounted payback year."""
+
+    scenario = {
+        "cash_flows": [50.0, -20.0, 80.0],
+        "discount_rate": 0.06,
+        "energy_savings": 300.0,
+        "initial_investment": 1500.0,
+        "lifetime": 15,
+    }
+
+    response = client.post("/financial/payback", json=scenario)
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["payback_years"] < data["discounted_payback_years"]
+
+    year = int(np.ceil(data["discounted_payback_years"]))
+    horizon = {**scenario, "lifetime": year}
+    assert calculate_npv(**horizon) >= 0
+    assert calculate_npv(**{**horizon, "lifetime": year - 1}) < 0
+
+
+def test_payback_batch_endpoint_reports_unreached_payback():
+    """Test the batch endpoint keeps scenario order and returns null when never repaid."""
+
+    scenarios = [
+        {
+            "cash_flows": [],
+            "discount_rate": 0.05,
+            "energy_savings": savings,
+            "initial_investment": 1000.0,
+            "lifetime": 10,
+        }
+        for savings in (500.0, 10.0)
+    ]
+
+    response = client.post("/financial/payback/batch", json={"scenarios": scenarios})
+    results = response.json()["results"]
+
+    assert response.status_code == 200
+    assert results[0]["payback_years"] == pytest.approx(2.0)
+    assert results[1] == {"payback_years": None, "discounted_payback_years": None}
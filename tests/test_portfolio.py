@@ -0,0 +1,71 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.services.portfolio import select_greedy, select_knapsack
+
+client = TestClient(app)
+
+
+def _building(building_id: str, capex: float, energy_savings: float) -> dict:
+    return {
+        "id": building_id,
+        "capex": capex,
+        "energy_savings": energy_savings,
+        "lifetime": 10,
+    }
+
+
+def test_knapsack_beats_greedy_when_ratios_mislead():
+    """Test that the exact solver finds the better combination greedy misses."""
+
+    cost = np.array([6.0, 5.0, 5.0])
+    value = np.array([7.0, 5.0, 5.0])
+
+    greedy = select_greedy(cost, value, budget=10.0)
+    exact = select_knapsack(cost, value, budget=10.0, resolution=10)
+
+    assert greedy.tolist() == [True, False, False]
+    assert exact.tolist() == [False, True, True]
+
+
+def test_selection_skips_unprofitable_and_unaffordable_buildings():
+    """Test that negative-NPV and over-budget buildings are never selected."""
+
+    cost = np.array([4.0, 2.0, 20.0, 3.0])
+    value = np.array([10.0, -1.0, 100.0, 2.0])
+
+    for selected in (
+        select_greedy(cost, value, budget=8.0),
+        select_knapsack(cost, value, budget=8.0, resolution=8),
+    ):
+        assert selected.tolist() == [True, False, False, True]
+
+
+def test_portfolio_endpoint_selects_within_budget():
+    """Test the portfolio endpoint end to end."""
+
+    response = client.post(
+        "/financial/portfolio",
+        json={
+            "buildings": [
+                _building("a", 6000.0, 1200.0),
+                _building("b", 5000.0, 900.0),
+                _building("c", 5000.0, 900.0),
+                _building("d", 8000.0, 100.0),
+            ],
+            "discount_rate": 0.03,
+            "budget": 10000.0,
+            "method": "knapsack",
+            "top": 3,
+        },
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["method"] == "knapsack"
+    assert sorted(data["selected"]) == ["b", "c"]
+    assert data["totals"]["cost"] == 10000.0
+    assert [r["rank"] for r in data["rankings"]] == [1, 2, 3]
+    assert data["rankings"][0]["id"] == "a"
+    assert "d" not in {r["id"] for r in data["rankings"]}
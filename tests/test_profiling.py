@@ -0,0 +1,97 @@
+import importlib.util
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from relife_service_template.auth import dependencies
+from relife_service_template.config.settings import Settings
+from relife_service_template.middleware.profiling import ProfilingMiddleware
+from relife_service_template.models.auth import (
+    AuthenticatedUser,
+    AuthenticationMethod,
+    KeycloakRole,
+    UniversalUser,
+)
+
+HAS_PYINSTRUMENT = importlib.util.find_spec("pyinstrument") is not None
+
+
+def _client(monkeypatch, enabled=True):
+    async def authenticate(settings, credentials, fetch_roles=False):
+        role = "relife_admin" if credentials.credentials == "admin" else "viewer"
+        return AuthenticatedUser(
+            token=credentials.credentials,
+            user=UniversalUser(id=credentials.credentials),
+            authentication_method=AuthenticationMethod.KEYCLOAK,
+            keycloak_roles=[KeycloakRole(id="1", name=role)],
+        )
+
+    monkeypatch.setattr(dependencies, "_get_authenticated_user", authenticate)
+
+    inner = FastAPI()
+
+    @inner.post("/financial/sum")
+    async def total(values: list[float]):
+        return {"total": sum(values)}
+
+    settings = Settings(profiling_enabled=enabled)
+    inner.add_middleware(ProfilingMiddleware, settings_provider=lambda: settings)
+
+    return TestClient(inner)
+
+
+def test_requests_without_header_pass_through(monkeypatch):
+    """Test requests are untouched without the header, or with it while profiling is disabled."""
+
+    client = _client(monkeypatch)
+    response = client.post("/financial/sum", json=[1, 2])
+
+    assert response.status_code == 200 and response.json() == {"total": 3}
+
+    disabled = _client(monkeypatch, enabled=False)
+    response = disabled.post(
+        "/financial/sum", json=[1, 2], headers={"X-Profile": "speedscope", "Authorization": "Bearer viewer"}
+    )
+
+    assert response.status_code == 200 and "x-profiled-status" not in response.headers
+
+
+def test_profiling_is_restricted_to_admins(monkeypatch):
+    """Test the header requires a token with the admin role and a known format."""
+
+    client = _client(monkeypatch)
+
+    assert client.post("/financial/sum", json=[1], headers={"X-Profile": "speedscope"}).status_code == 401
+
+    viewer = {"X-Profile": "speedscope", "Authorization": "Bearer viewer"}
+    assert client.post("/financial/sum", json=[1], headers=viewer).status_code == 403
+
+    unknown = {"X-Profile": "pstats", "Authorization": "Bearer admin"}
+    assert client.post("/financial/sum", json=[1], headers=unknown).status_code == 400
+
+
+@pytest.mark.skipif(HAS_PYINSTRUMENT, reason="pyinstrument is installed")
+def test_profiling_without_pyinstrument_is_not_implemented(monkeypatch):
+    """Test admins get a 501 explaining the missing optional dependency."""
+
+    client = _client(monkeypatch)
+    headers = {"X-Profile": "speedscope", "Authorization": "Bearer admin"}
+    response = client.post("/financial/sum", json=[1], headers=headers)
+
+    assert response.status_code == 501
+    assert "pyinstrument" in response.json()["detail"]
+
+
+@pytest.mark.skipif(not HAS_PYINSTRUMENT, reason="pyinstrument is not installed")
+def test_admin_receives_speedscope_profile(monkeypatch):
+    """Test an admin request returns a speedscope profile and the profiled status."""
+
+    client = _client(monkeypatch)
+    headers = {"X-Profile": "speedscope", "Authorization": "Bearer admin"}
+    response = client.post("/financial/sum", json=[1, 2], headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert "speedscope" in json.loads(response.content)["$schema"]
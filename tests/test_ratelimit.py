@@ -0,0 +1,169 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.auth import dependencies
+from relife_service_template.config.settings import Settings, get_settings
+from relife_service_template.models.auth import (
+    AuthenticatedUser,
+    AuthenticationMethod,
+    KeycloakRole,
+    UniversalUser,
+)
+from relife_service_template.services import ratelimit
+from relife_service_template.services.ratelimit import (
+    MemoryRateLimitBackend,
+    RoleLimitCache,
+    SupabaseRateLimitBackend,
+    limit_for_roles,
+)
+
+NPV_REQUEST = {
+    "cash_flows": [100.0],
+    "discount_rate": 0.05,
+    "energy_savings": 300.0,
+    "initial_investment": 1000.0,
+    "lifetime": 5,
+}
+
+
+def test_token_bucket_refills_over_the_window():
+    """Test tokens run out, refill at limit/window per second and report headers."""
+
+    now = [0.0]
+    backend = MemoryRateLimitBackend(clock=lambda: now[0])
+
+    async def consume():
+        return await backend.consume("user", limit=2, window=10.0)
+
+    first = asyncio.run(consume())
+    asyncio.run(consume())
+    denied = asyncio.run(consume())
+
+    assert first.allowed and first.remaining == 1
+    assert not denied.allowed
+    assert denied.headers()["Retry-After"] == "5"
+    assert denied.headers()["RateLimit-Policy"] == "2;w=10"
+
+    now[0] = 5.0
+    allowed = asyncio.run(consume())
+    assert allowed.allowed and allowed.remaining == 0 and allowed.reset == 10
+
+
+def test_role_limits_use_the_most_generous_role():
+    """Test users get the highest limit among their roles, or the default."""
+
+    settings = Settings(rate_limit_requests=60, rate_limit_role_limits={"partner": 600, "admin": 6000})
+
+    assert limit_for_roles([], settings) == 60
+    assert limit_for_roles(["viewer", "partner"], settings) == 600
+    assert limit_for_roles(["partner", "admin"], settings) == 6000
+
+
+def test_financial_routes_are_limited_per_user(monkeypatch):
+    """Test enabled rate limiting requires a token, sets headers and returns 429 per user."""
+
+    settings = Settings(rate_limit_enabled=True, rate_limit_requests=2, rate_limit_window=60.0)
+
+    async def authenticate(settings, credentials, fetch_roles=False):
+        return AuthenticatedUser(
+            token=credentials.credentials,
+            user=UniversalUser(id=credentials.credentials),
+            authentication_method=AuthenticationMethod.KEYCLOAK,
+            keycloak_roles=[KeycloakRole(id="1", name="viewer")],
+        )
+
+    monkeypatch.setattr(dependencies, "_get_authenticated_user", authenticate)
+    monkeypatch.setattr(ratelimit, "_backend", MemoryRateLimitBackend())
+    app.dependency_overrides[get_settings] = lambda: settings
+    client = TestClient(app)
+
+    try:
+        assert client.post("/financial/npv", json=NPV_REQUEST).status_code in (401, 403)
+
+        alice = {"Authorization": "Bearer alice"}
+        first = client.post("/financial/npv", json=NPV_REQUEST, headers=alice)
+        client.post("/financial/npv", json=NPV_REQUEST, headers=alice)
+        limited = client.post("/financial/npv", json=NPV_REQUEST, headers=alice)
+        other = client.post("/financial/npv", json=NPV_REQUEST, headers={"Authorization": "Bearer bob"})
+
+        assert first.status_code == 200
+        assert first.headers["ratelimit-limit"] == "2"
+        assert first.headers["ratelimit-remaining"] == "1"
+        assert limited.status_code == 429
+        assert int(limited.headers["retry-after"]) > 0
+        assert other.status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_supabase_backend_creates_its_client_once():
+    """Test the Supabase backend reuses one client for every request."""
+
+    created = []
+
+    class Client:
+        def rpc(self, name, params):
+            result = SimpleNamespace(data=[{"tokens": params["p_capacity"] - 1, "allowed": True}])
+            return SimpleNamespace(execute=lambda: asyncio.sleep(0, result))
+
+    async def provider():
+        created.append(1)
+        return Client()
+
+    backend = SupabaseRateLimitBackend(provider)
+
+    async def scenario():
+        return [await backend.consume("user", limit=5, window=60.0) for _ in range(3)]
+
+    decisions = asyncio.run(scenario())
+
+    assert all(decision.allowed for decision in decisions)
+    assert len(created) == 1
+
+
+def test_role_limits_are_cached_per_user(monkeypatch):
+    """Test Keycloak roles are fetched once per user until the cached limit expires."""
+
+    settings = Settings(
+        rate_limit_enabled=True,
+        rate_limit_role_limits={"partner": 600},
+        rate_limit_role_cache_ttl=30.0,
+    )
+    now = [0.0]
+    fetched = []
+
+    async def authenticate(settings, credentials, fetch_roles=False):
+        return AuthenticatedUser(
+            token=credentials.credentials,
+            user=UniversalUser(id=credentials.credentials),
+            authentication_method=AuthenticationMethod.KEYCLOAK,
+        )
+
+    async def fetch_roles(user, settings):
+        fetched.append(user.user_id)
+        user.keycloak_roles = [KeycloakRole(id="1", name="partner")]
+
+    monkeypatch.setattr(dependencies, "_get_authenticated_user", authenticate)
+    monkeypatch.setattr(dependencies, "_fetch_keycloak_roles", fetch_roles)
+    monkeypatch.setattr(dependencies, "role_limits", RoleLimitCache(clock=lambda: now[0]))
+    monkeypatch.setattr(ratelimit, "_backend", MemoryRateLimitBackend())
+    app.dependency_overrides[get_settings] = lambda: settings
+    client = TestClient(app)
+    alice = {"Authorization": "Bearer alice"}
+
+    try:
+        first = client.post("/financial/npv", json=NPV_REQUEST, headers=alice)
+        second = client.post("/financial/npv", json=NPV_REQUEST, headers=alice)
+        client.post("/financial/npv", json=NPV_REQUEST, headers={"Authorization": "Bearer bob"})
+
+        assert first.headers["ratelimit-limit"] == second.headers["ratelimit-limit"] == "600"
+        assert fetched == ["alice", "bob"]
+
+        now[0] = 31.0
+        client.post("/financial/npv", json=NPV_REQUEST, headers=alice)
+        assert fetched == ["alice", "bob", "alice"]
+    finally:
+        app.dependency_overrides.clear()
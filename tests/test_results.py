@@ -0,0 +1,151 @@
+import asyncio
+
+import httpx
+
+from relife_service_template.app import app
+from relife_service_template.config.settings import Settings
+from relife_service_template.services import results
+from relife_service_template.services.results import (
+    ResultWriter,
+    start_result_writer,
+    stop_result_writer,
+)
+
+NPV_REQUEST = {
+    "cash_flows": [100.0],
+    "discount_rate": 0.05,
+    "energy_savings": 300.0,
+    "initial_investment": 1000.0,
+    "lifetime": 5,
+}
+
+
+def test_writer_flushes_full_batches_and_on_interval():
+    """Test full batches are written at once and a partial batch after the flush interval."""
+
+    async def scenario():
+        batches = []
+
+        async def insert(rows):
+            batches.append([row["n"] for row in rows])
+
+        writer = ResultWriter(insert, batch_size=3, flush_interval=0.2, max_buffer=10)
+        writer.start()
+
+        writer.record({"n": 0})
+        writer.record({"n": 1})
+        await asyncio.sleep(0.01)
+        assert batches == []
+
+        await asyncio.sleep(0.3)
+        assert batches == [[0, 1]]
+
+        for n in range(2, 5):
+            writer.record({"n": n})
+
+        await asyncio.sleep(0.01)
+        assert batches == [[0, 1], [2, 3, 4]]
+
+        # Beyond max_buffer results are dropped instead of growing memory
+        assert all(writer.record({"n": n}) for n in range(10))
+        assert not writer.record({"n": 10})
+
+        await writer.stop(timeout=1.0)
+        assert sum(len(batch) for batch in batches) == 15
+        assert writer.pending == 0
+
+    asyncio.run(scenario())
+
+
+def test_writer_retries_failed_inserts_with_backoff():
+    """Test a failing insert is retried until it succeeds, or dropped after the last retry."""
+
+    async def scenario():
+        attempts = []
+
+        async def flaky(rows):
+            attempts.append(len(rows))
+
+            if len(attempts) < 3:
+                raise ConnectionError("database unavailable")
+
+        writer = ResultWriter(flaky, batch_size=10, max_retries=3, retry_backoff=0.001)
+        writer.record({"n": 1})
+        await writer.flush()
+        assert attempts == [1, 1, 1]
+
+        async def broken(rows):
+            attempts.append(len(rows))
+            raise ConnectionError("database unavailable")
+
+        attempts.clear()
+        writer = ResultWriter(broken, batch_size=10, max_retries=2, retry_backoff=0.001)
+        writer.record({"n": 1})
+        await writer.flush()
+        assert attempts == [1, 1, 1]
+        assert writer.pending == 0
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_timeout_counts_the_batch_being_written():
+    """Test results lost to a shutdown timeout include the batch whose insert was cancelled."""
+
+    from prometheus_client import REGISTRY
+
+    def dropped():
+        return REGISTRY.get_sample_value("relife_results_dropped_total", {"reason": "shutdown"}) or 0.0
+
+    async def scenario():
+        async def hanging(rows):
+            await asyncio.sleep(60)
+
+        writer = ResultWriter(hanging, batch_size=2, flush_interval=60.0)
+        writer.start()
+
+        for n in range(3):
+            writer.record({"n": n})
+
+        await asyncio.sleep(0.01)
+        # Two results are being inserted, one is still buffered
+        assert writer.pending == 1
+
+        before = dropped()
+        await writer.stop(timeout=0.05)
+        assert dropped() - before == 3
+
+    asyncio.run(scenario())
+
+
+def test_endpoints_record_results_and_shutdown_flushes():
+    """Test computed results are queued by the endpoints and written when the writer stops."""
+
+    async def scenario():
+        rows = []
+
+        async def insert(batch):
+            rows.extend(batch)
+
+        settings = Settings(results_enabled=True, results_flush_interval=60.0)
+        await start_result_writer(settings, insert=insert)
+
+        try:
+            transport = httpx.ASGITransport(app=app)
+
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/financial/npv", json=NPV_REQUEST)
+                batch = await client.post(
+                    "/financial/payback/batch", json={"scenarios": [NPV_REQUEST] * 2}
+                )
+
+            assert response.status_code == 200 and batch.status_code == 200
+            assert rows == []
+        finally:
+            await stop_result_writer(settings)
+
+        assert [row["indicator"] for row in rows] == ["npv", "payback", "payback"]
+        assert rows[0]["input"] == {**NPV_REQUEST, "energy_savings_growth": 0.0}
+        assert rows[0]["result"] == {"npv": response.json()["npv"]}
+        assert results.get_result_writer() is None
+
+    asyncio.run(scenario())
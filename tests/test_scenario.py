@@ -0,0 +1,143 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.services.irr import calculate_irr
+from relife_service_template.services.roi import calculate_roi
+from relife_service_template.models.scenario import PatchOperation
+from relife_service_template.services.scenarios import ScenarioStore, ScenarioTooLarge
+
+client = TestClient(app)
+
+ROI_INPUT = {
+    "capex": 20000.0,
+    "interest_rate": 0.04,
+    "loan_term": 10,
+    "loan_amount": 5000.0,
+    "subsidy": 2000.0,
+    "energy_savings": 4000.0,
+    "energy_mix": [1200.0, 800.0, 300.0],
+    "energy_prices": [0.25, 0.12],
+    "maintenance_cost": 150.0,
+    "other_outflows": 100.0,
+}
+
+
+def test_scenario_patch_recomputes_only_dependent_stages():
+    """Test a subsidy edit reuses the cached OPEX and matches the ROI endpoint logic."""
+
+    created = client.post("/financial/scenarios", json={"indicator": "roi", "input": ROI_INPUT})
+    assert created.status_code == 201
+    scenario = created.json()
+    assert scenario["recomputed"] == ["energy_costs", "opex", "ii", "roi"]
+    assert scenario["roi"] == calculate_roi(**ROI_INPUT)
+
+    patched = client.patch(
+        f"/financial/scenarios/{scenario['scenario_id']}",
+        json={"operations": [{"op": "replace", "path": "/subsidy", "value": 6000.0}]},
+    )
+    data = patched.json()
+
+    assert patched.status_code == 200
+    assert data["recomputed"] == ["ii", "roi"]
+    assert data["opex"] == scenario["opex"]
+    assert data["roi"] == calculate_roi(**{**ROI_INPUT, "subsidy": 6000.0})
+
+    patched = client.patch(
+        f"/financial/scenarios/{scenario['scenario_id']}",
+        json={"operations": [{"op": "add", "path": "/energy_prices/-", "value": 0.3}]},
+    )
+    assert patched.json()["recomputed"] == ["energy_costs", "opex", "roi"]
+    assert patched.json()["roi"] == calculate_roi(
+        **{**ROI_INPUT, "subsidy": 6000.0, "energy_prices": [0.25, 0.12, 0.3]}
+    )
+
+
+def test_scenario_patch_is_atomic_and_validated():
+    """Test a failing test operation or invalid value leaves the scenario unchanged."""
+
+    irr_input = {**ROI_INPUT, "project_lifetime": 20}
+    scenario_id = client.post(
+        "/financial/scenarios", json={"indicator": "irr", "input": irr_input}
+    ).json()["scenario_id"]
+    url = f"/financial/scenarios/{scenario_id}"
+
+    failed_test = client.patch(
+        url,
+        json={
+            "operations": [
+                {"op": "replace", "path": "/capex", "value": 1.0},
+                {"op": "test", "path": "/subsidy", "value": 1.0},
+            ]
+        },
+    )
+    invalid = client.patch(
+        url, json={"operations": [{"op": "replace", "path": "/energy_mix/0", "value": "a lot"}]}
+    )
+    unknown = client.patch(url, json={"operations": [{"op": "replace", "path": "/foo", "value": 1}]})
+
+    assert failed_test.status_code == 400
+    assert invalid.status_code == 400
+    assert unknown.status_code == 400
+
+    current = client.get(url).json()
+    assert current["input"]["capex"] == irr_input["capex"]
+    assert current["irr"] == calculate_irr(**irr_input)
+
+    assert client.delete(url).status_code == 204
+    assert client.get(url).status_code == 404
+
+
+def test_scenario_store_evicts_least_recently_used_and_idle():
+    """Test the session limit evicts the least recently used and idle sessions expire."""
+
+    now = [0.0]
+    store = ScenarioStore(max_sessions=2, idle_timeout=60.0, clock=lambda: now[0])
+
+    first, _ = store.create("roi", ROI_INPUT)
+    second, _ = store.create("roi", ROI_INPUT)
+    assert store.get(first) is not None
+
+    third, _ = store.create("roi", ROI_INPUT)
+    assert store.get(second) is None
+    assert len(store) == 2
+
+    now[0] = 45.0
+    assert store.get(third) is not None
+
+    now[0] = 90.0
+    assert store.get(first) is None
+    assert store.get(third) is not None
+
+    with pytest.raises(ValueError):
+        store.create("npv", ROI_INPUT)
+
+
+def test_scenario_store_bounds_scenario_and_total_size():
+    """Test oversized scenarios or patches are rejected and the total size evicts old scenarios."""
+
+    size = ScenarioStore(1, 60.0).create("roi", ROI_INPUT)[1].size
+    store = ScenarioStore(max_sessions=10, idle_timeout=60.0, max_bytes=size * 2, max_total_bytes=size * 3)
+
+    large = {**ROI_INPUT, "energy_mix": [1000.0] * 10_000, "energy_prices": [0.2] * 10_000}
+    with pytest.raises(ScenarioTooLarge):
+        store.create("roi", large)
+
+    first, _ = store.create("roi", ROI_INPUT)
+    second, _ = store.create("roi", ROI_INPUT)
+    third, _ = store.create("roi", ROI_INPUT)
+    assert len(store) == 3
+
+    # Growing the newest scenario pushes the least recently used out
+    grown = [PatchOperation(op="add", path="/energy_mix/-", value=1000.0)] * 3
+    store.apply(third, grown)
+    assert store.get(first) is None and store.get(second) is not None
+
+    with pytest.raises(ScenarioTooLarge):
+        store.apply(third, [PatchOperation(op="replace", path="/energy_mix", value=[1.0] * 10_000)])
+    assert len(store.get(third).request.energy_mix) == len(ROI_INPUT["energy_mix"]) + 3
+
+    # The default limit is 1 MiB
+    huge = {**ROI_INPUT, "energy_mix": [1000.0] * 100_000, "energy_prices": [0.2] * 100_000}
+    response = client.post("/financial/scenarios", json={"indicator": "roi", "input": huge})
+    assert response.status_code == 413
@@ -0,0 +1,144 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+from rich.console import Console
+
+from relife_service_template.scripts.score_buildings import (
+    INDICATORS,
+    missing_columns,
+    run,
+    score_frame,
+)
+from relife_service_template.services.ii import calculate_ii
+from relife_service_template.services.irr import calculate_irr
+from relife_service_template.services.npv import calculate_npv
+from relife_service_template.services.roi import calculate_roi
+
+BUILDINGS = [
+    {
+        "id": "a",
+        "capex": 10000.0,
+        "subsidy": 2000.0,
+        "loan_amount": 0.0,
+        "energy_savings": 3000.0,
+        "maintenance_cost": 100.0,
+        "other_outflows": 50.0,
+        "energy_mix": [1000.0, 500.0, 200.0],
+        "energy_prices": [0.2, 0.1],
+        "cash_flows": [100.0, 200.0],
+        "discount_rate": 0.05,
+        "initial_investment": 8000.0,
+        "lifetime": 10,
+    },
+    {
+        "id": "b",
+        "capex": 5000.0,
+        "subsidy": 0.0,
+        "loan_amount": 1000.0,
+        "energy_savings": 900.0,
+        "maintenance_cost": 0.0,
+        "other_outflows": 0.0,
+        "energy_mix": [300.0],
+        "energy_prices": [0.3],
+        "cash_flows": [],
+        "discount_rate": 0.03,
+        "initial_investment": 4000.0,
+        "lifetime": 3,
+    },
+]
+
+
+def _write_csv(path, buildings):
+    frame = pd.DataFrame(buildings)
+
+    for column in ("energy_mix", "energy_prices", "cash_flows"):
+        frame[column] = frame[column].map(json.dumps)
+
+    frame.to_csv(path, index=False)
+
+
+def test_score_frame_matches_scalar_services():
+    """Test the vectorized indicators equal the per-request service functions."""
+
+    frame = pd.DataFrame(BUILDINGS)
+    scores = score_frame(frame, INDICATORS, id_column="id")
+
+    for building, row in zip(BUILDINGS, scores.to_dict("records")):
+        costs = {
+            name: building[name]
+            for name in (
+                "capex", "loan_amount", "subsidy", "energy_savings", "energy_mix",
+                "energy_prices", "maintenance_cost", "other_outflows",
+            )
+        }
+
+        assert row["id"] == building["id"]
+        assert row["ii"] == calculate_ii(
+            building["capex"], loan_amount=building["loan_amount"], subsidy=building["subsidy"]
+        )
+        assert row["roi"] == pytest.approx(calculate_roi(**costs))
+        assert row["irr"] == pytest.approx(calculate_irr(**costs))
+        assert row["npv"] == pytest.approx(
+            calculate_npv(
+                building["cash_flows"],
+                building["discount_rate"],
+                building["energy_savings"],
+                building["initial_investment"],
+                building["lifetime"],
+            )
+        )
+
+
+def test_run_writes_parts_and_resumes(tmp_path):
+    """Test a chunked run writes one part per chunk and a rerun skips finished parts."""
+
+    source = tmp_path / "buildings.csv"
+    output = tmp_path / "scores"
+    _write_csv(source, BUILDINGS * 3)
+    console = Console(file=io.StringIO())
+
+    first = run(source, output, ["roi", "npv"], chunk_size=2, output_format="csv", console=console)
+
+    parts = sorted(output.glob("part-*.csv"))
+    assert first["rows_scored"] == 6 and first["chunks"] == 3
+    assert len(parts) == 3
+
+    parts[-1].unlink()
+    # Left behind by a run interrupted while writing a part
+    stale = output / ".part-00002.csv.partial"
+    stale.write_text("half")
+    second = run(source, output, ["roi", "npv"], chunk_size=2, output_format="csv", console=console)
+
+    assert second["rows_resumed"] == 4 and second["rows_scored"] == 2
+    assert not stale.exists()
+    scores = pd.concat(pd.read_csv(part) for part in sorted(output.glob("part-*.csv")))
+    assert list(scores.columns) == ["id", "roi", "npv"]
+    assert list(scores["id"]) == ["a", "b"] * 3
+
+    with pytest.raises(SystemExit):
+        run(source, output, ["roi"], chunk_size=2, output_format="csv", console=console)
+
+
+def test_missing_columns_and_numbered_arrays():
+    """Test required inputs are checked and arrays may be given as numbered columns."""
+
+    assert missing_columns(["capex", "energy_savings"], ["npv"], None) == ["discount_rate", "lifetime"]
+    assert missing_columns(["capex", "energy_savings", "lifetime"], ["npv"], 0.05) == []
+    # A growth column does not stand in for the savings themselves
+    assert missing_columns(["capex", "energy_savings_growth", "lifetime"], ["npv"], 0.05) == ["energy_savings"]
+
+    frame = pd.DataFrame(
+        {
+            "capex": [1000.0, 2000.0],
+            "energy_mix_0": [100.0, 200.0],
+            "energy_mix_1": [50.0, None],
+            "energy_prices_0": [0.5, 0.5],
+            "energy_prices_1": [1.0, None],
+            "maintenance_cost": [10.0, 10.0],
+        }
+    )
+    scores = score_frame(frame, ["opex"])
+
+    assert list(scores["opex"]) == [110.0, 110.0]
@@ -0,0 +1,77 @@
+import pytest
+
+from relife_service_template import server
+from relife_service_template.server import ServerOptions, Supervisor
+
+
+def test_server_options_from_env(monkeypatch):
+    """Test that production options are read from the API_* environment variables."""
+
+    monkeypatch.setenv("API_MODE", "Production")
+    monkeypatch.setenv("API_WORKERS", "4")
+    monkeypatch.setenv("API_LOOP", "uvloop")
+    monkeypatch.setenv("API_KEEP_ALIVE", "75")
+    monkeypatch.setenv("API_MAX_REQUESTS", "10000")
+
+    options = ServerOptions.from_env()
+
+    assert options.mode == "production"
+    assert options.workers == 4
+    assert options.loop == "uvloop"
+    assert options.timeout_keep_alive == 75
+    assert options.limit_max_requests == 10000
+
+    monkeypatch.setenv("API_MODE", "staging")
+
+    with pytest.raises(ValueError):
+        ServerOptions.from_env()
+
+
+def test_auto_workers_respect_container_cpu_limit(monkeypatch):
+    """Test that API_WORKERS=auto is capped by the cgroup CPU quota."""
+
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(16)))
+    monkeypatch.setattr(server, "_cgroup_cpu_limit", lambda: 2)
+    monkeypatch.delenv("API_WORKERS", raising=False)
+
+    assert ServerOptions.from_env().workers == 2
+
+
+def test_worker_request_limit_is_jittered():
+    """Test that workers get request limits spread over the configured jitter."""
+
+    options = ServerOptions(limit_max_requests=1000, max_requests_jitter=50)
+    supervisor = Supervisor(config=None, options=options)
+    limits = {supervisor._worker_request_limit() for _ in range(200)}
+
+    assert min(limits) >= 1000 and max(limits) <= 1050
+    assert len(limits) > 1
+    assert Supervisor(None, ServerOptions())._worker_request_limit() is None
+
+
+@pytest.mark.parametrize(
+    "started, error, expected",
+    [(True, None, 0), (False, None, 1), (True, RuntimeError("boom"), 1)],
+)
+def test_worker_exit_code_reports_failures(monkeypatch, started, error, expected):
+    """Test that failed startups and crashes exit non-zero so the supervisor backs off."""
+
+    import uvicorn
+
+    class FakeServer:
+        def __init__(self, config):
+            self.started = started
+
+        def run(self, sockets):
+            if error is not None:
+                raise error
+
+    exits = []
+    monkeypatch.setattr(uvicorn, "Server", FakeServer)
+    monkeypatch.setattr(server.signal, "signal", lambda *args: None)
+    monkeypatch.setattr(server.os, "_exit", exits.append)
+
+    supervisor = Supervisor(config=type("Config", (), {})(), options=ServerOptions())
+    supervisor._run_worker()
+
+    assert exits == [expected]
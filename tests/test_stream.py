@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.models.npv import NPVRequest
+from relife_service_template.services.npv import calculate_npv
+from relife_service_template.services.streaming import stream_batch
+
+client = TestClient(app)
+
+SCENARIO = {
+    "cash_flows": [100.0, 200.0],
+    "discount_rate": 0.05,
+    "energy_savings": 300.0,
+    "initial_investment": 1000.0,
+    "lifetime": 10,
+}
+
+
+def _parse_events(body):
+    events = []
+
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+
+    return events
+
+
+def test_batch_stream_sends_chunks_and_progress():
+    """Test results arrive per chunk in order with progress, followed by a done event."""
+
+    scenarios = [{**SCENARIO, "energy_savings": 100.0 * i} for i in range(1, 6)]
+
+    with client.stream(
+        "POST",
+        "/financial/batch/stream",
+        json={"kind": "npv", "input": {"scenarios": scenarios}, "chunk_size": 2},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "content-encoding" not in response.headers
+        events = _parse_events(response.read().decode())
+
+    names = [name for name, _ in events]
+    assert names == ["results", "progress"] * 3 + ["done"]
+
+    results = [value for name, data in events if name == "results" for value in data["results"]]
+    assert results == [pytest.approx(calculate_npv(**s)) for s in scenarios]
+
+    progress = [data for name, data in events if name == "progress"]
+    assert [p["done"] for p in progress] == [2, 4, 5]
+    assert progress[-1]["eta"] == 0
+    assert events[-1][1]["total"] == 5
+
+
+def test_batch_stream_stops_when_client_disconnects():
+    """Test no further chunks are evaluated once the client has gone away."""
+
+    scenarios = [NPVRequest(**SCENARIO)] * 10
+    checks = []
+
+    async def is_disconnected():
+        checks.append(True)
+        return len(checks) > 2
+
+    async def collect():
+        return [event async for event in stream_batch("npv", scenarios, 3, is_disconnected)]
+
+    events = asyncio.run(collect())
+
+    assert [event.split("\n")[0] for event in events] == ["event: results", "event: progress"] * 2
+    assert '"done": 6' in events[-1]
+
+
+def test_batch_stream_rejects_invalid_input_and_reports_chunk_errors():
+    """Test invalid batches fail before streaming and chunk failures end with an error event."""
+
+    invalid = client.post(
+        "/financial/batch/stream", json={"kind": "npv", "input": {"scenarios": [{"lifetime": 1}]}}
+    )
+    assert invalid.status_code == 400
+
+    undefined = {**SCENARIO, "discount_rate": -1.0}
+    response = client.post(
+        "/financial/batch/stream", json={"kind": "npv", "input": {"scenarios": [undefined]}}
+    )
+    events = _parse_events(response.text)
+
+    assert response.status_code == 200
+    assert events[0][0] == "error"
+    assert events[0][1]["offset"] == 0
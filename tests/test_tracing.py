@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from relife_service_template.app import app
+from relife_service_template.config.settings import Settings
+from relife_service_template.observability import tracing
+
+client = TestClient(app)
+
+
+def test_span_is_noop_when_disabled():
+    """Test that spans cost nothing but a shared no-op context when tracing is off."""
+
+    assert not tracing.is_enabled()
+    assert tracing.span("anything") is tracing.span("something.else")
+
+
+def test_file_exporter_records_request_and_computation_spans(tmp_path):
+    """Test that a traced request exports server and computation spans to file."""
+
+    pytest.importorskip("opentelemetry.sdk")
+
+    trace_file = tmp_path / "traces.jsonl"
+    settings = Settings(
+        tracing_enabled=True,
+        tracing_exporter="file",
+        tracing_file_path=str(trace_file),
+    )
+
+    tracing.configure_tracing(settings)
+
+    try:
+        response = client.post(
+            "/financial/npv",
+            json={
+                "cash_flows": [100.0, 200.0],
+                "discount_rate": 0.05,
+                "energy_savings": 10.0,
+                "initial_investment": 250.0,
+                "lifetime": 2,
+            },
+        )
+        assert response.status_code == 200
+    finally:
+        tracing.shutdown_tracing()
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    names = {span["name"] for span in spans}
+
+    assert "POST /financial/npv" in names
+    assert "financial.npv" in names
+    assert not tracing.is_enabled()